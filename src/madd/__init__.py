@@ -1,11 +1,21 @@
 __version__ = "0.2.0"
 
-from madd.core import (
-    build_graph,
-    load_scenario,
-    create_initial_state,
-    get_settings,
-)
+from typing import TYPE_CHECKING
+
+from madd._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from madd.core.config import get_settings
+    from madd.core.graph import build_graph
+    from madd.core.scenario import load_scenario
+    from madd.core.state import create_initial_state
+
+_EXPORTS = {
+    "build_graph": "madd.core.graph",
+    "load_scenario": "madd.core.scenario",
+    "create_initial_state": "madd.core.state",
+    "get_settings": "madd.core.config",
+}
 
 __all__ = [
     "__version__",
@@ -14,3 +24,5 @@ __all__ = [
     "create_initial_state",
     "get_settings",
 ]
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
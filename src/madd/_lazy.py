@@ -0,0 +1,38 @@
+"""Lazy package re-exports.
+
+Package ``__init__`` modules map each public name to the module defining it;
+the module is imported on first attribute access, so ``import madd`` (and the
+CLI's ``--help``) do not pay for LangGraph, LangChain or the OpenAI SDK.
+"""
+import importlib
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_exports(
+    namespace: dict[str, Any], exports: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Return ``(__getattr__, __dir__)`` for a package exporting ``exports``."""
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {namespace['__name__']!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *exports})
+
+    return __getattr__, __dir__
+
+
+def lazy_function(module: str, name: str) -> Callable[..., Any]:
+    """Stand-in for ``module.name`` that imports ``module`` on its first call."""
+
+    def call(*args: Any, **kwargs: Any) -> Any:
+        return getattr(importlib.import_module(module), name)(*args, **kwargs)
+
+    call.__name__ = call.__qualname__ = name
+    return call
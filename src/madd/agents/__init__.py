@@ -1,7 +1,19 @@
-from madd.agents.researcher import generate_profile
-from madd.agents.country import generate_turn
-from madd.agents.judge import evaluate_round
-from madd.agents.verifier import verify_claims
+from typing import TYPE_CHECKING
+
+from madd._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from madd.agents.country import generate_turn
+    from madd.agents.judge import evaluate_round
+    from madd.agents.researcher import generate_profile
+    from madd.agents.verifier import verify_claims
+
+_EXPORTS = {
+    "generate_profile": "madd.agents.researcher",
+    "generate_turn": "madd.agents.country",
+    "evaluate_round": "madd.agents.judge",
+    "verify_claims": "madd.agents.verifier",
+}
 
 __all__ = [
     "generate_profile",
@@ -9,3 +21,5 @@ __all__ = [
     "evaluate_round",
     "verify_claims",
 ]
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
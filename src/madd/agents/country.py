@@ -1,15 +1,22 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Collection
 from typing import cast, Optional, Any
 from datetime import datetime, timezone
 
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel, Field
 
 from madd.core.config import get_settings
+from madd.core.history import build_history_context
+from madd.core.llm import LLMCall, LLMFlow, arun_llm_flow, get_structured_model, run_llm_flow
+from madd.core.metrics import count_event
 from madd.core.schemas import DebateMessage, CountryProfile, TreatyDraft, ProposedClause
 from madd.core.treaty_utils import get_votable_clauses, format_clause_lines
 from madd.core.state import DebateState
-from madd.core.scenario_router import build_router_plan, DEFAULT_INSTITUTION_NAME, RouterPlan
+from madd.core.scenario_router import build_router_plan, RouterPlan
+from madd.core.turn_prompt import TurnPrefix, build_turn_prefix
 
 
 class ProposedClauseOut(BaseModel):
@@ -33,134 +40,55 @@ class TurnLLMOutput(BaseModel):
     citation_ids_to_reference: list[str] = Field(default_factory=list)
 
 
-class CitationSelectionOutput(BaseModel):
+class TurnRepairOutput(BaseModel):
     citation_ids_to_reference: list[str] = Field(default_factory=list)
+    public_statement: str = ""
+    replacement_clauses: list[ProposedClauseOut] = Field(default_factory=list)
 
 
-class PropositionalRewriteOutput(BaseModel):
-    public_statement: str
+def _turn_llm(schema: type[BaseModel]) -> Runnable:
+    settings = get_settings()
+    return get_structured_model("turn", settings.turn_model, settings.turn_temperature, schema)
 
 
-class AmendmentOutput(BaseModel):
-    proposed_clauses: list[ProposedClauseOut] = Field(default_factory=list)
+def generate_turn(state: DebateState, country_name: str) -> DebateMessage:
+    return run_llm_flow(_turn_flow(state, country_name))
 
 
-def generate_turn(state: DebateState, country_name: str) -> DebateMessage:
+async def agenerate_turn(state: DebateState, country_name: str) -> DebateMessage:
+    return await arun_llm_flow(_turn_flow(state, country_name))
+
+
+def _turn_flow(state: DebateState, country_name: str) -> LLMFlow[DebateMessage]:
     settings = get_settings()
-    llm = ChatOpenAI(
-        model=settings.turn_model,
-        temperature=settings.turn_temperature,
-        api_key=settings.openai_api_key,
-        max_retries=settings.max_retries,
-    )
     
     profile: CountryProfile = state["profiles"][country_name]
     treaty: TreatyDraft = state.get("treaty") or TreatyDraft()
     messages = state.get("messages", [])
     current_round = state["round"]
     scenario = state["scenario"]
-    router_plan: RouterPlan = state.get("router_plan") or build_router_plan(scenario)
+    router_plan: RouterPlan | None = state.get("router_plan")
     
-    structured_llm = llm.with_structured_output(TurnLLMOutput, method="function_calling")
+    structured_llm = _turn_llm(TurnLLMOutput)
     
     votable_clauses = get_votable_clauses(treaty, current_round)
     pending_clauses = format_clause_lines(votable_clauses)
     
-    history_entries = [
-        f"Round {m.round_number} - {m.country}: {m.public_statement[:300]}..."
-        for m in messages
-    ]
-    history = "\n".join(history_entries)
-    
-    all_citations = profile.all_citations()
-    valid_ids = {c.id for c in all_citations if c.id}
-    scenario_citations = profile.facts.scenario_citations
-    preferred_citations = scenario_citations or all_citations
-    citation_refs = _format_citation_groups(profile, preferred_citations)
-    institution_name = router_plan.institution_name or DEFAULT_INSTITUTION_NAME
-    agenda_text = _format_agenda_text(scenario)
-    voice_guidance = _build_voice_guidance(profile, router_plan)
-    
-    facts_summary = [
-        f"Region: {profile.facts.region or 'Unknown'}",
-        f"Government: {profile.facts.government_type or 'Unknown'}",
-        f"Leaders: {', '.join(profile.facts.current_leaders[:3]) or 'Unknown'}",
-        f"GDP (USD billions): {profile.facts.economy.gdp_usd_billions or 'Unknown'}",
-        f"Major industries: {', '.join(profile.facts.economy.major_industries[:5]) or 'Unknown'}",
-    ]
-    facts_summary_text = "\n".join(facts_summary)
-    
-    treaty_summary = "\n".join(
-        f"- {c.id} [{c.status.value}] {c.text} (by {c.proposed_by})"
-        for c in treaty.clauses
+    context = build_history_context(
+        messages,
+        state.get("round_summaries") or {},
+        treaty,
+        {c.id for c in votable_clauses},
+        current_round,
+        window=settings.history_window,
+        token_budget=settings.history_token_budget,
     )
     
-    system_prompt = f"""You are the Diplomatic Representative of {country_name} in a formal negotiation.
-
-Scenario: {scenario.name}
-Scenario description:
-{scenario.description}
-
-Agenda (ordered by priority; you MUST address these in order):
-{agenda_text}
-
-Country profile (facts you may rely on):
-{facts_summary_text}
-
-Negotiation style guidance:
-- Follow your profile’s negotiation_style if provided.
-- Do NOT mirror the other side’s phrasing. Use your own national voice and priorities.
-- Avoid generic filler; be specific, mechanism-oriented, and responsive to the agenda.
-- Profile style: {profile.strategy.negotiation_style or "Not specified"}
-- Scenario voice: {voice_guidance}
-
-Institution naming:
-- Use the oversight body name exactly as provided in the scenario if present.
-- If none is provided, refer to “Joint Oversight Commission (JOC)” consistently.
-- Institution name for this scenario: {institution_name}
-
-Scenario Router Patch:
-{router_plan.turn_prompt_patch}
-
-EVIDENCE & CITATION DISCIPLINE (highest priority):
-- You may ONLY include factual or legal assertions if you can support them with the available citations by ID.
-- If you cannot support a factual/legal assertion with available citations, rewrite as:
-  (a) proposal (“we propose…”),
-  (b) request for oversight study (“we request JOC produce… within X days”),
-  (c) conditional (“subject to verification…”, “pending review…”).
-- Never pad citations. Only select citation IDs that genuinely match what you said.
-- If you mention treaties, borders, legal status, casualty figures, dates, statistics, specific incidents, or binding obligations, include at least 2 relevant citations.
-
-DIPLOMATIC REALISM (required each turn):
-- Include all three:
-  1) One ASK,
-  2) One OFFER/CONCESSION,
-  3) One CONDITIONAL TRADEOFF.
-- Address agenda priorities explicitly in order (P1 → P2 → P3 ...).
-
-TREATY-QUALITY CLAUSE DRAFTING:
-- Propose 0–3 clauses max per turn.
-- Each clause must be implementable: scope, authority, timelines, compliance/enforcement, exceptions.
-- Avoid duplicates. If changing an existing clause, set supersedes="C#".
-- If you vote "amend" on any clause, you MUST also propose a replacement clause that supersedes it.
-
-VOTING:
-- For every votable clause ID provided, output exactly one vote:
-  "support" | "oppose" | "amend" | "abstain".
-- Do not vote on non-votable IDs.
-
-AVAILABLE CITATIONS (use exact IDs only):
-{citation_refs or "None"}
-
-Return a structured response with:
-- public_statement (180–260 words, 2–4 short paragraphs, end punctuation)
-- private_intent
-- proposed_clauses (text, rationale, supersedes optional)
-- clause_votes
-- citation_ids_to_reference
-
-Do NOT include citation IDs inside the public_statement text.
-"""
+    prefix = turn_prefix(scenario, profile, router_plan, country_name)
+    valid_ids = prefix.valid_ids
+    citation_refs = prefix.citation_refs
+    institution_name = prefix.institution_name
+    agenda_text = prefix.agenda_text
 
     pending_str = "\n".join(pending_clauses) if pending_clauses else "None"
     
@@ -169,19 +97,19 @@ Do NOT include citation IDs inside the public_statement text.
 Votable Clauses:
 {pending_str}
 
-Treaty So Far:
-{treaty_summary if treaty_summary else "None"}
+Treaty So Far (recent changes):
+{context.treaty_summary or "None"}
 
-Recent History:
-{history if history else "No prior statements."}
+Debate History:
+{context.history or "No prior statements."}
 
 Generate your turn. For every votable clause ID listed, include exactly one vote. If you vote "amend", include a replacement clause with supersedes="C#". If no votable clauses are listed, return an empty clause_votes object."""
 
     try:
-        result = structured_llm.invoke([
-            SystemMessage(content=system_prompt),
+        result = yield LLMCall(structured_llm, [
+            SystemMessage(content=prefix.system_prompt),
             HumanMessage(content=user_prompt)
-        ])
+        ], "generate_turn", prefix=1)
         output = cast(TurnLLMOutput, result)
     except Exception as e:
         print(f"    Error generating turn: {e}")
@@ -196,26 +124,6 @@ Generate your turn. For every votable clause ID listed, include exactly one vote
     ]
 
     references = _normalize_references(output.citation_ids_to_reference, valid_ids)
-    citation_fallback_used = False
-    if not references:
-        references = _select_citations_second_pass(
-            llm,
-            output.public_statement,
-            citation_refs,
-            valid_ids,
-        )
-    if not references:
-        rewritten = _rewrite_to_propositional(
-            llm,
-            output.public_statement,
-            scenario.name,
-            agenda_text,
-            institution_name,
-        )
-        if rewritten:
-            output.public_statement = rewritten
-        else:
-            citation_fallback_used = True
 
     clause_votes = _normalize_clause_votes(output.clause_votes)
     votable_ids = {c.id for c in votable_clauses}
@@ -225,15 +133,34 @@ Generate your turn. For every votable clause ID listed, include exactly one vote
         strict=settings.strict_votes,
     )
 
-    proposed = _ensure_amendment_replacements(
-        llm,
-        proposed,
-        clause_votes,
-        votable_clauses,
-        scenario.name,
-        agenda_text,
-        institution_name,
-    )
+    missing_amendments = _missing_amendment_ids(proposed, clause_votes)
+    _, trunc_note = _detect_truncation(output.public_statement)
+    citation_fallback_used = False
+    if not references or missing_amendments or trunc_note:
+        repair = yield from _repair_turn(
+            output.public_statement,
+            needs_citations=not references,
+            missing_amendments={c.id: c.text for c in votable_clauses if c.id in missing_amendments},
+            truncation_note=trunc_note,
+            citation_refs=citation_refs,
+            scenario_name=scenario.name,
+            agenda_text=agenda_text,
+            institution_name=institution_name,
+        )
+        if not references:
+            references = _normalize_references(repair.citation_ids_to_reference, valid_ids)
+            citation_fallback_used = not references and not repair.public_statement
+        if repair.public_statement:
+            output.public_statement = repair.public_statement
+        proposed += [
+            ProposedClause(text=p.text, rationale=p.rationale, supersedes=p.supersedes)
+            for p in repair.replacement_clauses
+            if p and p.text and p.supersedes in missing_amendments
+        ]
+        proposed += _fallback_replacements(
+            _missing_amendment_ids(proposed, clause_votes),
+            institution_name,
+        )
     
     is_truncated, trunc_note = _detect_truncation(output.public_statement)
     if citation_fallback_used:
@@ -255,159 +182,130 @@ Generate your turn. For every votable clause ID listed, include exactly one vote
     )
 
 
-def _format_agenda_text(scenario) -> str:
-    items = sorted(scenario.agenda, key=lambda a: a.priority)
-    if not items:
-        return "No agenda provided."
-    lines = []
-    for item in items:
-        desc = f" - {item.description}" if item.description else ""
-        lines.append(f"P{item.priority}: {item.topic}{desc}")
-    return "\n".join(lines)
-
-
-def _build_voice_guidance(profile: CountryProfile, router_plan: RouterPlan) -> str:
-    guidance = []
-    archetypes = {a.archetype for a in (router_plan.archetypes or []) if a.score >= 0.4}
-    if "SECURITY_DEFENSE" in archetypes:
-        guidance.append("Emphasize operational realism and legal sovereignty constraints.")
-    if "TRADE_SANCTIONS_FINANCE" in archetypes or "RESOURCES_MINERALS" in archetypes:
-        guidance.append("Emphasize economic framing, licensing, and compliance mechanisms.")
-    if "ENVIRONMENT_CLIMATE" in archetypes or "HUMAN_RIGHTS_COMMUNITY" in archetypes:
-        guidance.append("Emphasize safeguards, consent thresholds, and monitoring.")
-    if profile.strategy.negotiation_style:
-        guidance.append(f"Leverage style: {profile.strategy.negotiation_style}.")
-    return " ".join(guidance) or "Balance legal, economic, and humanitarian considerations."
-
-
-def _select_citations_second_pass(
-    llm: ChatOpenAI,
-    public_statement: str,
-    citation_refs: str,
-    valid_ids: set[str],
-) -> list[str]:
-    if not public_statement or not valid_ids:
-        return []
-    selection_llm = llm.with_structured_output(CitationSelectionOutput, method="function_calling")
-    system_prompt = """Select citation IDs that directly support the statement.
-Use ONLY the provided citation IDs. If none apply, return an empty list.
-Do not invent citations or rewrite the statement."""
-    user_prompt = f"""Statement:
-{public_statement}
-
-Available citations:
-{citation_refs or "None"}
+_PREFIX_CACHE_SIZE = 64
+_prefix_lock = threading.Lock()
+# Keyed by object identity, which is cheap and stable within a run: the state
+# hands every round the same scenario, profile and router plan objects. Each
+# entry keeps its objects alive so their ids cannot be reused while cached.
+_prefix_cache: OrderedDict[tuple, tuple[TurnPrefix, tuple]] = OrderedDict()
 
-Return citation_ids_to_reference only."""
-    try:
-        result = selection_llm.invoke([
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt),
-        ])
-        output = cast(CitationSelectionOutput, result)
-    except Exception:
-        return []
-    return _normalize_references(output.citation_ids_to_reference, valid_ids)
 
+def turn_prefix(scenario, profile: CountryProfile, router_plan: RouterPlan | None, country_name: str) -> TurnPrefix:
+    """Build (once per scenario, profile and country) the static turn prompt.
 
-def _rewrite_to_propositional(
-    llm: ChatOpenAI,
-    public_statement: str,
-    scenario_name: str,
-    agenda_text: str,
-    institution_name: str,
-) -> str:
-    if not public_statement:
-        return ""
-    rewrite_llm = llm.with_structured_output(PropositionalRewriteOutput, method="function_calling")
-    system_prompt = """Rewrite the statement to avoid factual or legal assertions that require citations.
-Keep it propositional and mechanism-oriented.
-Retain the structure: 180–260 words, 2–4 short paragraphs, end punctuation.
-Include one ASK, one OFFER/CONCESSION, and one CONDITIONAL TRADEOFF.
-Address agenda priorities in order."""
-    user_prompt = f"""Scenario: {scenario_name}
-Agenda:
-{agenda_text}
-Institution name: {institution_name}
+    Without a ``router_plan`` the plan is derived from the scenario.
+    """
+    key = (country_name, id(scenario), id(profile), id(router_plan))
+    with _prefix_lock:
+        cached = _prefix_cache.get(key)
+        if cached is not None:
+            _prefix_cache.move_to_end(key)
+            return cached[0]
+    prefix = build_turn_prefix(scenario, profile, router_plan or build_router_plan(scenario), country_name)
+    with _prefix_lock:
+        _prefix_cache[key] = (prefix, (scenario, profile, router_plan))
+        while len(_prefix_cache) > _PREFIX_CACHE_SIZE:
+            _prefix_cache.popitem(last=False)
+    return prefix
 
-Original statement:
-{public_statement}
 
-Rewrite now."""
-    try:
-        result = rewrite_llm.invoke([
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt),
-        ])
-        output = cast(PropositionalRewriteOutput, result)
-    except Exception:
-        return ""
-    return (output.public_statement or "").strip()
+def _missing_amendment_ids(proposed: list[ProposedClause], clause_votes: dict[str, str]) -> set[str]:
+    amend_ids = {cid for cid, vote in clause_votes.items() if vote == "amend"}
+    return amend_ids - {p.supersedes for p in proposed if p.supersedes}
 
 
-def _ensure_amendment_replacements(
-    llm: ChatOpenAI,
-    proposed: list[ProposedClause],
-    clause_votes: dict[str, str],
-    votable_clauses: list,
+def _repair_turn(
+    public_statement: str,
+    *,
+    needs_citations: bool,
+    missing_amendments: dict[str, str],
+    truncation_note: str | None,
+    citation_refs: str,
     scenario_name: str,
     agenda_text: str,
     institution_name: str,
-) -> list[ProposedClause]:
-    amend_ids = {cid for cid, vote in clause_votes.items() if vote == "amend"}
-    if not amend_ids:
-        return proposed
-    existing_supersedes = {p.supersedes for p in proposed if p.supersedes}
-    missing = amend_ids - existing_supersedes
-    if not missing:
-        return proposed
-
-    clause_map = {c.id: c.text for c in votable_clauses if c.id in missing}
-    replacement_llm = llm.with_structured_output(AmendmentOutput, method="function_calling")
-    system_prompt = """Draft replacement clauses for amendments.
-Each replacement must set supersedes to the clause ID being amended.
-Ensure each clause is implementable: scope, authority, timelines, compliance, exceptions."""
-    clause_text = "\n".join(f"{cid}: {text}" for cid, text in clause_map.items())
+) -> LLMFlow[TurnRepairOutput]:
+    """Fix every deficiency of a first-pass turn in a single structured call.
+
+    Covers missing citations (select supporting IDs, or rewrite the statement
+    propositionally if none apply), amend votes without a replacement clause,
+    and a truncated statement. Returns an empty repair if the call fails.
+    """
+    deficiencies = []
+    if needs_citations:
+        deficiencies.append("missing_citations")
+    if missing_amendments:
+        deficiencies.append("missing_amendments")
+    if truncation_note:
+        deficiencies.append("truncated")
+    count_event("turn_repair")
+    for deficiency in deficiencies:
+        count_event(f"turn_repair.{deficiency}")
+
+    tasks = []
+    if needs_citations:
+        tasks.append(
+            "CITATIONS: The statement references no citations. Select citation IDs from the "
+            "list below that directly support it (use ONLY those IDs, never invent any). If none "
+            "apply, return an empty list and rewrite public_statement to avoid factual or legal "
+            "assertions that require citations: propositional and mechanism-oriented, 180-260 "
+            "words, 2-4 short paragraphs, one ASK, one OFFER/CONCESSION and one CONDITIONAL "
+            "TRADEOFF, agenda priorities in order."
+        )
+    if truncation_note:
+        tasks.append(
+            f"TRUNCATION: {truncation_note}. Return the complete public_statement, keeping the "
+            "original wording and ending with proper punctuation."
+        )
+    if missing_amendments:
+        clause_text = "\n".join(f"{cid}: {text}" for cid, text in missing_amendments.items())
+        tasks.append(
+            "AMENDMENTS: The country voted to amend these clauses without proposing replacements. "
+            "Draft one replacement_clauses entry per clause with supersedes set to its ID; each must "
+            "be implementable (scope, authority, timelines, compliance, exceptions).\n"
+            f"{clause_text}"
+        )
+
+    system_prompt = """You repair a diplomatic negotiation turn.
+Fix only the listed problems. Leave public_statement empty unless a task asks you to rewrite or complete it, and leave other fields empty when no task needs them."""
     user_prompt = f"""Scenario: {scenario_name}
 Agenda:
 {agenda_text}
 Institution name: {institution_name}
 
-Clauses to replace:
-{clause_text or "None"}
+Statement:
+{public_statement}
+
+Available citations:
+{citation_refs or "None"}
 
-Provide replacement proposed_clauses."""
+Tasks:
+""" + "\n\n".join(f"{i}. {task}" for i, task in enumerate(tasks, 1))
     try:
-        result = replacement_llm.invoke([
+        result = yield LLMCall(_turn_llm(TurnRepairOutput), [
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt),
-        ])
-        output = cast(AmendmentOutput, result)
-        replacements = [
-            ProposedClause(text=p.text, rationale=p.rationale, supersedes=p.supersedes)
-            for p in (output.proposed_clauses or [])
-            if p and p.text and p.supersedes in missing
-        ]
+        ], "repair_turn")
+        output = cast(TurnRepairOutput, result)
     except Exception:
-        replacements = []
-
-    if replacements:
-        return proposed + replacements
-
-    fallback = []
-    for cid in missing:
-        fallback.append(
-            ProposedClause(
-                text=(
-                    f"Replace {cid} with a jointly drafted clause under {institution_name} "
-                    "within 30 days, specifying scope, approvals, timelines, compliance, "
-                    "exceptions, and reporting."
-                ),
-                rationale="Ensures an explicit replacement clause is proposed.",
-                supersedes=cid,
-            )
+        return TurnRepairOutput()
+    output.public_statement = (output.public_statement or "").strip()
+    return output
+
+
+def _fallback_replacements(missing: set[str], institution_name: str) -> list[ProposedClause]:
+    return [
+        ProposedClause(
+            text=(
+                f"Replace {cid} with a jointly drafted clause under {institution_name} "
+                "within 30 days, specifying scope, approvals, timelines, compliance, "
+                "exceptions, and reporting."
+            ),
+            rationale="Ensures an explicit replacement clause is proposed.",
+            supersedes=cid,
         )
-    return proposed + fallback
+        for cid in sorted(missing)
+    ]
 
 
 def _normalize_clause_votes(raw_votes: dict[str, str] | list[Any]) -> dict[str, str]:
@@ -432,7 +330,7 @@ def _normalize_clause_votes(raw_votes: dict[str, str] | list[Any]) -> dict[str,
     return votes
 
 
-def _normalize_references(raw_ids: list[Any] | None, valid_ids: set[str]) -> list[str]:
+def _normalize_references(raw_ids: list[Any] | None, valid_ids: Collection[str]) -> list[str]:
     if not raw_ids:
         return []
     seen: set[str] = set()
@@ -492,24 +390,3 @@ def _enforce_vote_policy(
         for cid in missing:
             votes[cid] = "abstain"
     return votes
-
-
-def _format_citation_groups(profile: CountryProfile, fallback: list) -> str:
-    groups = [
-        ("Scenario/Law", profile.facts.scenario_citations),
-        ("Leaders", profile.facts.leaders_citations),
-        ("Economy", profile.facts.economy.citations),
-        ("History", profile.facts.history_citations),
-        ("Other", profile.facts.citations),
-    ]
-    lines: list[str] = []
-    for label, citations in groups:
-        if not citations:
-            continue
-        lines.append(f"{label}:")
-        for c in citations[:4]:
-            lines.append(f"- {c.id}: {c.title} ({c.snippet[:80]}...)")
-    if not lines:
-        for c in fallback[:8]:
-            lines.append(f"- {c.id}: {c.title} ({c.snippet[:80]}...)")
-    return "\n".join(lines)
@@ -2,10 +2,10 @@ import logging
 from typing import cast
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
 from madd.core.config import get_settings
+from madd.core.llm import LLMCall, LLMFlow, arun_llm_flow, get_structured_model, run_llm_flow
 from madd.core.schemas import CountryScore, RoundScorecard
 from madd.core.state import DebateState
 
@@ -29,15 +29,21 @@ class JudgeLLMOutput(BaseModel):
 
 
 def evaluate_round(state: DebateState) -> RoundScorecard:
+    return run_llm_flow(_judge_flow(state))
+
+
+async def aevaluate_round(state: DebateState) -> RoundScorecard:
+    return await arun_llm_flow(_judge_flow(state))
+
+
+def _judge_flow(state: DebateState) -> LLMFlow[RoundScorecard]:
     settings = get_settings()
-    llm = ChatOpenAI(
-        model=settings.judge_model,
-        temperature=settings.judge_temperature,
-        api_key=settings.openai_api_key,
-        max_retries=settings.max_retries,
+    structured_llm = get_structured_model(
+        "judge",
+        settings.judge_model,
+        settings.judge_temperature,
+        JudgeLLMOutput,
     )
-    
-    structured_llm = llm.with_structured_output(JudgeLLMOutput, method="function_calling")
     current_round = state["round"]
     messages = [m for m in state.get("messages", []) if m.round_number == current_round]
     
@@ -68,10 +74,10 @@ Return:
 Evaluate and score."""
 
     try:
-        result = structured_llm.invoke([
+        result = yield LLMCall(structured_llm, [
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt)
-        ])
+        ], "evaluate_round")
         output = cast(JudgeLLMOutput, result)
     except Exception as e:
         logger.warning(f"Judge error: {e}")
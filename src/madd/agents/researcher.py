@@ -1,12 +1,15 @@
+import asyncio
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from typing import cast, Optional
 import traceback
 
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel
 
 from madd.core.config import get_settings
+from madd.core.llm import LLMCall, LLMFlow, arun_llm_flow, get_structured_model, run_llm_flow
+from madd.core.metrics import track
 from madd.core.schemas import (
     CountryProfile,
     CountryFacts,
@@ -14,6 +17,8 @@ from madd.core.schemas import (
     EconomicData,
     Citation,
 )
+from madd.stores.response_cache import LLMCacheMiss
+from madd.tools.research_scheduler import get_research_scheduler
 from madd.tools.web_search import search_country_info
 from madd.core.scenario_router import RouterPlan
 
@@ -59,49 +64,130 @@ def _fallback_topics() -> dict[str, str]:
     return dict(BASE_RESEARCH_TOPICS)
 
 
-def generate_profile(
+def _submit_research(
     country_name: str,
-    scenario_description: str,
-    scenario_name: str | None = None,
-    router_plan: RouterPlan | None = None,
-) -> CountryProfile:
-    settings = get_settings()
-    
+    topics: dict[str, str],
+    topic_domains: dict[str, list[str]],
+    scenario_context: str,
+) -> dict[str, Future]:
+    scheduler = get_research_scheduler()
+    return {
+        topic_key: scheduler.submit(
+            search_country_info,
+            country_name,
+            topic_key,
+            query_hint=topic_query,
+            scenario_context=scenario_context,
+            allowed_domains=topic_domains.get(topic_key),
+        )
+        for topic_key, topic_query in topics.items()
+    }
+
+
+def _collect_research(futures: dict[str, Future]) -> tuple[str, dict[str, list[Citation]]]:
     topic_citations: dict[str, list[Citation]] = {}
     research_context = ""
-    
-    if router_plan:
-        topics = dict(router_plan.research_topics)
-        topic_domains = dict(router_plan.topic_domains)
-    else:
-        topics = _fallback_topics()
-        topic_domains = {}
-    scenario_context = scenario_name or ""
-    
-    for topic_key, topic_query in topics.items():
+    for topic_key, future in futures.items():
         try:
-            text, cites = search_country_info(
-                country_name,
-                topic_key,
-                query_hint=topic_query,
-                scenario_context=scenario_context,
-                allowed_domains=topic_domains.get(topic_key),
-            )
+            text, cites = future.result()
             research_context += f"\n{topic_key.upper()}:\n{text}\n"
             topic_citations[topic_key] = cites
+        except LLMCacheMiss:
+            raise
         except Exception as e:
             print(f"  Research failed for {topic_key}: {e}")
-            traceback.print_exc()
+            traceback.print_exception(e)
             topic_citations[topic_key] = []
-    
-    llm = ChatOpenAI(
-        model=settings.research_model,
-        temperature=settings.research_temperature,
-        api_key=settings.openai_api_key,
-        max_retries=settings.max_retries,
+    return research_context, topic_citations
+
+
+@track("_research_topics")
+def _research_topics(
+    country_name: str,
+    topics: dict[str, str],
+    topic_domains: dict[str, list[str]],
+    scenario_context: str,
+) -> tuple[str, dict[str, list[Citation]]]:
+    """Run every topic search on the shared research scheduler.
+
+    Searches run concurrently; results are assembled in topic order so the
+    research context is identical to a sequential run.
+    """
+    futures = _submit_research(country_name, topics, topic_domains, scenario_context)
+    return _collect_research(futures)
+
+
+@track("_research_topics")
+async def _aresearch_topics(
+    country_name: str,
+    topics: dict[str, str],
+    topic_domains: dict[str, list[str]],
+    scenario_context: str,
+) -> tuple[str, dict[str, list[Citation]]]:
+    """Async ``_research_topics``: awaits the scheduler's searches without blocking the loop."""
+    futures = _submit_research(country_name, topics, topic_domains, scenario_context)
+    if futures:
+        await asyncio.wait([asyncio.wrap_future(f) for f in futures.values()])
+    return _collect_research(futures)
+
+
+def _research_plan(router_plan: RouterPlan | None) -> tuple[dict[str, str], dict[str, list[str]]]:
+    if router_plan:
+        return dict(router_plan.research_topics), dict(router_plan.topic_domains)
+    return _fallback_topics(), {}
+
+
+def generate_profile(
+    country_name: str,
+    scenario_description: str,
+    scenario_name: str | None = None,
+    router_plan: RouterPlan | None = None,
+) -> CountryProfile:
+    topics, topic_domains = _research_plan(router_plan)
+    research_context, topic_citations = _research_topics(
+        country_name,
+        topics,
+        topic_domains,
+        scenario_name or "",
+    )
+    return run_llm_flow(_profile_flow(
+        country_name, scenario_description, scenario_name, research_context, topic_citations,
+    ))
+
+
+async def agenerate_profile(
+    country_name: str,
+    scenario_description: str,
+    scenario_name: str | None = None,
+    router_plan: RouterPlan | None = None,
+) -> CountryProfile:
+    topics, topic_domains = _research_plan(router_plan)
+    research_context, topic_citations = await _aresearch_topics(
+        country_name,
+        topics,
+        topic_domains,
+        scenario_name or "",
     )
+    return await arun_llm_flow(_profile_flow(
+        country_name, scenario_description, scenario_name, research_context, topic_citations,
+    ))
+
+
+def _profile_flow(
+    country_name: str,
+    scenario_description: str,
+    scenario_name: str | None,
+    research_context: str,
+    topic_citations: dict[str, list[Citation]],
+) -> LLMFlow[CountryProfile]:
+    settings = get_settings()
     
-    structured_llm = llm.with_structured_output(ProfileLLMOutput, method="function_calling")
+    structured_llm = get_structured_model(
+        "research",
+        settings.research_model,
+        settings.research_temperature,
+        ProfileLLMOutput,
+    )
     
     system_prompt = """You are an expert diplomatic researcher.
 Generate a country profile based on the research data provided.
@@ -120,10 +206,10 @@ Research Data:
 Generate the profile fields."""
 
     try:
-        result = structured_llm.invoke([
+        result = yield LLMCall(structured_llm, [
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt)
-        ])
+        ], "generate_profile")
         output = cast(ProfileLLMOutput, result)
     except Exception as e:
         print(f"  Profile generation failed: {e}")
@@ -1,8 +1,11 @@
+import hashlib
+import json
+
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
 from madd.core.config import get_settings
+from madd.core.llm import LLMCall, LLMFlow, arun_llm_flow, get_structured_model, run_llm_flow
 from madd.core.state import DebateState
 from madd.core.scenario_router import DEFAULT_INSTITUTION_NAME
 
@@ -12,15 +15,28 @@ class TreatyRefinerOutput(BaseModel):
 
 
 def refine_treaty(state: DebateState) -> str:
+    return run_llm_flow(_refine_flow(state))
+
+
+async def arefine_treaty(state: DebateState) -> str:
+    return await arun_llm_flow(_refine_flow(state))
+
+
+def refinement_key(state: DebateState) -> str:
+    """Hash of the refiner's inputs: scenario plus clause ids, statuses and texts."""
+    scenario = state["scenario"]
+    treaty = state.get("treaty")
+    clauses = [
+        [c.id, c.status.value, c.proposed_by, c.supersedes, c.text]
+        for c in (treaty.clauses if treaty else [])
+    ]
+    payload = json.dumps([scenario.name, scenario.description, clauses], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _refine_flow(state: DebateState) -> LLMFlow[str]:
     settings = get_settings()
-    llm = ChatOpenAI(
-        model=settings.turn_model,
-        temperature=0.2,
-        api_key=settings.openai_api_key,
-        max_retries=settings.max_retries,
-    )
-
-    structured_llm = llm.with_structured_output(TreatyRefinerOutput, method="function_calling")
+    structured_llm = get_structured_model("refine", settings.turn_model, 0.2, TreatyRefinerOutput)
     scenario = state["scenario"]
     treaty = state.get("treaty")
     router_plan = state.get("router_plan")
@@ -95,10 +111,10 @@ Clause list:
 Draft the treaty now."""
 
     try:
-        result = structured_llm.invoke([
+        result = yield LLMCall(structured_llm, [
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt),
-        ])
+        ], "refine_treaty")
         output = TreatyRefinerOutput.model_validate(result)
     except Exception:
         return ""
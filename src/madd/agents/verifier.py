@@ -3,10 +3,10 @@ import re
 from typing import Any, cast
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field, ValidationError
 
 from madd.core.config import get_settings
+from madd.core.llm import LLMCall, LLMFlow, arun_llm_flow, get_structured_model, run_llm_flow
 from madd.core.schemas import AuditFinding, AuditSeverity
 from madd.core.state import DebateState
 
@@ -138,14 +138,15 @@ def _dedupe_findings(findings: list[AuditFinding]) -> list[AuditFinding]:
 
 
 def verify_claims(state: DebateState) -> list[AuditFinding]:
+    return run_llm_flow(_verify_flow(state))
+
+
+async def averify_claims(state: DebateState) -> list[AuditFinding]:
+    return await arun_llm_flow(_verify_flow(state))
+
+
+def _verify_flow(state: DebateState) -> LLMFlow[list[AuditFinding]]:
     settings = get_settings()
-    llm = ChatOpenAI(
-        model=settings.verify_model,
-        temperature=0.0,
-        api_key=settings.openai_api_key,
-        max_retries=settings.max_retries,
-    )
-    
     current_round = state["round"]
     all_messages = state.get("messages", [])
     messages = [m for m in all_messages if m.round_number == current_round]
@@ -214,7 +215,7 @@ def verify_claims(state: DebateState) -> list[AuditFinding]:
                     ],
                 ))
     
-    structured_llm = llm.with_structured_output(VerifierLLMOutput, method="function_calling")
+    structured_llm = get_structured_model("verify", settings.verify_model, 0.0, VerifierLLMOutput)
     
     contradiction_focus = _build_contradiction_focus(router_plan)
     system_prompt = """You are a fact-checking verifier.
@@ -258,10 +259,10 @@ Return findings with:
 Check for contradictions and inconsistencies only (unsupported claims already checked)."""
 
     try:
-        result = structured_llm.invoke([
+        result = yield LLMCall(structured_llm, [
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt)
-        ])
+        ], "verify_claims")
         output = cast(VerifierLLMOutput, result)
         
         severity_map = {
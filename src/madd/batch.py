@@ -0,0 +1,408 @@
+"""Run many scenarios (scenario x overrides x repeats) across a process pool.
+
+Manifest format::
+
+    output_dir: output/sweeps       # optional, default: --output-dir
+    workers: 4                      # optional, default: --workers
+    llm_concurrency: 8              # optional, shared across all workers
+    runs:
+      - scenario: examples/scenarios/greenland.yaml
+        rounds: [2, 3]              # scalar or list
+        repeat: 3                   # runs per combination
+        settings:                   # Settings field or env name -> scalar or list
+          turn_model: gpt-5-mini
+          MADD_TURN_TEMP: [0.3, 0.7]
+
+List values expand to their cartesian product. Every run gets its own run
+directory under ``<output_dir>/batch_<timestamp>_<suffix>/`` and the batch
+writes an ``index.json`` with per-run status, timing and token usage.
+"""
+import argparse
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from madd.core.config import Settings, get_settings
+from madd.stores.atomic import atomic_open
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchJob:
+    scenario: str
+    rounds: int | None = None
+    settings: dict[str, Any] = field(default_factory=dict)
+    repeat: int = 0
+
+    @property
+    def label(self) -> str:
+        parts = [Path(self.scenario).stem]
+        if self.rounds is not None:
+            parts.append(f"r{self.rounds}")
+        parts.extend(f"{k}={v}" for k, v in sorted(self.settings.items()))
+        parts.append(f"#{self.repeat}")
+        return " ".join(parts)
+
+
+@dataclass
+class BatchManifest:
+    jobs: list[BatchJob]
+    output_dir: str | None = None
+    workers: int | None = None
+    llm_concurrency: int | None = None
+
+
+def _as_list(value: Any) -> list:
+    return list(value) if isinstance(value, list) else [value]
+
+
+def _env_name(key: str) -> str:
+    info = Settings.model_fields.get(key)
+    if info is not None and info.alias:
+        return info.alias
+    return key
+
+
+def expand_runs(entry: dict, base_dir: Path) -> list[BatchJob]:
+    scenario = entry.get("scenario")
+    if not scenario:
+        raise ValueError("Every batch run needs a 'scenario' path")
+    scenario_path = Path(scenario)
+    if not scenario_path.is_absolute():
+        scenario_path = base_dir / scenario_path
+    repeat = int(entry.get("repeat", 1))
+    if repeat < 1:
+        raise ValueError("'repeat' must be at least 1")
+
+    overrides = entry.get("settings") or {}
+    keys = list(overrides)
+    jobs = []
+    for rounds in _as_list(entry.get("rounds")):
+        for values in itertools.product(*(_as_list(overrides[k]) for k in keys)):
+            for index in range(repeat):
+                jobs.append(BatchJob(
+                    scenario=str(scenario_path),
+                    rounds=rounds,
+                    settings=dict(zip(keys, values, strict=True)),
+                    repeat=index,
+                ))
+    return jobs
+
+
+def load_manifest(path: str | Path) -> BatchManifest:
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    if not isinstance(data, dict) or not isinstance(data.get("runs"), list):
+        raise ValueError("Batch manifest must define a 'runs' list")
+    jobs = []
+    for entry in data["runs"]:
+        jobs.extend(expand_runs(entry, path.parent))
+    return BatchManifest(
+        jobs=jobs,
+        output_dir=data.get("output_dir"),
+        workers=data.get("workers"),
+        llm_concurrency=data.get("llm_concurrency"),
+    )
+
+
+def _apply_settings(overrides: dict[str, Any]) -> dict[str, str | None]:
+    from madd.core.llm import clear_clients
+
+    previous = {}
+    for key, value in overrides.items():
+        name = _env_name(key)
+        previous[name] = os.environ.get(name)
+        os.environ[name] = str(value)
+    get_settings.cache_clear()
+    clear_clients()
+    return previous
+
+
+def _restore_settings(previous: dict[str, str | None]) -> None:
+    from madd.core.llm import clear_clients
+
+    for name, value in previous.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    get_settings.cache_clear()
+    clear_clients()
+
+
+def run_job(
+    index: int,
+    job: BatchJob,
+    batch_dir: Path,
+    llm_slots: Any = None,
+    rate_share: float = 1.0,
+) -> dict:
+    """Run one job to completion in ``batch_dir/run_<index>`` and return its index entry.
+
+    ``rate_share`` scales the per-model rate budgets, so concurrent worker
+    processes together stay within the configured limits.
+    """
+    from madd.core.graph import build_graph
+    from madd.core.llm import get_token_usage, set_llm_slots
+    from madd.core.metrics import collect_metrics
+    from madd.core.scenario import load_scenario
+    from madd.core.scheduler import set_rate_share
+    from madd.core.state import create_initial_state
+    from madd.stores.catalog import try_index_run
+    from madd.stores.checkpoint_store import checkpoint_config, open_checkpointer
+    from madd.stores.journal import journaled_updates, open_journal, replay_journal
+    from madd.stores.run_store import save_all_outputs
+
+    previous = _apply_settings(job.settings)
+    set_llm_slots(llm_slots)
+    set_rate_share(rate_share)
+    usage_before = get_token_usage()
+    entry: dict[str, Any] = {"index": index, "label": job.label, "job": asdict(job), "status": "error"}
+    start = time.perf_counter()
+    try:
+        scenario = load_scenario(job.scenario)
+        if job.rounds is not None:
+            scenario.max_rounds = job.rounds
+        run_dir = batch_dir / f"run_{index:04d}"
+        run_dir.mkdir(parents=True, exist_ok=False)
+        entry.update(run_id=run_dir.name, run_dir=str(run_dir), scenario_name=scenario.name)
+        with (
+            collect_metrics() as metrics,
+            open_checkpointer(run_dir) as checkpointer,
+            open_journal(run_dir) as journal,
+        ):
+            graph = build_graph(checkpointer)
+            config = checkpoint_config(run_dir.name)
+            for _node, _update in journaled_updates(graph, create_initial_state(scenario), config, journal):
+                pass
+        final_state = replay_journal(run_dir)
+        outputs = save_all_outputs(final_state, run_dir, metrics)
+        try_index_run(run_dir, batch_dir.parent)
+        entry["cost_usd"] = metrics.totals()["cost_usd"]
+        entry["outputs"] = {name: path.name for name, path in outputs.items()}
+        entry["status"] = "ok"
+    except Exception as err:
+        entry["error"] = f"{type(err).__name__}: {err}"
+        entry["traceback"] = traceback.format_exc()
+    finally:
+        entry["seconds"] = round(time.perf_counter() - start, 3)
+        entry["token_usage"] = _usage_delta(usage_before, get_token_usage())
+        set_llm_slots(None)
+        set_rate_share(1.0)
+        _restore_settings(previous)
+    return entry
+
+
+def _usage_delta(before: dict[str, dict], after: dict[str, dict]) -> dict[str, dict]:
+    delta = {}
+    for model, usage in after.items():
+        prior = before.get(model, {})
+        counts = {
+            key: usage.get(key, 0) - prior.get(key, 0)
+            for key in ("input_tokens", "output_tokens", "total_tokens")
+        }
+        if any(counts.values()):
+            delta[model] = counts
+    return delta
+
+
+def _write_index(batch_dir: Path, manifest_path: Path, entries: list[dict], started: datetime) -> Path:
+    index = {
+        "manifest": str(manifest_path),
+        "started_at": started.isoformat(),
+        "finished_at": datetime.now(UTC).isoformat(),
+        "runs": sorted(entries, key=lambda e: e.get("index", 0)),
+        "totals": {
+            "runs": len(entries),
+            "ok": sum(1 for e in entries if e.get("status") == "ok"),
+            "seconds": round(sum(e.get("seconds", 0) for e in entries), 3),
+            "total_tokens": sum(
+                u.get("total_tokens", 0)
+                for e in entries
+                for u in e.get("token_usage", {}).values()
+            ),
+        },
+    }
+    path = batch_dir / "index.json"
+    with atomic_open(path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    return path
+
+
+def run_batch(
+    manifest_path: str | Path,
+    *,
+    output_dir: str | Path | None = None,
+    workers: int | None = None,
+    llm_concurrency: int | None = None,
+) -> Path:
+    """Run every job in the manifest and return the path of ``index.json``.
+
+    ``workers`` of 1 runs jobs in-process. Otherwise each job gets a fresh
+    worker process so settings overrides never leak between runs, and all
+    workers share one ``llm_concurrency`` budget for model and search calls
+    and split the per-model rate budgets evenly.
+    """
+    from madd.stores.run_store import create_run_dir
+
+    manifest_path = Path(manifest_path)
+    manifest = load_manifest(manifest_path)
+    base_dir = Path(output_dir or manifest.output_dir or "output")
+    workers = max(1, workers or manifest.workers or os.cpu_count() or 1)
+    llm_concurrency = llm_concurrency or manifest.llm_concurrency
+
+    started = datetime.now(UTC)
+    batch_dir = create_run_dir(str(base_dir), prefix="batch")
+    logger.info(f"Batch: {len(manifest.jobs)} runs, workers={workers}, llm_concurrency={llm_concurrency}")
+
+    entries: list[dict] = []
+    if workers == 1:
+        slots = threading.BoundedSemaphore(llm_concurrency) if llm_concurrency else None
+        for index, job in enumerate(manifest.jobs):
+            entry = run_job(index, job, batch_dir, slots)
+            entries.append(entry)
+            logger.info(f"[{entry['status']}] {job.label} ({entry['seconds']}s)")
+        return _write_index(batch_dir, manifest_path, entries, started)
+
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Manager() as manager:
+        slots = manager.BoundedSemaphore(llm_concurrency) if llm_concurrency else None
+        rate_share = 1.0 / max(1, min(workers, len(manifest.jobs)))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, max_tasks_per_child=1) as pool:
+            futures = {
+                pool.submit(run_job, index, job, batch_dir, slots, rate_share): index
+                for index, job in enumerate(manifest.jobs)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                job = manifest.jobs[index]
+                try:
+                    entry = future.result()
+                except Exception as err:
+                    entry = {
+                        "index": index,
+                        "label": job.label,
+                        "job": asdict(job),
+                        "status": "error",
+                        "error": str(err),
+                    }
+                entries.append(entry)
+                logger.info(f"[{entry['status']}] {job.label} ({entry.get('seconds', 0)}s)")
+    return _write_index(batch_dir, manifest_path, entries, started)
+
+
+def plan_batch(manifest_path: str | Path) -> dict:
+    """Estimate every job of a manifest without calling any model.
+
+    Jobs are planned in order with their setting overrides applied; a profile
+    that an earlier job researches counts as cached for later ones.
+    """
+    from madd.core.dry_run import plan_run
+    from madd.core.scenario import load_scenario
+
+    manifest = load_manifest(manifest_path)
+    known_profiles: set[str] = set()
+    entries = []
+    totals: dict[str, Any] = {"runs": 0, "llm_calls": 0, "search_calls": 0, "prompt_tokens": 0, "cost_usd": 0.0}
+    for index, job in enumerate(manifest.jobs):
+        previous = _apply_settings(job.settings)
+        try:
+            scenario = load_scenario(job.scenario)
+            if job.rounds is not None:
+                scenario.max_rounds = job.rounds
+            plan = plan_run(scenario, known_profiles=known_profiles).to_dict()
+        finally:
+            _restore_settings(previous)
+        job_totals = plan["totals"]
+        entries.append({"index": index, "label": job.label, **job_totals})
+        totals["runs"] += 1
+        for key in ("llm_calls", "search_calls", "prompt_tokens"):
+            totals[key] += job_totals[key]
+        if totals["cost_usd"] is not None and job_totals["cost_usd"] is not None:
+            totals["cost_usd"] = round(totals["cost_usd"] + job_totals["cost_usd"], 6)
+        else:
+            totals["cost_usd"] = None
+    return {"manifest": str(manifest_path), "runs": entries, "totals": totals}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="madd batch",
+        description="Run a manifest of scenarios and overrides in parallel"
+    )
+    parser.add_argument(
+        "manifest",
+        type=Path,
+        help="Path to batch manifest YAML"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Base output directory (overrides the manifest)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: manifest value or CPU count)"
+    )
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=None,
+        help="Max concurrent LLM/search requests across all workers"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Estimate calls, tokens and cost of every run as JSON without running"
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    settings = get_settings()
+    logging.basicConfig(level=logging.DEBUG if settings.debug else logging.INFO)
+    args = build_parser().parse_args(argv)
+    if args.dry_run:
+        try:
+            print(json.dumps(plan_batch(args.manifest), indent=2))
+        except (OSError, ValueError, yaml.YAMLError) as err:
+            print(f"Error: {err}", file=sys.stderr)
+            return 2
+        return 0
+    try:
+        index_path = run_batch(
+            args.manifest,
+            output_dir=args.output_dir,
+            workers=args.workers,
+            llm_concurrency=args.llm_concurrency,
+        )
+    except (OSError, ValueError) as err:
+        print(f"Error: {err}", file=sys.stderr)
+        return 2
+    with open(index_path, encoding="utf-8") as f:
+        totals = json.load(f)["totals"]
+    print(f"Batch index: {index_path}")
+    print(f"Runs: {totals['ok']}/{totals['runs']} ok, {totals['seconds']}s, {totals['total_tokens']} tokens")
+    return 0 if totals["ok"] == totals["runs"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
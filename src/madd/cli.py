@@ -1,25 +1,78 @@
 import argparse
 import logging
 import sys
+import threading
 import traceback
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from madd.core.config import get_settings
-from madd.core.graph import build_graph
-from madd.core.scenario import load_scenario
-from madd.core.state import create_initial_state
-from madd.stores.run_store import create_run_dir, save_all_outputs
 
+if TYPE_CHECKING:
+    from madd.core.streaming import StatementDelta
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
-        prog="madd",
-        description="Multi-Agent Diplomatic Debate"
-    )
+
+class WatchPrinter:
+    """Prints streamed statements and per-node progress lines for ``--watch``.
+
+    Simultaneous turns interleave, so a ``[country]`` header is printed
+    whenever the speaking country changes.
+    """
+
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        self._lock = threading.Lock()
+        self._speaker: tuple | None = None
+
+    def statement(self, delta: "StatementDelta") -> None:
+        with self._lock:
+            speaker = (delta.country, delta.round)
+            if speaker != self._speaker:
+                if self._speaker is not None:
+                    self.out.write("\n")
+                self.out.write(f"  [{delta.country} r{delta.round}] ")
+                self._speaker = speaker
+            self.out.write(delta.text)
+            self.out.flush()
+
+    def line(self, text: str) -> None:
+        with self._lock:
+            if self._speaker is not None:
+                self.out.write("\n")
+                self._speaker = None
+            self.out.write(text + "\n")
+            self.out.flush()
+
+
+# Subcommands with their own parsers; their arguments are forwarded as-is.
+_DELEGATED_COMMANDS = {
+    "batch": ("madd.batch", "Run a manifest of scenarios and overrides in parallel"),
+    "runs": ("madd.runs", "Query the catalog of finished runs"),
+}
+_DEFAULT_COMMAND = "run"
+_COMMANDS = (_DEFAULT_COMMAND, "validate", *_DELEGATED_COMMANDS)
+
+
+class _CommandParser(argparse.ArgumentParser):
+    """Top-level parser that falls back to the ``run`` command.
+
+    ``madd scenario.yaml`` is short for ``madd run scenario.yaml``; a scenario
+    file named like a command can be run as ``madd run batch``.
+    """
+
+    def parse_known_args(self, args=None, namespace=None):
+        args = sys.argv[1:] if args is None else list(args)
+        if not args or args[0] not in (*_COMMANDS, "-h", "--help"):
+            args = [_DEFAULT_COMMAND, *args]
+        return super().parse_known_args(args, namespace)
+
+
+def _add_run_arguments(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "scenario",
         type=Path,
-        help="Path to scenario YAML file"
+        nargs="?",
+        help="Path to scenario YAML file (optional with --resume)"
     )
     parser.add_argument(
         "--rounds",
@@ -36,68 +89,225 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--watch",
         action="store_true",
-        help="Print per-node progress while the graph runs"
+        help="Stream country statements and print per-node progress while the graph runs"
     )
     parser.add_argument(
         "--print-summary",
         action="store_true",
         help="Print final summary to stdout after run"
     )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        default=None,
+        help="Resume an interrupted run from its last completed node"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Validate the scenario and estimate calls, tokens and cost without running (also: madd validate)"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="With --dry-run, print the estimate as JSON"
+    )
+    parser.add_argument(
+        "--import-profile",
+        action="store_true",
+        help="Report cold-start import time of the madd entry points and exit"
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = _CommandParser(
+        prog="madd",
+        description="Multi-Agent Diplomatic Debate. "
+        "'madd SCENARIO' runs a scenario (short for 'madd run SCENARIO').",
+    )
+    commands = parser.add_subparsers(
+        dest="command",
+        metavar="COMMAND",
+        parser_class=argparse.ArgumentParser,
+    )
+    run = commands.add_parser(
+        "run",
+        help="Run a scenario (default command)",
+        description="Run a scenario, or resume an interrupted run"
+    )
+    _add_run_arguments(run)
+    validate = commands.add_parser(
+        "validate",
+        help="Check a scenario and estimate calls, tokens and cost (same as run --dry-run)",
+        description="Check a scenario and estimate calls, tokens and cost without running"
+    )
+    validate.add_argument("scenario", type=Path, help="Path to scenario YAML file")
+    validate.add_argument("--rounds", type=int, default=None, help="Override max rounds")
+    validate.add_argument("--json", action="store_true", help="Print the estimate as JSON")
+    for name, (_module, help_text) in _DELEGATED_COMMANDS.items():
+        commands.add_parser(
+            name,
+            add_help=False,
+            help=f"{help_text} (see 'madd {name} --help')",
+        )
     return parser
 
 
+def dry_run(scenario_path: Path, rounds: int | None = None, *, as_json: bool = False) -> int:
+    """Print the run plan of a scenario without calling any model; returns the exit status."""
+    import json
+
+    from pydantic import ValidationError
+    from yaml import YAMLError
+
+    from madd.core.dry_run import format_plan, plan_run
+    from madd.core.scenario import load_scenario
+
+    try:
+        scenario = load_scenario(scenario_path)
+        if rounds:
+            scenario.max_rounds = rounds
+    except (OSError, ValidationError, YAMLError) as err:
+        print(f"Invalid scenario {scenario_path}: {err}", file=sys.stderr)
+        return 2
+    plan = plan_run(scenario)
+    print(json.dumps(plan.to_dict(), indent=2) if as_json else format_plan(plan))
+    return 0
+
+
 def main():
     settings = get_settings()
     logging.basicConfig(level=logging.DEBUG if settings.debug else logging.INFO)
     parser = build_parser()
-    args = parser.parse_args()
+    args, extra = parser.parse_known_args(sys.argv[1:])
+    if args.command in _DELEGATED_COMMANDS:
+        import importlib
+
+        module = importlib.import_module(_DELEGATED_COMMANDS[args.command][0])
+        raise SystemExit(module.main(sys.argv[2:]))
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    if args.command == "validate":
+        raise SystemExit(dry_run(args.scenario, args.rounds, as_json=args.json))
     
-    print(f"Loading scenario: {args.scenario}")
-    scenario = load_scenario(args.scenario)
+    if args.import_profile:
+        from madd.scripts.import_profile import main as import_profile_main
+        raise SystemExit(import_profile_main([]))
     
-    if args.rounds:
-        scenario.max_rounds = args.rounds
+    if args.scenario is None and not args.resume:
+        parser.error("a scenario file is required unless --resume is given")
+
+    if args.dry_run:
+        if args.scenario is None:
+            parser.error("--dry-run needs a scenario file")
+        raise SystemExit(dry_run(args.scenario, args.rounds, as_json=args.json))
+
+    # Imported here so ``--help`` and argument errors skip LangGraph and the model SDKs.
+    from madd.core.graph import build_graph
+    from madd.core.metrics import collect_metrics
+    from madd.core.scenario import load_scenario
+    from madd.core.state import create_initial_state
+    from madd.core.streaming import stream_statements
+    from madd.stores.catalog import try_index_run
+    from madd.stores.checkpoint_store import (
+        checkpoint_config,
+        load_checkpoint_state,
+        open_checkpointer,
+        resolve_run_dir,
+    )
+    from madd.stores.journal import (
+        apply_update,
+        journal_path,
+        journaled_updates,
+        open_journal,
+        replay_journal,
+    )
+    from madd.stores.run_store import create_run_dir, save_all_outputs
     
-    print(f"Scenario: {scenario.name}")
-    print(f"Countries: {', '.join(scenario.countries)}")
-    print(f"Max rounds: {scenario.max_rounds}")
-    print()
+    if args.resume:
+        try:
+            run_dir = resolve_run_dir(args.output_dir, args.resume)
+        except FileNotFoundError as err:
+            print(f"Error: {err}", file=sys.stderr)
+            raise SystemExit(2) from err
+        print(f"Resuming run: {run_dir.name}")
+        if args.scenario or args.rounds:
+            print("(Scenario and --rounds come from the checkpoint when resuming)")
+    else:
+        print(f"Loading scenario: {args.scenario}")
+        scenario = load_scenario(args.scenario)
+        
+        if args.rounds:
+            scenario.max_rounds = args.rounds
+        run_dir = create_run_dir(str(args.output_dir))
     
-    initial_state = create_initial_state(scenario)
+    run_id = run_dir.name
+    config = checkpoint_config(run_id)
     
     print("Building graph...")
-    graph = build_graph()
-    
-    print("Running debate...\n")
-    final_state = None
-    try:
-        if args.watch:
-            running_state = dict(initial_state)
-            for update_batch in graph.stream(running_state, stream_mode="updates"):
-                for node, update in update_batch.items():
-                    if not update:
-                        continue
-                    if isinstance(update, dict):
-                        running_state.update(update)
-                    current_round = running_state.get("round", 0)
-                    msg_count = len(running_state.get("messages", []))
-                    treaty = running_state.get("treaty")
-                    treaty_text = len(treaty.clauses) if treaty else 0
-                    print(f"[{node}] round={current_round} messages={msg_count} clauses={treaty_text}")
-                final_state = running_state
+    with (
+        collect_metrics() as metrics,
+        open_checkpointer(run_dir) as checkpointer,
+        open_journal(run_dir) as journal,
+    ):
+        graph = build_graph(checkpointer)
+        
+        if args.resume:
+            try:
+                initial_state = load_checkpoint_state(graph, run_id)
+            except ValueError as err:
+                print(f"Error: {err}", file=sys.stderr)
+                raise SystemExit(2) from err
+            graph_input = None
+            scenario = initial_state["scenario"]
         else:
-            for event in graph.stream(initial_state, stream_mode="values"):
-                final_state = event
-    except Exception as err:
-        print(f"Error during debate: {err}", file=sys.stderr)
-        traceback.print_exc()
-        raise SystemExit(1) from err
+            initial_state = create_initial_state(scenario)
+            graph_input = initial_state
+        
+        print(f"Scenario: {scenario.name}")
+        print(f"Countries: {', '.join(scenario.countries)}")
+        print(f"Max rounds: {initial_state.get('max_rounds', scenario.max_rounds)}")
+        print(f"Run ID: {run_id}")
+        print()
+        
+        print("Running debate...\n")
+        print(f"Journal: {journal_path(run_dir)}\n")
+        try:
+            updates = journaled_updates(graph, graph_input, config, journal)
+            if args.watch:
+                running_state = dict(initial_state)
+                printer = WatchPrinter()
+                with stream_statements(printer.statement):
+                    for node, update in updates:
+                        if not update:
+                            continue
+                        if isinstance(update, dict):
+                            running_state = apply_update(running_state, update)
+                        current_round = running_state.get("round", 0)
+                        msg_count = len(running_state.get("messages", []))
+                        treaty = running_state.get("treaty")
+                        treaty_text = len(treaty.clauses) if treaty else 0
+                        printer.line(f"[{node}] round={current_round} messages={msg_count} clauses={treaty_text}")
+            else:
+                for _node, _update in updates:
+                    pass
+        except Exception as err:
+            print(f"Error during debate: {err}", file=sys.stderr)
+            traceback.print_exc()
+            print(f"Resume with: madd --resume {run_id} --output-dir {args.output_dir}", file=sys.stderr)
+            raise SystemExit(1) from err
     
+    final_state = replay_journal(run_dir)
     if final_state:
         print("\nSaving outputs...")
-        run_dir = create_run_dir(str(args.output_dir))
-        outputs = save_all_outputs(final_state, run_dir)
+        outputs = save_all_outputs(final_state, run_dir, metrics)
+        try_index_run(run_dir)
         
+        totals = metrics.totals()
+        print(
+            f"\nCalls: {totals['calls']} ({totals['cached']} cached, {totals['retries']} retries), "
+            f"tokens: {totals['total_tokens']}, est. cost: ${totals['cost_usd']:.4f}"
+        )
         print(f"\nOutputs saved to: {run_dir}")
         for name, path in outputs.items():
             print(f"  - {name}: {path.name}")
@@ -1,23 +1,69 @@
-from madd.core.schemas import (
-    Citation,
-    EconomicData,
-    CountryFacts,
-    CountryStrategy,
-    CountryProfile,
-    Clause,
-    ClauseStatus,
-    TreatyDraft,
-    CountryScore,
-    RoundScorecard,
-    AuditSeverity,
-    AuditFinding,
-    ProposedClause,
-    DebateMessage,
-)
-from madd.core.scenario import Scenario, AgendaItem, load_scenario
-from madd.core.state import DebateState, create_initial_state
-from madd.core.config import Settings, get_settings, current_year
-from madd.core.graph import build_graph
+from typing import TYPE_CHECKING
+
+from madd._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from madd.core.config import (
+        Settings,
+        current_year,
+        get_settings,
+    )
+    from madd.core.graph import (
+        build_async_graph,
+        build_graph,
+    )
+    from madd.core.scenario import (
+        AgendaItem,
+        Scenario,
+        load_scenario,
+    )
+    from madd.core.schemas import (
+        AuditFinding,
+        AuditSeverity,
+        Citation,
+        Clause,
+        ClauseStatus,
+        CountryFacts,
+        CountryProfile,
+        CountryScore,
+        CountryStrategy,
+        DebateMessage,
+        EconomicData,
+        ProposedClause,
+        RoundScorecard,
+        TreatyDraft,
+    )
+    from madd.core.state import (
+        DebateState,
+        create_initial_state,
+    )
+
+_EXPORTS = {
+    "Citation": "madd.core.schemas",
+    "EconomicData": "madd.core.schemas",
+    "CountryFacts": "madd.core.schemas",
+    "CountryStrategy": "madd.core.schemas",
+    "CountryProfile": "madd.core.schemas",
+    "Clause": "madd.core.schemas",
+    "ClauseStatus": "madd.core.schemas",
+    "TreatyDraft": "madd.core.schemas",
+    "CountryScore": "madd.core.schemas",
+    "RoundScorecard": "madd.core.schemas",
+    "AuditSeverity": "madd.core.schemas",
+    "AuditFinding": "madd.core.schemas",
+    "ProposedClause": "madd.core.schemas",
+    "DebateMessage": "madd.core.schemas",
+    "Scenario": "madd.core.scenario",
+    "AgendaItem": "madd.core.scenario",
+    "load_scenario": "madd.core.scenario",
+    "DebateState": "madd.core.state",
+    "create_initial_state": "madd.core.state",
+    "Settings": "madd.core.config",
+    "get_settings": "madd.core.config",
+    "current_year": "madd.core.config",
+    "build_graph": "madd.core.graph",
+    "build_async_graph": "madd.core.graph",
+}
 
 __all__ = [
     "Citation",
@@ -43,4 +89,7 @@ __all__ = [
     "get_settings",
     "current_year",
     "build_graph",
+    "build_async_graph",
 ]
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -27,12 +28,42 @@ class Settings(BaseSettings):
     # Search settings
     search_cache_dir: str = Field(default=".cache/search", alias="MADD_SEARCH_CACHE_DIR")
     search_cache_enabled: bool = Field(default=True, alias="MADD_SEARCH_CACHE")
+    search_cache_ttl_hours: float = Field(default=0.0, ge=0, alias="MADD_SEARCH_CACHE_TTL_HOURS")
+    search_cache_max_entries: int = Field(default=50000, ge=0, alias="MADD_SEARCH_CACHE_MAX_ENTRIES")
+    
+    # LLM response cache: "off", "readwrite", or "replay" (fail on miss)
+    llm_cache_mode: Literal["off", "readwrite", "replay"] = Field(default="off", alias="MADD_LLM_CACHE")
+    llm_cache_dir: str = Field(default=".cache/llm", alias="MADD_LLM_CACHE_DIR")
+    llm_cache_max_mb: float = Field(default=512.0, ge=0, alias="MADD_LLM_CACHE_MAX_MB")
     
     # Behavior
     max_retries: int = Field(default=3, alias="MADD_MAX_RETRIES")
     debug: bool = Field(default=False, alias="MADD_DEBUG")
+    # Stream turn responses while statements are being watched (--watch, web UI);
+    # turns nobody listens to are never streamed
+    stream_turns: bool = Field(default=True, alias="MADD_STREAM_TURNS")
     strict_votes: bool = Field(default=False, alias="MADD_STRICT_VOTES")
     
+    # Turn prompt history: recent turns kept verbatim, and the token budget
+    # shared by recent turns, earlier-round summaries and changed clauses
+    history_window: int = Field(default=4, ge=0, alias="MADD_HISTORY_WINDOW")
+    history_token_budget: int = Field(default=2500, ge=0, alias="MADD_HISTORY_TOKEN_BUDGET")
+    
+    # Concurrency
+    simultaneous_turns: bool = Field(default=False, alias="MADD_SIMULTANEOUS_TURNS")
+    turn_concurrency: int = Field(default=4, ge=1, alias="MADD_TURN_CONCURRENCY")
+    research_concurrency: int = Field(default=8, ge=1, alias="MADD_RESEARCH_CONCURRENCY")
+    search_min_interval: float = Field(default=0.0, ge=0.0, alias="MADD_SEARCH_MIN_INTERVAL")
+    # Per-model rate budgets for the request scheduler (0 = unlimited).
+    # MADD_MODEL_RATE_LIMITS overrides them per model as JSON [rpm, tpm],
+    # e.g. {"gpt-5-mini": [500, 200000]}
+    llm_rpm: int = Field(default=0, ge=0, alias="MADD_LLM_RPM")
+    llm_tpm: int = Field(default=0, ge=0, alias="MADD_LLM_TPM")
+    model_rate_limits: dict[str, tuple[int, int]] = Field(default_factory=dict, alias="MADD_MODEL_RATE_LIMITS")
+    # Start treaty refinement during the final round's verify/judge and reuse
+    # it when the clause set is unchanged
+    speculative_refine: bool = Field(default=False, alias="MADD_SPECULATIVE_REFINE")
+    
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8",
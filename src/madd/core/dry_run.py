@@ -0,0 +1,193 @@
+"""Validate a scenario and estimate a run's cost without calling any model.
+
+``plan_run`` loads nothing but the scenario and the profile cache: it builds
+the ``RouterPlan``, splits countries into cached profiles and ones that need
+research, and counts the model and search calls each graph node will make
+for the configured rounds, with estimated prompt tokens and cost.
+
+Call counts are exact for the happy path. They exclude turn repairs and
+retries, and the search count is an upper bound, since cached searches are
+free. Prompt tokens use the same ``len // 4`` estimate as the history
+budget. A turn's static prefix is measured from the real prompt; the other
+agents use the fixed sizes below.
+"""
+from dataclasses import asdict, dataclass, field
+
+from madd.core.config import get_settings
+from madd.core.history import estimate_tokens
+from madd.core.metrics import WEB_SEARCH_CALL_USD, estimate_cost
+from madd.core.scenario import Scenario
+from madd.core.scenario_router import RouterPlan, build_router_plan
+from madd.core.scheduler import OUTPUT_TOKEN_ESTIMATE, SEARCH_TOKEN_ESTIMATE
+from madd.core.schemas import CountryFacts, CountryProfile
+from madd.core.turn_prompt import build_turn_prefix
+from madd.stores.profile_store import get_profile_path, make_scenario_key, usable_cached_profile
+
+# Approximate size of each agent's fixed instructions, and of the per-country
+# material it adds (statement excerpts, facts) to one round's prompt.
+_FIXED_PROMPT_TOKENS = {"generate_profile": 80, "verify_claims": 160, "evaluate_round": 120, "refine_treaty": 420}
+_PER_COUNTRY_TOKENS = {"verify_claims": 330, "evaluate_round": 130}
+# Research context is truncated to 8000 characters in the profile prompt.
+_RESEARCH_CONTEXT_TOKENS = 8000 // 4
+# A clause line in the refinement prompt; about one clause per turn survives.
+_CLAUSE_TOKENS = 60
+# Votable clauses and instructions of a turn's user message before any history.
+_TURN_MESSAGE_TOKENS = 120
+
+
+@dataclass
+class NodeEstimate:
+    node: str
+    model: str = ""
+    llm_calls: int = 0
+    search_calls: int = 0
+    prompt_tokens: int = 0
+    cost_usd: float | None = 0.0
+
+    def add_llm(self, calls: int, prompt_tokens: int) -> None:
+        self.llm_calls += calls
+        self.prompt_tokens += prompt_tokens
+        self._add_cost(estimate_cost(self.model, prompt_tokens, calls * OUTPUT_TOKEN_ESTIMATE))
+
+    def add_search(self, calls: int, model: str) -> None:
+        self.search_calls += calls
+        token_cost = estimate_cost(model, calls * SEARCH_TOKEN_ESTIMATE, 0)
+        self._add_cost(None if token_cost is None else token_cost + calls * WEB_SEARCH_CALL_USD)
+
+    def _add_cost(self, cost: float | None) -> None:
+        if cost is None or self.cost_usd is None:
+            self.cost_usd = None
+        else:
+            self.cost_usd += cost
+
+
+@dataclass
+class RunPlan:
+    scenario: Scenario
+    router_plan: RouterPlan
+    rounds: int
+    cached_profiles: list[str] = field(default_factory=list)
+    research_profiles: list[str] = field(default_factory=list)
+    nodes: list[NodeEstimate] = field(default_factory=list)
+
+    def totals(self) -> NodeEstimate:
+        total = NodeEstimate(node="total")
+        for node in self.nodes:
+            total.llm_calls += node.llm_calls
+            total.search_calls += node.search_calls
+            total.prompt_tokens += node.prompt_tokens
+            total._add_cost(node.cost_usd)
+        return total
+
+    def to_dict(self) -> dict:
+        return {
+            "scenario": self.scenario.name,
+            "countries": list(self.scenario.countries),
+            "rounds": self.rounds,
+            "archetypes": {a.archetype: a.score for a in self.router_plan.archetypes},
+            "institution_name": self.router_plan.institution_name,
+            "research_topics": sorted(self.router_plan.research_topics),
+            "cached_profiles": self.cached_profiles,
+            "research_profiles": self.research_profiles,
+            "nodes": [asdict(node) for node in self.nodes],
+            "totals": asdict(self.totals()),
+        }
+
+
+def plan_run(scenario: Scenario, *, known_profiles: set[str] | None = None) -> RunPlan:
+    """Estimate the calls of running ``scenario`` for ``scenario.max_rounds`` rounds.
+
+    ``known_profiles`` holds profile paths that an earlier run will have
+    researched by then (used to total a batch); new ones are added to it.
+    """
+    settings = get_settings()
+    router_plan = build_router_plan(scenario)
+    plan = RunPlan(scenario=scenario, router_plan=router_plan, rounds=scenario.max_rounds)
+    scenario_key = make_scenario_key(scenario.name, scenario.description)
+    known = known_profiles if known_profiles is not None else set()
+    profiles: dict[str, CountryProfile] = {}
+    for country in scenario.countries:
+        path = str(get_profile_path(country, scenario_key))
+        cached = usable_cached_profile(country, scenario_key)
+        if cached is not None:
+            profiles[country] = cached
+            plan.cached_profiles.append(country)
+        elif path in known:
+            plan.cached_profiles.append(country)
+        else:
+            plan.research_profiles.append(country)
+        known.add(path)
+
+    research = NodeEstimate("ensure_profiles", model=settings.research_model)
+    researched = len(plan.research_profiles)
+    if researched:
+        research.add_search(researched * len(router_plan.research_topics), settings.search_model)
+        research.add_llm(researched, researched * (
+            _FIXED_PROMPT_TOKENS["generate_profile"]
+            + estimate_tokens(scenario.description)
+            + _RESEARCH_CONTEXT_TOKENS
+        ))
+
+    # Countries still to be researched are measured with an empty profile.
+    # Built directly: these placeholders must not enter the turn prefix cache.
+    prefix_tokens = sum(
+        estimate_tokens(build_turn_prefix(
+            scenario,
+            profiles.get(country) or CountryProfile(facts=CountryFacts(name=country)),
+            router_plan,
+            country,
+        ).system_prompt)
+        for country in scenario.countries
+    )
+    countries = len(scenario.countries)
+    opening = NodeEstimate("opening_statements", model=settings.turn_model)
+    opening.add_llm(countries, prefix_tokens + countries * _TURN_MESSAGE_TOKENS)
+    negotiate = NodeEstimate("negotiate_round", model=settings.turn_model)
+    later_rounds = plan.rounds - 1
+    if later_rounds:
+        negotiate.add_llm(
+            later_rounds * countries,
+            later_rounds * (prefix_tokens + countries * (_TURN_MESSAGE_TOKENS + settings.history_token_budget)),
+        )
+
+    verify = NodeEstimate("verify", model=settings.verify_model)
+    judge = NodeEstimate("judge", model=settings.judge_model)
+    for estimate, call in ((verify, "verify_claims"), (judge, "evaluate_round")):
+        estimate.add_llm(plan.rounds, plan.rounds * (
+            _FIXED_PROMPT_TOKENS[call] + countries * _PER_COUNTRY_TOKENS[call]
+        ))
+
+    refine = NodeEstimate("refine_treaty", model=settings.turn_model)
+    refine.add_llm(1, (
+        _FIXED_PROMPT_TOKENS["refine_treaty"]
+        + estimate_tokens(scenario.description)
+        + plan.rounds * countries * _CLAUSE_TOKENS
+    ))
+
+    plan.nodes = [research, opening, negotiate, verify, judge, refine]
+    return plan
+
+
+def format_plan(plan: RunPlan) -> str:
+    def cost(value: float | None) -> str:
+        return "n/a" if value is None else f"${value:.4f}"
+
+    router = plan.router_plan
+    lines = [
+        f"Scenario: {plan.scenario.name}",
+        f"Countries: {', '.join(plan.scenario.countries)}",
+        f"Rounds: {plan.rounds}",
+        f"Archetypes: {', '.join(f'{a.archetype} ({a.score:.2f})' for a in router.archetypes if a.score >= 0.4) or 'none'}",
+        f"Institution: {router.institution_name}",
+        f"Research topics: {len(router.research_topics)}",
+        f"Cached profiles: {', '.join(plan.cached_profiles) or 'none'}",
+        f"Profiles to research: {', '.join(plan.research_profiles) or 'none'}",
+        "",
+        f"{'node':<20} {'model':<14} {'llm':>5} {'search':>7} {'prompt tok':>11} {'est. cost':>10}",
+    ]
+    for node in [*plan.nodes, plan.totals()]:
+        lines.append(
+            f"{node.node:<20} {node.model:<14} {node.llm_calls:>5} {node.search_calls:>7} "
+            f"{node.prompt_tokens:>11} {cost(node.cost_usd):>10}"
+        )
+    return "\n".join(lines)
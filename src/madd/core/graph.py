@@ -1,20 +1,48 @@
+import asyncio
+import contextvars
 import logging
 import re
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, as_completed
+from typing import Any, Protocol, cast
 
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph, END
+from langgraph.graph.state import CompiledStateGraph
 
+from madd.core.config import get_settings
+from madd.core.history import summarize_round
+from madd.core.metrics import instrument_node, metrics_scope
+from madd.core.speculation import Speculation, speculations
 from madd.core.state import DebateState
-from madd.core.schemas import AuditFinding, AuditSeverity, Clause, ClauseStatus, TreatyDraft
-from madd.stores.profile_store import ensure_profile, make_scenario_key
+from madd.core.schemas import (
+    AuditFinding,
+    AuditSeverity,
+    Clause,
+    ClauseStatus,
+    DebateMessage,
+    RoundScorecard,
+    TreatyDraft,
+)
+from madd.stores.response_cache import LLMCacheMiss
+from madd.stores.profile_store import aensure_profile, ensure_profile, make_scenario_key
 from madd.core.scenario_router import build_router_plan, DEFAULT_INSTITUTION_NAME
-from madd.core.treaty_utils import get_votable_clauses
-from madd.agents.country import generate_turn
-from madd.agents.judge import evaluate_round
-from madd.agents.verifier import verify_claims
-from madd.agents.treaty_refiner import refine_treaty
+from madd.core.treaty_utils import ClauseLedger
+from madd._lazy import lazy_function
 
 logger = logging.getLogger(__name__)
 
+# Agents pull in the model SDKs; they are imported when a node first calls them.
+generate_turn = lazy_function("madd.agents.country", "generate_turn")
+agenerate_turn = lazy_function("madd.agents.country", "agenerate_turn")
+evaluate_round = lazy_function("madd.agents.judge", "evaluate_round")
+aevaluate_round = lazy_function("madd.agents.judge", "aevaluate_round")
+verify_claims = lazy_function("madd.agents.verifier", "verify_claims")
+averify_claims = lazy_function("madd.agents.verifier", "averify_claims")
+refine_treaty = lazy_function("madd.agents.treaty_refiner", "refine_treaty")
+arefine_treaty = lazy_function("madd.agents.treaty_refiner", "arefine_treaty")
+refinement_key = lazy_function("madd.agents.treaty_refiner", "refinement_key")
+
 def _log_state(event: str, state: DebateState) -> None:
     round_number = state.get("round", 0)
     max_rounds = state.get("max_rounds", 0)
@@ -34,26 +62,34 @@ def _log_state(event: str, state: DebateState) -> None:
     )
 
 
-def build_graph() -> StateGraph:
+class _Node(Protocol):
+    def __call__(self, state: DebateState) -> Any: ...
+
+
+def _submit_in_context[**P, R](pool: Executor, fn: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> Future[R]:
+    """``pool.submit`` that runs ``fn`` in a copy of the caller's contextvars (metrics scopes)."""
+    context = contextvars.copy_context()
+    return pool.submit(lambda: context.run(fn, *args, **kwargs))
+
+
+def _compile_graph(nodes: dict[str, _Node], checkpointer: BaseCheckpointSaver | None) -> CompiledStateGraph:
     graph = StateGraph(DebateState)
-    
-    graph.add_node("ensure_profiles", _ensure_profiles)
-    graph.add_node("opening_statements", _opening_statements)
-    graph.add_node("negotiate_round", _negotiate_round)
-    graph.add_node("compile_treaty", _compile_treaty)
-    graph.add_node("verify", _verify)
-    graph.add_node("judge", _judge)
-    graph.add_node("refine_treaty", _refine_treaty)
-    graph.add_node("finalize_report", _finalize_report)
+    for name, fn in nodes.items():
+        graph.add_node(name, instrument_node(name, fn))
     
     graph.set_entry_point("ensure_profiles")
     graph.add_edge("ensure_profiles", "opening_statements")
     graph.add_edge("opening_statements", "compile_treaty")
+    # Verify and judge read the same round and write disjoint reducer keys
+    # (audit, scorecards), so they run in one superstep and join before the
+    # continue/finalize decision.
+    graph.add_node("review_round", _review_round)
     graph.add_edge("compile_treaty", "verify")
-    graph.add_edge("verify", "judge")
+    graph.add_edge("compile_treaty", "judge")
+    graph.add_edge(["verify", "judge"], "review_round")
     
     graph.add_conditional_edges(
-        "judge",
+        "review_round",
         _should_continue,
         {
             "continue": "negotiate_round",
@@ -64,53 +100,149 @@ def build_graph() -> StateGraph:
     graph.add_edge("refine_treaty", "finalize_report")
     graph.add_edge("finalize_report", END)
     
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
+
+
+def build_graph(checkpointer: BaseCheckpointSaver | None = None) -> CompiledStateGraph:
+    """Compile the debate graph.
+
+    With a ``checkpointer`` every completed node is persisted per thread, so an
+    interrupted run can be resumed with ``graph.stream(None, config)``.
+    Nodes are wrapped so their timing and model calls land in the run metrics.
+    """
+    return _compile_graph({
+        "ensure_profiles": _ensure_profiles,
+        "opening_statements": _opening_statements,
+        "negotiate_round": _negotiate_round,
+        "compile_treaty": _compile_treaty_node,
+        "verify": _verify,
+        "judge": _judge,
+        "refine_treaty": _refine_treaty,
+        "finalize_report": _finalize_report,
+    }, checkpointer)
+
+
+def build_async_graph(checkpointer: BaseCheckpointSaver | None = None) -> CompiledStateGraph:
+    """Compile the debate graph with async nodes for ``astream``/``ainvoke``.
+
+    Every node runs on the caller's event loop and model calls use
+    ``ainvoke``, so many debates can share one loop. Use an async checkpointer
+    (see ``open_async_checkpointer``) when persisting.
+    """
+    return _compile_graph({
+        "ensure_profiles": _aensure_profiles,
+        "opening_statements": _aopening_statements,
+        "negotiate_round": _anegotiate_round,
+        "compile_treaty": _acompile_treaty,
+        "verify": _averify,
+        "judge": _ajudge,
+        "refine_treaty": _arefine_treaty,
+        "finalize_report": _afinalize_report,
+    }, checkpointer)
 
 
 def _ensure_profiles(state: DebateState) -> dict:
     scenario = state["scenario"]
-    profiles = {}
     router_plan = build_router_plan(scenario)
     
     logger.info(f"Loading/generating profiles for {len(scenario.countries)} countries")
     _log_state("ensure_profiles.start", state)
     scenario_key = make_scenario_key(scenario.name, scenario.description)
     
-    for country in scenario.countries:
-        logger.info(f"  - {country}...")
-        profiles[country] = ensure_profile(
-            country,
-            scenario.description,
-            scenario_name=scenario.name,
-            scenario_key=scenario_key,
-            router_plan=router_plan,
-        )
+    # Countries research in parallel; their topic searches share the global
+    # research scheduler, so this pool only bounds concurrent syntheses.
+    countries = scenario.countries
+    workers = max(1, min(get_settings().research_concurrency, len(countries)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="madd-profile") as pool:
+        futures = {
+            _submit_in_context(
+                pool,
+                _ensure_country_profile,
+                country,
+                scenario.description,
+                scenario_name=scenario.name,
+                scenario_key=scenario_key,
+                router_plan=router_plan,
+            ): country
+            for country in countries
+        }
+        ready = {}
+        for future in as_completed(futures):
+            country = futures[future]
+            ready[country] = future.result()
+            logger.info(f"  - {country} ready")
+    return _profiles_update(state, ready, router_plan)
+
+
+async def _aensure_profiles(state: DebateState) -> dict:
+    scenario = state["scenario"]
+    router_plan = build_router_plan(scenario)
+    
+    logger.info(f"Loading/generating profiles for {len(scenario.countries)} countries")
+    _log_state("ensure_profiles.start", state)
+    scenario_key = make_scenario_key(scenario.name, scenario.description)
+    
+    countries = scenario.countries
+    limit = asyncio.Semaphore(max(1, min(get_settings().research_concurrency, len(countries))))
+    ready = {}
+    
+    async def _one(country: str) -> None:
+        async with limit:
+            with metrics_scope(country=country):
+                ready[country] = await aensure_profile(
+                    country,
+                    scenario.description,
+                    scenario_name=scenario.name,
+                    scenario_key=scenario_key,
+                    router_plan=router_plan,
+                )
+        logger.info(f"  - {country} ready")
     
-    updated = dict(state)
+    await asyncio.gather(*(_one(country) for country in countries))
+    return _profiles_update(state, ready, router_plan)
+
+
+def _profiles_update(state: DebateState, ready: dict, router_plan) -> dict:
+    profiles = {country: ready[country] for country in state["scenario"].countries}
+    updated = cast(DebateState, dict(state))
     updated["profiles"] = profiles
     updated["router_plan"] = router_plan
     _log_state("ensure_profiles.end", updated)
     return {"profiles": profiles, "router_plan": router_plan}
 
 
+def _ensure_country_profile(country: str, *args, **kwargs):
+    with metrics_scope(country=country):
+        return ensure_profile(country, *args, **kwargs)
+
+
 def _opening_statements(state: DebateState) -> dict:
+    temp_state = _start_opening(state)
+    with metrics_scope(round=temp_state["round"]):
+        new_messages = _generate_round_turns(temp_state, state["scenario"].countries)
+    return _finish_opening(state, temp_state, new_messages)
+
+
+async def _aopening_statements(state: DebateState) -> dict:
+    temp_state = _start_opening(state)
+    with metrics_scope(round=temp_state["round"]):
+        new_messages = await _agenerate_round_turns(temp_state, state["scenario"].countries)
+    return _finish_opening(state, temp_state, new_messages)
+
+
+def _start_opening(state: DebateState) -> DebateState:
     scenario = state["scenario"]
     logger.info("Round 1: Opening statements")
     _log_state("opening_statements.start", state)
     
-    new_messages = []
-    temp_state = dict(state)
+    temp_state = cast(DebateState, dict(state))
     temp_state["round"] = 1
     temp_state["treaty"] = TreatyDraft(title=f"Treaty on {scenario.name}")
-    
-    for country in scenario.countries:
-        logger.info(f"  - {country} speaking...")
-        temp_state["messages"] = list(state.get("messages", [])) + new_messages
-        msg = generate_turn(temp_state, country)
-        msg.round_number = 1
-        new_messages.append(msg)
-    
-    updated = dict(state)
+    return temp_state
+
+
+def _finish_opening(state: DebateState, temp_state: DebateState, new_messages: list[DebateMessage]) -> dict:
+    updated = cast(DebateState, dict(state))
     updated["messages"] = list(state.get("messages", [])) + new_messages
     updated["round"] = 1
     updated["treaty"] = temp_state["treaty"]
@@ -119,29 +251,115 @@ def _opening_statements(state: DebateState) -> dict:
 
 
 def _negotiate_round(state: DebateState) -> dict:
-    scenario = state["scenario"]
+    temp_state = _start_negotiation(state)
+    with metrics_scope(round=temp_state["round"]):
+        new_messages = _generate_round_turns(temp_state, state["scenario"].countries)
+    return _finish_negotiation(state, temp_state, new_messages)
+
+
+async def _anegotiate_round(state: DebateState) -> dict:
+    temp_state = _start_negotiation(state)
+    with metrics_scope(round=temp_state["round"]):
+        new_messages = await _agenerate_round_turns(temp_state, state["scenario"].countries)
+    return _finish_negotiation(state, temp_state, new_messages)
+
+
+def _start_negotiation(state: DebateState) -> DebateState:
     current_round = state["round"] + 1
     logger.info(f"Round {current_round}: Negotiation")
     _log_state("negotiate_round.start", state)
     
-    new_messages = []
-    temp_state = dict(state)
+    temp_state = cast(DebateState, dict(state))
     temp_state["round"] = current_round
-    
-    for country in scenario.countries:
-        logger.info(f"  - {country} speaking...")
-        temp_state["messages"] = list(state.get("messages", [])) + new_messages
-        msg = generate_turn(temp_state, country)
-        msg.round_number = current_round
-        new_messages.append(msg)
-    
-    updated = dict(state)
+    return temp_state
+
+
+def _finish_negotiation(state: DebateState, temp_state: DebateState, new_messages: list[DebateMessage]) -> dict:
+    current_round = temp_state["round"]
+    updated = cast(DebateState, dict(state))
     updated["messages"] = list(state.get("messages", [])) + new_messages
     updated["round"] = current_round
     _log_state("negotiate_round.end", updated)
     return {"messages": new_messages, "round": current_round}
 
 
+def _generate_round_turns(state: DebateState, countries: list[str]) -> list[DebateMessage]:
+    """Generate one turn per country for ``state["round"]``.
+
+    Sequential mode lets each country see the turns spoken earlier in the same
+    round. Simultaneous mode (``MADD_SIMULTANEOUS_TURNS``) generates every turn
+    concurrently against the round-start snapshot; results keep the scenario's
+    country order regardless of completion order.
+    """
+    settings = get_settings()
+    current_round = state["round"]
+    prior_messages = list(state.get("messages", []))
+    new_messages: list[DebateMessage]
+
+    if settings.simultaneous_turns and len(countries) > 1:
+        snapshot = cast(DebateState, {**state, "messages": prior_messages})
+        workers = min(settings.turn_concurrency, len(countries))
+        logger.info(f"  - {len(countries)} countries speaking simultaneously (workers={workers})")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="madd-turn") as pool:
+            futures = [_submit_in_context(pool, _country_turn, snapshot, country) for country in countries]
+            new_messages = [future.result() for future in futures]
+        for msg in new_messages:
+            msg.round_number = current_round
+        return new_messages
+
+    new_messages = []
+    temp_state = cast(DebateState, dict(state))
+    for country in countries:
+        logger.info(f"  - {country} speaking...")
+        temp_state["messages"] = prior_messages + new_messages
+        msg = _country_turn(temp_state, country)
+        msg.round_number = current_round
+        new_messages.append(msg)
+    return new_messages
+
+
+async def _agenerate_round_turns(state: DebateState, countries: list[str]) -> list[DebateMessage]:
+    """Async ``_generate_round_turns``; simultaneous turns run as tasks on the loop."""
+    settings = get_settings()
+    current_round = state["round"]
+    prior_messages = list(state.get("messages", []))
+
+    if settings.simultaneous_turns and len(countries) > 1:
+        snapshot = cast(DebateState, {**state, "messages": prior_messages})
+        workers = min(settings.turn_concurrency, len(countries))
+        logger.info(f"  - {len(countries)} countries speaking simultaneously (workers={workers})")
+        limit = asyncio.Semaphore(workers)
+
+        async def _one(country: str) -> DebateMessage:
+            async with limit:
+                return await _acountry_turn(snapshot, country)
+
+        new_messages = list(await asyncio.gather(*(_one(country) for country in countries)))
+        for msg in new_messages:
+            msg.round_number = current_round
+        return new_messages
+
+    new_messages = []
+    temp_state = cast(DebateState, dict(state))
+    for country in countries:
+        logger.info(f"  - {country} speaking...")
+        temp_state["messages"] = prior_messages + new_messages
+        msg = await _acountry_turn(temp_state, country)
+        msg.round_number = current_round
+        new_messages.append(msg)
+    return new_messages
+
+
+def _country_turn(state: DebateState, country: str) -> DebateMessage:
+    with metrics_scope(round=state["round"], country=country):
+        return cast(DebateMessage, generate_turn(state, country))
+
+
+async def _acountry_turn(state: DebateState, country: str) -> DebateMessage:
+    with metrics_scope(round=state["round"], country=country):
+        return cast(DebateMessage, await agenerate_turn(state, country))
+
+
 def _compile_treaty(state: DebateState) -> dict:
     logger.info("Compiling treaty clauses")
     _log_state("compile_treaty.start", state)
@@ -153,12 +371,13 @@ def _compile_treaty(state: DebateState) -> dict:
     clause_counter = state.get("clause_counter", len(treaty.clauses))
     
     round_messages = [m for m in messages if m.round_number == current_round]
+    ledger = ClauseLedger(treaty.clauses)
+    institution_name = _get_institution_name(state)
     
     for msg in round_messages:
         for proposed in msg.proposed_clauses:
             clause_counter += 1
             clause_id = f"C{clause_counter}"
-            institution_name = _get_institution_name(state)
             clause_text = _normalize_institution_name(proposed.text, institution_name)
             new_clause = Clause(
                 id=clause_id,
@@ -170,72 +389,53 @@ def _compile_treaty(state: DebateState) -> dict:
                 objectors=[],
                 supersedes=proposed.supersedes,
             )
-            treaty.clauses.append(new_clause)
-            if proposed.supersedes:
-                for existing in treaty.clauses:
-                    if existing.id == proposed.supersedes:
-                        existing.amendments.append(f"{clause_id} supersedes {existing.id}")
+            ledger.add(new_clause)
+            existing = ledger.get(proposed.supersedes)
+            if existing is not None:
+                ledger.add_amendment(existing, f"{clause_id} supersedes {existing.id}")
     
-    votable_clauses = get_votable_clauses(treaty, current_round)
+    votable_clauses = ledger.votable(current_round)
     
     for clause in votable_clauses:
         for msg in round_messages:
             if msg.country == clause.proposed_by:
                 continue
-            
             vote = msg.clause_votes.get(clause.id, "")
-            
-            if vote == "support":
-                if msg.country not in clause.supporters:
-                    clause.supporters.append(msg.country)
-                if msg.country in clause.objectors:
-                    clause.objectors.remove(msg.country)
-            elif vote == "oppose":
-                if msg.country not in clause.objectors:
-                    clause.objectors.append(msg.country)
-                if msg.country in clause.supporters:
-                    clause.supporters.remove(msg.country)
-            elif vote == "amend":
-                if msg.country not in clause.objectors:
-                    clause.objectors.append(msg.country)
-                amendment_text = f"[Round {current_round}] {msg.country} proposed amendment"
-                if amendment_text not in clause.amendments:
-                    clause.amendments.append(amendment_text)
-            elif vote == "abstain":
-                if msg.country in clause.supporters:
-                    clause.supporters.remove(msg.country)
-                if msg.country in clause.objectors:
-                    clause.objectors.remove(msg.country)
+            ledger.apply_vote(clause, msg.country, vote, current_round)
     
+    total = len(countries)
     for clause in votable_clauses:
-        support_count = len(clause.supporters)
-        oppose_count = len(clause.objectors)
-        total = len(countries)
+        support_count = len(ledger.supporters(clause))
+        oppose_count = len(ledger.objectors(clause))
         
         if support_count > total / 2:
-            clause.status = ClauseStatus.ACCEPTED
-            clause.resolved_round = current_round
+            ledger.set_status(clause, ClauseStatus.ACCEPTED, current_round)
             logger.info(f"  Clause {clause.id} ACCEPTED ({support_count}/{total})")
         elif oppose_count > total / 2:
-            if clause.amendments:
-                clause.status = ClauseStatus.PROPOSED
-                clause.resolved_round = None
+            if ledger.has_amendments(clause):
+                ledger.set_status(clause, ClauseStatus.PROPOSED, None)
                 logger.info(f"  Clause {clause.id} remains PROPOSED (amendments pending)")
             else:
-                clause.status = ClauseStatus.REJECTED
-                clause.resolved_round = current_round
+                ledger.set_status(clause, ClauseStatus.REJECTED, current_round)
                 logger.info(f"  Clause {clause.id} {clause.status.value.upper()} ({oppose_count}/{total})")
     
+    ledger.sync()
+    round_summary = summarize_round(current_round, round_messages, treaty.clauses)
+    
     updated_treaty = TreatyDraft(
         title=treaty.title or f"Treaty on {state['scenario'].name}",
         preamble=treaty.preamble,
         clauses=treaty.clauses,
     )
-    updated = dict(state)
+    updated = cast(DebateState, dict(state))
     updated["treaty"] = updated_treaty
     updated["clause_counter"] = clause_counter
     _log_state("compile_treaty.end", updated)
-    return {"treaty": updated_treaty, "clause_counter": clause_counter}
+    return {
+        "treaty": updated_treaty,
+        "clause_counter": clause_counter,
+        "round_summaries": {current_round: round_summary},
+    }
 
 
 def _normalize_institution_name(text: str, institution_name: str | None) -> str:
@@ -258,50 +458,127 @@ def _verify(state: DebateState) -> dict:
     _log_state("verify.start", state)
     try:
         findings = verify_claims(state)
-        updated = dict(state)
-        updated["audit"] = state.get("audit", []) + findings
-        _log_state("verify.end", updated)
-        return {"audit": findings}
+    except LLMCacheMiss:
+        raise
+    except Exception as e:
+        findings = _verifier_crashed(state, e)
+    return _verify_update(state, findings)
+
+
+async def _averify(state: DebateState) -> dict:
+    logger.info("Verifying claims")
+    _log_state("verify.start", state)
+    try:
+        findings = await averify_claims(state)
+    except LLMCacheMiss:
+        raise
     except Exception as e:
-        logger.warning(f"Verification error: {e}")
-        findings = [AuditFinding(
-            severity=AuditSeverity.ERROR,
-            category="verifier_failed",
-            description=f"Verifier crashed: {e}",
-            round_number=state.get("round", 0),
-            evidence=[],
-        )]
-        updated = dict(state)
-        updated["audit"] = state.get("audit", []) + findings
-        _log_state("verify.end", updated)
-        return {"audit": findings}
+        findings = _verifier_crashed(state, e)
+    return _verify_update(state, findings)
+
+
+def _verifier_crashed(state: DebateState, e: Exception) -> list[AuditFinding]:
+    logger.warning(f"Verification error: {e}")
+    return [AuditFinding(
+        severity=AuditSeverity.ERROR,
+        category="verifier_failed",
+        description=f"Verifier crashed: {e}",
+        round_number=state.get("round", 0),
+        evidence=[],
+    )]
+
+
+def _verify_update(state: DebateState, findings: list[AuditFinding]) -> dict:
+    updated = cast(DebateState, dict(state))
+    updated["audit"] = state.get("audit", []) + findings
+    _log_state("verify.end", updated)
+    return {"audit": findings}
 
 
 def _judge(state: DebateState) -> dict:
-    current_round = state["round"]
-    logger.info(f"Judging round {current_round}")
+    logger.info(f"Judging round {state['round']}")
     _log_state("judge.start", state)
     try:
         scorecard = evaluate_round(state)
-        updated = dict(state)
-        updated["scorecards"] = state.get("scorecards", []) + [scorecard]
-        _log_state("judge.end", updated)
-        return {"scorecards": [scorecard]}
+    except LLMCacheMiss:
+        raise
+    except Exception as e:
+        scorecard = _judge_failed(state, e)
+    return _judge_update(state, scorecard)
+
+
+async def _ajudge(state: DebateState) -> dict:
+    logger.info(f"Judging round {state['round']}")
+    _log_state("judge.start", state)
+    try:
+        scorecard = await aevaluate_round(state)
+    except LLMCacheMiss:
+        raise
     except Exception as e:
-        logger.warning(f"Judge error: {e}")
-        from madd.core.schemas import RoundScorecard
-        scorecard = RoundScorecard(round_number=current_round)
-        updated = dict(state)
-        updated["scorecards"] = state.get("scorecards", []) + [scorecard]
-        _log_state("judge.end", updated)
-        return {"scorecards": [scorecard]}
+        scorecard = _judge_failed(state, e)
+    return _judge_update(state, scorecard)
+
+
+def _judge_failed(state: DebateState, e: Exception) -> RoundScorecard:
+    logger.warning(f"Judge error: {e}")
+    return RoundScorecard(round_number=state["round"])
+
+
+def _judge_update(state: DebateState, scorecard: RoundScorecard) -> dict:
+    updated = cast(DebateState, dict(state))
+    updated["scorecards"] = state.get("scorecards", []) + [scorecard]
+    _log_state("judge.end", updated)
+    return {"scorecards": [scorecard]}
 
 
 def _refine_treaty(state: DebateState) -> dict:
     logger.info("Refining treaty into publication-ready draft")
     _log_state("refine_treaty.start", state)
-    treaty_text = refine_treaty(state)
-    updated = dict(state)
+    draft = _take_speculative_refine(state)
+    treaty_text = draft.result() if draft else None
+    if not treaty_text:
+        treaty_text = refine_treaty(state)
+    return _refine_update(state, treaty_text)
+
+
+async def _arefine_treaty(state: DebateState) -> dict:
+    logger.info("Refining treaty into publication-ready draft")
+    _log_state("refine_treaty.start", state)
+    draft = _take_speculative_refine(state)
+    treaty_text = await draft.aresult() if draft else None
+    if not treaty_text:
+        treaty_text = await arefine_treaty(state)
+    return _refine_update(state, treaty_text)
+
+
+def _should_prerefine(state: DebateState) -> bool:
+    return get_settings().speculative_refine and state["round"] >= state.get("max_rounds", 3)
+
+
+def _speculative_refine(state: DebateState) -> str:
+    with metrics_scope(node="refine_treaty"):
+        return cast(str, refine_treaty(state))
+
+
+async def _aspeculative_refine(state: DebateState) -> str:
+    with metrics_scope(node="refine_treaty"):
+        return cast(str, await arefine_treaty(state))
+
+
+def _take_speculative_refine(state: DebateState) -> Speculation | None:
+    draft = speculations.take(state.get("speculative_refine_id"))
+    if draft is None:
+        return None
+    if draft.key != refinement_key(state):
+        logger.info("Clause set changed since speculative refinement; discarding draft")
+        draft.cancel()
+        return None
+    logger.info("Reusing speculative treaty refinement")
+    return draft
+
+
+def _refine_update(state: DebateState, treaty_text: str) -> dict:
+    updated = cast(DebateState, dict(state))
     updated["treaty_text"] = treaty_text
     _log_state("refine_treaty.end", updated)
     return {"treaty_text": treaty_text}
@@ -316,6 +593,37 @@ def _finalize_report(state: DebateState) -> dict:
     return {}
 
 
+def _compile_treaty_node(state: DebateState) -> dict:
+    updates = _compile_treaty(state)
+    if _should_prerefine(state):
+        compiled = cast(DebateState, {**state, **updates})
+        updates["speculative_refine_id"] = speculations.submit(
+            refinement_key(compiled), _speculative_refine, compiled
+        )
+    return updates
+
+
+# Nodes without model calls; async wrappers keep them on the event loop
+# instead of LangGraph's thread executor.
+async def _acompile_treaty(state: DebateState) -> dict:
+    updates = _compile_treaty(state)
+    if _should_prerefine(state):
+        compiled = cast(DebateState, {**state, **updates})
+        updates["speculative_refine_id"] = speculations.create_task(
+            refinement_key(compiled), _aspeculative_refine(compiled)
+        )
+    return updates
+
+
+async def _afinalize_report(state: DebateState) -> dict:
+    return _finalize_report(state)
+
+
+def _review_round(state: DebateState) -> dict:
+    """Join point for the parallel verify and judge nodes."""
+    return {}
+
+
 def _should_continue(state: DebateState) -> str:
     current_round = state.get("round", 1)
     max_rounds = state.get("max_rounds", 3)
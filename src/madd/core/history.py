@@ -0,0 +1,176 @@
+"""Bounded debate history for country turn prompts.
+
+A turn prompt sees the most recent turns verbatim, one compact summary per
+earlier round (built once when the round is compiled and kept in state), and
+only the clauses that are votable or changed recently. Everything except the
+votable clauses is fitted into a token budget, so prompt size stays roughly
+flat as rounds accumulate instead of growing with rounds x countries.
+"""
+import re
+from dataclasses import dataclass
+
+from madd.core.schemas import Clause, ClauseStatus, DebateMessage, TreatyDraft
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+# Per-item caps so one long statement or clause cannot take the whole budget.
+_TURN_CHARS = 1200
+_CLAUSE_CHARS = 300
+_LEAD_CHARS = 160
+# Settled clauses are listed by ID only, and only the most recent ones.
+_SETTLED_IDS = 20
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for budgeting."""
+    return len(text) // 4 + 1
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 3].rstrip() + "..."
+
+
+def _lead(text: str) -> str:
+    first = _SENTENCE_END.split(" ".join(text.split()), maxsplit=1)[0]
+    return _clip(first, _LEAD_CHARS)
+
+
+def summarize_round(round_number: int, messages: list[DebateMessage], clauses: list[Clause]) -> str:
+    """One line per speaker plus the clause outcomes of ``round_number``."""
+    lines = [f"Round {round_number}:"]
+    for msg in messages:
+        if msg.round_number != round_number:
+            continue
+        line = f"- {msg.country}: {_lead(msg.public_statement)}"
+        proposed = [
+            c.id for c in clauses
+            if c.proposed_round == round_number and c.proposed_by == msg.country
+        ]
+        if proposed:
+            line += f" Proposed {', '.join(proposed)}."
+        if msg.red_lines:
+            line += f" Red lines: {'; '.join(_clip(r, 80) for r in msg.red_lines[:2])}."
+        lines.append(line)
+    outcomes = []
+    for status in (ClauseStatus.ACCEPTED, ClauseStatus.REJECTED):
+        ids = [c.id for c in clauses if c.resolved_round == round_number and c.status == status]
+        if ids:
+            outcomes.append(f"{status.value} {', '.join(ids)}")
+    if outcomes:
+        lines.append(f"Outcome: {'; '.join(outcomes)}.")
+    return "\n".join(lines)
+
+
+@dataclass
+class HistoryContext:
+    treaty_summary: str
+    history: str
+    tokens: int
+
+
+def _recently_changed(clause: Clause, current_round: int) -> bool:
+    since = current_round - 1
+    return clause.proposed_round >= since or (clause.resolved_round or 0) >= since
+
+
+def _fit(lines: list[str], budget: int) -> tuple[list[str], int]:
+    """Keep lines in order until ``budget`` tokens are used; return them and the cost."""
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return kept, used
+
+
+def _settled_line(ids: list[str], budget: int) -> str | None:
+    """List settled clause IDs within ``budget``: all of them, or a count and the latest."""
+    shown = ids[-_SETTLED_IDS:]
+    while True:
+        if len(shown) == len(ids):
+            line = f"Accepted earlier (text omitted): {', '.join(shown)}"
+        elif shown:
+            line = f"Accepted earlier (text omitted): {len(ids)} clauses, latest {', '.join(shown)}"
+        else:
+            line = f"Accepted earlier (text omitted): {len(ids)} clauses"
+        if estimate_tokens(line) <= budget:
+            return line
+        if not shown:
+            return None
+        shown = shown[1:]
+
+
+def build_history_context(
+    messages: list[DebateMessage],
+    round_summaries: dict[int, str],
+    treaty: TreatyDraft,
+    votable_ids: set[str],
+    current_round: int,
+    *,
+    window: int,
+    token_budget: int,
+) -> HistoryContext:
+    """Build the treaty and history prompt sections within ``token_budget``.
+
+    Up to half the budget goes to clauses changed since the previous round
+    (votable clauses are listed separately and never trimmed), then to the
+    IDs of clauses accepted earlier; the rest goes
+    to the last ``window`` turns, newest first, then to summaries of earlier
+    rounds, newest first. Rounds without a cached summary are summarized on
+    the fly.
+    """
+    clause_budget = token_budget // 2
+    changed = [
+        f"- {c.id} [{c.status.value}] {_clip(c.text, _CLAUSE_CHARS)} (by {c.proposed_by})"
+        for c in reversed(treaty.clauses)
+        if c.id not in votable_ids and _recently_changed(c, current_round)
+    ]
+    clause_lines, clause_tokens = _fit(changed, clause_budget)
+    clause_lines.reverse()
+    settled = [
+        c.id for c in treaty.clauses
+        if c.status == ClauseStatus.ACCEPTED and not _recently_changed(c, current_round)
+    ]
+    omitted_clauses = len(changed) - len(clause_lines)
+    settled_line = _settled_line(settled, clause_budget - clause_tokens) if settled else None
+    if settled_line:
+        clause_lines.insert(0, settled_line)
+        clause_tokens += estimate_tokens(settled_line)
+    if omitted_clauses:
+        clause_lines.append(f"({omitted_clauses} older clause changes omitted)")
+
+    remaining = max(0, token_budget - clause_tokens)
+    recent = messages[-window:] if window > 0 else []
+    turn_lines = [
+        f"Round {m.round_number} - {m.country}: {_clip(m.public_statement, _TURN_CHARS)}"
+        for m in reversed(recent)
+    ]
+    turns, turn_tokens = _fit(turn_lines, remaining)
+    turns.reverse()
+    remaining -= turn_tokens
+
+    older = messages[: len(messages) - len(turns)]
+    older_rounds = sorted({m.round_number for m in older}, reverse=True)
+    summary_lines = [
+        round_summaries.get(r) or summarize_round(r, older, treaty.clauses)
+        for r in older_rounds
+    ]
+    summaries, summary_tokens = _fit(summary_lines, remaining)
+    summaries.reverse()
+    dropped = older_rounds[len(summaries):]
+    if dropped:
+        summaries.insert(0, f"(Rounds {min(dropped)}-{max(dropped)} omitted)")
+
+    history_parts = []
+    if summaries:
+        history_parts.append("Earlier rounds (summarized):\n" + "\n".join(summaries))
+    if turns:
+        history_parts.append("Most recent turns:\n" + "\n".join(turns))
+    return HistoryContext(
+        treaty_summary="\n".join(clause_lines),
+        history="\n\n".join(history_parts),
+        tokens=clause_tokens + turn_tokens + summary_tokens,
+    )
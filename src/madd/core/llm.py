@@ -0,0 +1,390 @@
+"""Process-wide OpenAI client registry and agent flow drivers.
+
+Agents look up clients here instead of constructing one per call, so HTTP
+connection pools and structured-output wrappers live for the whole process.
+
+Agent logic is written once as a generator ("flow") that yields ``LLMCall``
+requests and receives each result at the ``yield`` (a failed call is thrown
+back in there, so ordinary ``try/except`` fallbacks work). ``run_llm_flow``
+drives a flow with blocking ``invoke`` and ``arun_llm_flow`` with ``ainvoke``.
+"""
+import asyncio
+import threading
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
+from functools import cache, lru_cache
+from typing import Any, Protocol, cast
+
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from langchain_core.messages.ai import UsageMetadata, add_usage
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_openai import ChatOpenAI
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+from pydantic import BaseModel, SecretStr
+
+from madd.core.config import get_settings
+from madd.core.history import estimate_tokens
+from madd.core.metrics import (
+    MetricsCallbackHandler,
+    anote_attempt,
+    current_call,
+    metrics_scope,
+    note_attempt,
+    prompt_prefix,
+    record_call,
+)
+from madd.core.scheduler import OUTPUT_TOKEN_ESTIMATE, get_scheduler
+from madd.core.streaming import StatementStreamHandler, listening
+from madd.stores.response_cache import LLMCacheMiss
+
+_usage = UsageMetadataCallbackHandler()
+_metrics = MetricsCallbackHandler()
+_statements = StatementStreamHandler()
+_extra_usage: dict[str, UsageMetadata] = {}
+_extra_usage_lock = threading.Lock()
+
+
+class SlotSemaphore(Protocol):
+    """What the request budget needs: a ``threading`` or ``Manager`` semaphore."""
+
+    def acquire(self) -> Any: ...
+
+    def release(self) -> None: ...
+
+    def __enter__(self) -> Any: ...
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> Any: ...
+
+
+_llm_slots: SlotSemaphore | None = None
+
+
+def set_llm_slots(slots: SlotSemaphore | None) -> None:
+    """Bound concurrent model requests with a shared semaphore.
+
+    ``slots`` may be a ``multiprocessing.Manager`` semaphore so several worker
+    processes share one budget. Pass ``None`` to remove the bound.
+    """
+    global _llm_slots
+    _llm_slots = slots
+    clear_clients()
+
+
+def llm_slot() -> SlotSemaphore | AbstractContextManager[None]:
+    """Context manager holding one slot of the shared request budget."""
+    return _llm_slots if _llm_slots is not None else nullcontext()
+
+
+def get_token_usage() -> dict[str, dict]:
+    """Token usage per model for every chat call made by this process."""
+    totals = dict(_usage.usage_metadata)
+    with _extra_usage_lock:
+        for model, usage in _extra_usage.items():
+            totals[model] = add_usage(totals.get(model), usage)
+    return {model: dict(usage) for model, usage in totals.items()}
+
+
+def record_token_usage(model: str, input_tokens: int, output_tokens: int) -> None:
+    """Add usage from calls that bypass the chat models (e.g. web search)."""
+    usage = UsageMetadata(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        total_tokens=input_tokens + output_tokens,
+    )
+    with _extra_usage_lock:
+        _extra_usage[model] = add_usage(_extra_usage.get(model), usage)
+
+
+class SlotLimitedModel(Runnable):
+    """Runs ``inner`` while holding a slot from ``llm_slot()``."""
+
+    def __init__(self, inner: Runnable):
+        self.inner = inner
+
+    def invoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        with llm_slot():
+            return self.inner.invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        slots = _llm_slots
+        if slots is None:
+            return await self.inner.ainvoke(input, config, **kwargs)
+        # Shared slots may be a multiprocessing proxy, so wait off the event loop.
+        await asyncio.to_thread(slots.acquire)
+        try:
+            return await self.inner.ainvoke(input, config, **kwargs)
+        finally:
+            slots.release()
+
+
+def _estimate_request_tokens(messages: Any) -> int:
+    if isinstance(messages, list):
+        text = "".join(str(getattr(m, "content", m)) for m in messages)
+    else:
+        text = str(messages)
+    return estimate_tokens(text) + OUTPUT_TOKEN_ESTIMATE
+
+
+def _settle(reservation: Any) -> None:
+    record = current_call()
+    if record is not None:
+        reservation.settle(record.total_tokens)
+
+
+class ScheduledModel(Runnable):
+    """Runs ``inner`` once the rate-limit scheduler admits it in ``lane``."""
+
+    def __init__(self, inner: Runnable, lane: str, model: str):
+        self.inner = inner
+        self.lane = lane
+        self.model = model
+
+    def invoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        if config is not None:
+            kwargs["config"] = config
+        tokens = _estimate_request_tokens(input)
+        with get_scheduler().reserve(self.model, self.lane, tokens) as reservation:
+            try:
+                return self.inner.invoke(input, **kwargs)
+            finally:
+                _settle(reservation)
+
+    async def ainvoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        if config is not None:
+            kwargs["config"] = config
+        tokens = _estimate_request_tokens(input)
+        async with get_scheduler().areserve(self.model, self.lane, tokens) as reservation:
+            try:
+                return await self.inner.ainvoke(input, **kwargs)
+            finally:
+                _settle(reservation)
+
+
+class ListenerStreamedModel(Runnable):
+    """Runs ``plain``, or the streaming model from ``make_streamed`` while a
+    statement listener is installed (see ``madd.core.streaming``).
+
+    Streaming and re-parsing partial arguments only pays off when someone is
+    watching, so the streaming model is only built once it is first needed.
+    """
+
+    def __init__(self, plain: Runnable, make_streamed: Callable[[], Runnable]):
+        self.plain = plain
+        self._make_streamed = make_streamed
+        self._streamed: Runnable | None = None
+
+    def _inner(self) -> Runnable:
+        if not listening():
+            return self.plain
+        if self._streamed is None:
+            self._streamed = self._make_streamed()
+        return self._streamed
+
+    def invoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        if config is not None:
+            kwargs["config"] = config
+        return self._inner().invoke(input, **kwargs)
+
+    async def ainvoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        if config is not None:
+            kwargs["config"] = config
+        return await self._inner().ainvoke(input, **kwargs)
+
+
+class InstrumentedModel(Runnable):
+    """Records latency, tokens and retries of each ``inner`` call in the run metrics."""
+
+    def __init__(self, inner: Runnable, model: str):
+        self.inner = inner
+        self.model = model
+
+    def invoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        if config is not None:
+            kwargs["config"] = config
+        with record_call("llm", self.model):
+            return self.inner.invoke(input, **kwargs)
+
+    async def ainvoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        if config is not None:
+            kwargs["config"] = config
+        with record_call("llm", self.model):
+            return await self.inner.ainvoke(input, **kwargs)
+
+
+@dataclass
+class LLMCall:
+    """One structured model request yielded by an agent flow.
+
+    The first ``prefix`` messages are byte-identical across calls of the same
+    kind (e.g. a country's turns in every round), so the provider can serve
+    them from its prompt cache.
+    """
+
+    llm: Runnable
+    messages: list
+    call: str
+    prefix: int = 0
+
+    @property
+    def prefix_tokens(self) -> int:
+        return sum(estimate_tokens(str(m.content)) for m in self.messages[: self.prefix])
+
+
+type LLMFlow[T] = Generator[LLMCall, Any, T]
+
+
+def run_llm_flow[T](flow: LLMFlow[T]) -> T:
+    """Run an agent flow to completion with blocking ``invoke`` calls."""
+    send, value = flow.send, None
+    while True:
+        try:
+            request = send(value)
+        except StopIteration as stop:
+            # The flow's return value; ``StopIteration`` carries it untyped.
+            return cast(T, stop.value)
+        try:
+            with metrics_scope(call=request.call), prompt_prefix(request.prefix_tokens):
+                send, value = flow.send, request.llm.invoke(request.messages)
+        except LLMCacheMiss:
+            raise
+        except Exception as err:
+            send, value = flow.throw, err
+
+
+async def arun_llm_flow[T](flow: LLMFlow[T]) -> T:
+    """Run an agent flow to completion with ``ainvoke`` on the current event loop."""
+    send, value = flow.send, None
+    while True:
+        try:
+            request = send(value)
+        except StopIteration as stop:
+            # The flow's return value; ``StopIteration`` carries it untyped.
+            return cast(T, stop.value)
+        try:
+            with metrics_scope(call=request.call), prompt_prefix(request.prefix_tokens):
+                send, value = flow.send, await request.llm.ainvoke(request.messages)
+        except LLMCacheMiss:
+            raise
+        except Exception as err:
+            send, value = flow.throw, err
+
+
+def _note_rate_limited(response: Any) -> None:
+    """Pause the active call's model in the scheduler when the provider returns 429."""
+    record = current_call()
+    if response.status_code != 429 or record is None:
+        return
+    try:
+        seconds = float(response.headers.get("retry-after", 1.0))
+    except ValueError:
+        seconds = 1.0
+    get_scheduler().pause(record.model, seconds)
+
+
+async def _anote_rate_limited(response: Any) -> None:
+    _note_rate_limited(response)
+
+
+@lru_cache
+def get_http_client() -> DefaultHttpxClient:
+    """Shared HTTP client; its hooks count attempts (retries) and report 429s."""
+    return DefaultHttpxClient(event_hooks={
+        "request": [note_attempt],
+        "response": [_note_rate_limited],
+    })
+
+
+@lru_cache
+def get_async_http_client() -> DefaultAsyncHttpxClient:
+    """Async counterpart of ``get_http_client`` used by ``ainvoke``."""
+    return DefaultAsyncHttpxClient(event_hooks={
+        "request": [anote_attempt],
+        "response": [_anote_rate_limited],
+    })
+
+
+@cache
+def get_chat_model(role: str, model: str, temperature: float, streaming: bool = False) -> ChatOpenAI:
+    """Return the shared chat model for ``(role, model, temperature)``.
+
+    A ``streaming`` model still returns the aggregated response; its chunks
+    feed the live statement stream, see ``madd.core.streaming``.
+    """
+    settings = get_settings()
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=SecretStr(settings.openai_api_key),
+        max_retries=settings.max_retries,
+        streaming=streaming,
+        stream_usage=streaming,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        callbacks=[_usage, _metrics, _statements],
+    )
+
+
+@cache
+def get_structured_model(
+    role: str,
+    model: str,
+    temperature: float,
+    schema: type[BaseModel],
+) -> Runnable:
+    """Return the shared ``with_structured_output`` runnable for ``schema``.
+
+    Calls are admitted by the rate-limit scheduler in the ``role`` lane.
+    Turn calls stream only while a statement listener is installed.
+    When ``MADD_LLM_CACHE`` is enabled the runnable is wrapped so responses
+    are served from and recorded to the response cache. Every invocation,
+    cached or not, is recorded in the run metrics.
+    """
+    from madd.stores.response_cache import CachedStructuredModel, get_response_cache
+
+    llm = get_chat_model(role, model, temperature)
+    structured = llm.with_structured_output(schema, method="function_calling")
+    if role == "turn" and get_settings().stream_turns:
+        structured = ListenerStreamedModel(
+            structured,
+            lambda: get_chat_model(role, model, temperature, streaming=True).with_structured_output(
+                schema, method="function_calling"
+            ),
+        )
+    if _llm_slots is not None:
+        structured = SlotLimitedModel(structured)
+    structured = ScheduledModel(structured, role, model)
+    mode = get_settings().llm_cache_mode
+    if mode != "off":
+        structured = CachedStructuredModel(
+            structured,
+            get_response_cache(),
+            role,
+            model,
+            temperature,
+            schema,
+            replay_only=mode == "replay",
+        )
+    return InstrumentedModel(structured, model)
+
+
+@lru_cache
+def get_openai_client() -> OpenAI:
+    settings = get_settings()
+    return OpenAI(
+        api_key=settings.openai_api_key,
+        http_client=get_http_client(),
+    )
+
+
+def clear_clients() -> None:
+    """Drop every cached client (e.g. after settings change)."""
+    from madd.stores.response_cache import get_response_cache
+
+    get_structured_model.cache_clear()
+    get_chat_model.cache_clear()
+    get_openai_client.cache_clear()
+    get_http_client.cache_clear()
+    get_async_http_client.cache_clear()
+    get_response_cache.cache_clear()
+    get_scheduler.cache_clear()
@@ -0,0 +1,424 @@
+"""Token, latency, retry and cost metrics for every model and search call.
+
+Calls are attributed to the labels active in the calling context: the graph
+node and round (set per node), the speaking country, and the agent function
+(``track``). Labels live in context variables, so work handed to a thread pool
+only keeps them when submitted through ``contextvars.copy_context().run``.
+
+Named events (e.g. how often a turn needed repair) are counted with
+``count_event``.
+
+Calls made inside ``prompt_prefix(tokens)`` record how much of their prompt is
+a byte-stable prefix eligible for provider-side prompt caching, next to the
+cached input tokens the provider actually reports.
+
+Nothing is recorded unless a recorder is installed with ``collect_metrics()``.
+"""
+import functools
+import inspect
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, cast
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+# USD per million (input, output) tokens, matched on the longest model prefix.
+# Estimates for spend attribution only; unknown models report no cost.
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "gpt-5-nano": (0.05, 0.40),
+    "gpt-5-mini": (0.25, 2.00),
+    "gpt-5": (1.25, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+# Per-request fee of the hosted web search tool, on top of tokens.
+WEB_SEARCH_CALL_USD = 0.01
+
+LABELS = ("node", "round", "country", "call")
+
+_labels: ContextVar[dict[str, Any] | None] = ContextVar("madd_metric_labels", default=None)
+_active_call: ContextVar["CallRecord | None"] = ContextVar("madd_active_call", default=None)
+_recorder: ContextVar["MetricsRecorder | None"] = ContextVar("madd_metrics_recorder", default=None)
+_prefix_tokens: ContextVar[int] = ContextVar("madd_prompt_prefix_tokens", default=0)
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float | None:
+    matches = [prefix for prefix in MODEL_PRICES if model.startswith(prefix)]
+    if not matches:
+        return None
+    input_price, output_price = MODEL_PRICES[max(matches, key=len)]
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+@dataclass
+class CallRecord:
+    kind: str
+    model: str
+    node: str | None = None
+    round: int | None = None
+    country: str | None = None
+    call: str | None = None
+    seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    prefix_tokens: int = 0
+    cached_input_tokens: int = 0
+    attempts: int = 0
+    cached: bool = False
+    queue_seconds: float = 0.0
+    error: str | None = None
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    @property
+    def retries(self) -> int:
+        return max(0, self.attempts - 1)
+
+    @property
+    def cost_usd(self) -> float | None:
+        cost = estimate_cost(self.model, self.input_tokens, self.output_tokens)
+        if self.kind == "search" and not self.cached and self.attempts:
+            cost = (cost or 0.0) + WEB_SEARCH_CALL_USD
+        return cost
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data.update(total_tokens=self.total_tokens, retries=self.retries, cost_usd=self.cost_usd)
+        data["seconds"] = round(self.seconds, 3)
+        data["queue_seconds"] = round(self.queue_seconds, 3)
+        return data
+
+
+@dataclass
+class NodeRecord:
+    node: str
+    round: int | None
+    seconds: float
+    error: str | None = None
+
+
+@dataclass
+class _Totals:
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    cached: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    prefix_tokens: int = 0
+    cached_input_tokens: int = 0
+    seconds: float = 0.0
+    queue_seconds: float = 0.0
+    cost_usd: float = 0.0
+    unpriced_calls: int = 0
+    by_kind: dict[str, int] = field(default_factory=dict)
+
+    def add(self, record: CallRecord) -> None:
+        self.calls += 1
+        self.errors += record.error is not None
+        self.retries += record.retries
+        self.cached += record.cached
+        self.input_tokens += record.input_tokens
+        self.output_tokens += record.output_tokens
+        self.total_tokens += record.total_tokens
+        self.prefix_tokens += record.prefix_tokens
+        self.cached_input_tokens += record.cached_input_tokens
+        self.seconds += record.seconds
+        self.queue_seconds += record.queue_seconds
+        cost = record.cost_usd
+        if cost is None:
+            self.unpriced_calls += 1
+        else:
+            self.cost_usd += cost
+        self.by_kind[record.kind] = self.by_kind.get(record.kind, 0) + 1
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["seconds"] = round(self.seconds, 3)
+        data["queue_seconds"] = round(self.queue_seconds, 3)
+        data["cost_usd"] = round(self.cost_usd, 6)
+        return data
+
+
+class MetricsRecorder:
+    """Thread-safe collection of call and node records for one run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: list[CallRecord] = []
+        self.nodes: list[NodeRecord] = []
+        self.events: dict[str, int] = {}
+        self.queues: dict[str, dict] = {}
+        self.artifacts: dict[str, dict] = {}
+
+    def add_call(self, record: CallRecord) -> None:
+        with self._lock:
+            self.calls.append(record)
+
+    def add_node(self, record: NodeRecord) -> None:
+        with self._lock:
+            self.nodes.append(record)
+
+    def add_event(self, name: str, count: int = 1) -> None:
+        with self._lock:
+            self.events[name] = self.events.get(name, 0) + count
+
+    def add_queue_wait(self, lane: str, depth: int, seconds: float) -> None:
+        with self._lock:
+            stats = self.queues.setdefault(lane, {"waits": 0, "max_depth": 0, "seconds": 0.0})
+            stats["waits"] += 1
+            stats["max_depth"] = max(stats["max_depth"], depth)
+            stats["seconds"] = round(stats["seconds"] + seconds, 3)
+
+    def add_artifact(self, name: str, seconds: float, size: int) -> None:
+        with self._lock:
+            self.artifacts[name] = {"seconds": round(seconds, 4), "bytes": size}
+
+    def totals(self) -> dict:
+        totals = _Totals()
+        with self._lock:
+            for record in self.calls:
+                totals.add(record)
+        return totals.to_dict()
+
+    def aggregate(self, label: str) -> dict[str, dict]:
+        """Totals grouped by one of ``LABELS`` (or ``"model"``/``"kind"``)."""
+        groups: dict[str, _Totals] = {}
+        with self._lock:
+            for record in self.calls:
+                key = str(getattr(record, label))
+                groups.setdefault(key, _Totals()).add(record)
+        return {key: totals.to_dict() for key, totals in groups.items()}
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            calls = [record.to_dict() for record in self.calls]
+            nodes = [asdict(record) for record in self.nodes]
+            events = dict(sorted(self.events.items()))
+            queues = {lane: dict(stats) for lane, stats in sorted(self.queues.items())}
+            artifacts = {name: dict(stats) for name, stats in self.artifacts.items()}
+        return {
+            "totals": self.totals(),
+            "by_node": self.aggregate("node"),
+            "by_round": self.aggregate("round"),
+            "by_country": self.aggregate("country"),
+            "by_call": self.aggregate("call"),
+            "by_model": self.aggregate("model"),
+            "events": events,
+            "queues": queues,
+            "artifacts": artifacts,
+            "nodes": nodes,
+            "calls": calls,
+        }
+
+
+@contextmanager
+def collect_metrics() -> Iterator[MetricsRecorder]:
+    """Install a fresh recorder for the calls made inside the block."""
+    recorder = MetricsRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+def current_recorder() -> MetricsRecorder | None:
+    return _recorder.get()
+
+
+def current_labels() -> dict[str, Any]:
+    """The metric labels (see ``LABELS``) active in this context."""
+    return dict(_labels.get() or {})
+
+
+def current_call() -> CallRecord | None:
+    """The call record being timed in this context, if any."""
+    return _active_call.get()
+
+
+@contextmanager
+def metrics_scope(**labels: Any) -> Iterator[None]:
+    """Attribute calls made inside the block to ``labels`` (see ``LABELS``)."""
+    unknown = set(labels) - set(LABELS)
+    if unknown:
+        raise ValueError(f"Unknown metric labels: {sorted(unknown)}")
+    token = _labels.set({**(_labels.get() or {}), **labels})
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+
+@contextmanager
+def prompt_prefix(tokens: int) -> Iterator[None]:
+    """Record ``tokens`` as the cache-eligible prompt prefix of calls made inside the block."""
+    token = _prefix_tokens.set(tokens)
+    try:
+        yield
+    finally:
+        _prefix_tokens.reset(token)
+
+
+def track[**P, R](call: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorator attributing every call made by the function to ``call``."""
+    def decorator(fn: Callable[P, R]) -> Callable[P, R]:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def awrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                with metrics_scope(call=call):
+                    return await fn(*args, **kwargs)
+            # ``R`` is the coroutine type here, which ``awrapper`` returns.
+            return cast(Callable[P, R], awrapper)
+
+        @functools.wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with metrics_scope(call=call):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def record_call(kind: str, model: str) -> Iterator[CallRecord]:
+    """Time one model or search call under the current labels."""
+    record = CallRecord(kind=kind, model=model, prefix_tokens=_prefix_tokens.get(), **(_labels.get() or {}))
+    token = _active_call.set(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException as err:
+        record.error = f"{type(err).__name__}: {err}"
+        raise
+    finally:
+        record.seconds = time.perf_counter() - start
+        _active_call.reset(token)
+        recorder = _recorder.get()
+        if recorder is not None:
+            recorder.add_call(record)
+
+
+def note_attempt(*_args: Any) -> None:
+    """Count one HTTP attempt against the active call (httpx request hook)."""
+    record = _active_call.get()
+    if record is not None:
+        record.attempts += 1
+
+
+async def anote_attempt(*_args: Any) -> None:
+    """Async httpx request hook variant of ``note_attempt``."""
+    note_attempt()
+
+
+def note_usage(input_tokens: int, output_tokens: int, cached_input_tokens: int = 0) -> None:
+    record = _active_call.get()
+    if record is not None:
+        record.input_tokens += input_tokens
+        record.output_tokens += output_tokens
+        record.cached_input_tokens += cached_input_tokens
+
+
+def mark_cached() -> None:
+    record = _active_call.get()
+    if record is not None:
+        record.cached = True
+
+
+def note_queue(lane: str, depth: int, seconds: float) -> None:
+    """Record that a call waited ``seconds`` in ``lane`` behind ``depth`` waiters."""
+    record = _active_call.get()
+    if record is not None:
+        record.queue_seconds += seconds
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.add_queue_wait(lane, depth, seconds)
+
+
+def count_event(name: str, count: int = 1) -> None:
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.add_event(name, count)
+
+
+def instrument_node[F: Callable[..., Any]](name: str, fn: F) -> F:
+    """Wrap a graph node so its calls carry ``node``/``round`` and it is timed.
+
+    Works for both plain and ``async`` node functions.
+    """
+    def _record(state: Mapping[str, Any], update: Any, start: float, error: str | None) -> None:
+        recorder = _recorder.get()
+        if recorder is not None:
+            # A node that advances the round is recorded under the new one.
+            in_update = isinstance(update, dict) and "round" in update
+            recorder.add_node(NodeRecord(
+                node=name,
+                round=update["round"] if in_update else state.get("round"),
+                seconds=round(time.perf_counter() - start, 3),
+                error=error,
+            ))
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def awrapper(state: Mapping[str, Any]) -> Any:
+            error = update = None
+            start = time.perf_counter()
+            try:
+                with metrics_scope(node=name, round=state.get("round")):
+                    update = await fn(state)
+                return update
+            except BaseException as err:
+                error = f"{type(err).__name__}: {err}"
+                raise
+            finally:
+                _record(state, update, start, error)
+        return cast(F, awrapper)
+
+    @functools.wraps(fn)
+    def wrapper(state: Mapping[str, Any]) -> Any:
+        error = update = None
+        start = time.perf_counter()
+        try:
+            with metrics_scope(node=name, round=state.get("round")):
+                update = fn(state)
+            return update
+        except BaseException as err:
+            error = f"{type(err).__name__}: {err}"
+            raise
+        finally:
+            _record(state, update, start, error)
+    return cast(F, wrapper)
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Adds chat model token usage to the active call record."""
+
+    run_inline = True
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        try:
+            generation = response.generations[0][0]
+        except IndexError:
+            return
+        if not isinstance(generation, ChatGeneration):
+            return
+        message = generation.message
+        usage = message.usage_metadata if isinstance(message, AIMessage) else None
+        if usage:
+            note_usage(
+                usage.get("input_tokens", 0),
+                usage.get("output_tokens", 0),
+                (usage.get("input_token_details") or {}).get("cache_read", 0),
+            )
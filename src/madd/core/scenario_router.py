@@ -6,7 +6,7 @@ from typing import Iterable
 from pydantic import BaseModel, Field
 
 from madd.core.scenario import Scenario
-from madd.tools.web_search import (
+from madd.tools.domains import (
     DEFAULT_LAW_DOMAINS,
     DEFAULT_SECURITY_DOMAINS,
     DEFAULT_ECON_DOMAINS,
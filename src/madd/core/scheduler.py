@@ -0,0 +1,234 @@
+"""Process-wide rate-limit scheduler for model and search requests.
+
+Every structured model call and every web search reserves capacity here
+before it is sent: one request from the model's requests-per-minute bucket
+and an estimate of its tokens from the tokens-per-minute bucket. The estimate
+is settled against the real usage once the call returns. Callers queue in
+priority lanes, so a waiting country turn is served before a waiting verifier
+check of the same model. A 429 from the provider pauses the model for its
+``Retry-After`` period instead of letting every caller retry into the limit.
+
+Budgets come from ``Settings`` (``MADD_LLM_RPM``/``MADD_LLM_TPM`` for every
+model, ``MADD_MODEL_RATE_LIMITS`` per model); zero means unlimited, in which
+case reservations return immediately. A lane can also have a minimum interval
+between request starts (``MADD_SEARCH_MIN_INTERVAL`` for the search lane).
+"""
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from madd.core.config import get_settings
+from madd.core.metrics import note_queue
+
+# Lower value is served first; unknown lanes share the lowest priority.
+LANE_PRIORITY = {
+    "turn": 0,
+    "refine": 1,
+    "judge": 1,
+    "research": 2,
+    "search": 2,
+    "verify": 3,
+}
+_DEFAULT_PRIORITY = max(LANE_PRIORITY.values())
+
+# Allowance for the response when reserving tokens before a structured call;
+# the reservation is settled against the real usage afterwards.
+OUTPUT_TOKEN_ESTIMATE = 1000
+# Search responses carry retrieved page content, so reserve more than a chat call.
+SEARCH_TOKEN_ESTIMATE = 4 * OUTPUT_TOKEN_ESTIMATE
+
+# How often a waiter re-checks when it is only blocked by a higher lane.
+_POLL_SECONDS = 0.05
+
+_rate_share = 1.0
+
+
+def set_rate_share(share: float) -> None:
+    """Scale every budget by ``share`` (e.g. ``1 / workers`` in batch processes)."""
+    global _rate_share
+    _rate_share = share
+    get_scheduler.cache_clear()
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units per minute up to a burst of one minute."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # A request larger than the whole burst is admitted once the bucket is full.
+        need = min(amount, self.capacity)
+        return 0.0 if self.level >= need else (need - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+
+@dataclass
+class _ModelQueue:
+    requests: TokenBucket | None
+    tokens: TokenBucket | None
+    paused_until: float = 0.0
+    waiting: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def unlimited(self) -> bool:
+        return self.requests is None and self.tokens is None
+
+
+@dataclass
+class Reservation:
+    """Capacity held for one call; ``settle`` corrects the token estimate."""
+
+    scheduler: "RateLimitScheduler"
+    model: str
+    tokens: int
+
+    def settle(self, actual_tokens: int) -> None:
+        if actual_tokens > 0:
+            self.scheduler._adjust(self.model, actual_tokens - self.tokens)
+            self.tokens = actual_tokens
+
+
+class RateLimitScheduler:
+    def __init__(
+        self,
+        limits: dict[str, tuple[int, int]],
+        default: tuple[int, int],
+        share: float = 1.0,
+        lane_intervals: dict[str, float] | None = None,
+    ):
+        self._limits = limits
+        self._default = default
+        self._share = share
+        # A process with a share of the budgets spaces its starts further apart.
+        self._lane_intervals = {
+            lane: interval / share for lane, interval in (lane_intervals or {}).items() if interval > 0
+        }
+        self._lane_next: dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._queues: dict[str, _ModelQueue] = {}
+
+    def _queue(self, model: str) -> _ModelQueue:
+        queue = self._queues.get(model)
+        if queue is None:
+            rpm, tpm = self._limits.get(model, self._default)
+            queue = self._queues[model] = _ModelQueue(
+                requests=TokenBucket(rpm * self._share) if rpm else None,
+                tokens=TokenBucket(tpm * self._share) if tpm else None,
+            )
+        return queue
+
+    def _try_reserve(self, queue: _ModelQueue, lane: str, priority: int, tokens: int) -> float:
+        """Take capacity and return 0, or return how long to wait. Caller holds the lock."""
+        now = time.monotonic()
+        wait = queue.paused_until - now
+        interval = self._lane_intervals.get(lane)
+        if interval is not None:
+            wait = max(wait, self._lane_next.get(lane, now) - now)
+        if any(count for p, count in queue.waiting.items() if p < priority):
+            wait = max(wait, _POLL_SECONDS)
+        if queue.requests is not None:
+            wait = max(wait, queue.requests.wait_time(1, now))
+        if queue.tokens is not None:
+            wait = max(wait, queue.tokens.wait_time(tokens, now))
+        if wait > 0:
+            return wait
+        if queue.requests is not None:
+            queue.requests.take(1)
+        if queue.tokens is not None:
+            queue.tokens.take(tokens)
+        if interval is not None:
+            self._lane_next[lane] = now + interval
+        return 0.0
+
+    def _enter(self, model: str, lane: str, tokens: int) -> tuple[_ModelQueue, int, float] | None:
+        """Reserve immediately, or register as a waiter. Caller holds the lock."""
+        queue = self._queue(model)
+        if queue.unlimited and queue.paused_until <= time.monotonic() and lane not in self._lane_intervals:
+            return None
+        priority = LANE_PRIORITY.get(lane, _DEFAULT_PRIORITY)
+        wait = self._try_reserve(queue, lane, priority, tokens)
+        if wait > 0:
+            queue.waiting[priority] = queue.waiting.get(priority, 0) + 1
+        return queue, priority, wait
+
+    def _leave(self, queue: _ModelQueue, priority: int) -> None:
+        queue.waiting[priority] -= 1
+        self._cond.notify_all()
+
+    @contextmanager
+    def reserve(self, model: str, lane: str, tokens: int) -> Iterator[Reservation]:
+        """Block until ``model`` has capacity for one request of ~``tokens``."""
+        start = time.monotonic()
+        with self._cond:
+            entered = self._enter(model, lane, tokens)
+            if entered is not None and entered[2] > 0:
+                queue, priority, wait = entered
+                depth = sum(queue.waiting.values())
+                try:
+                    while wait > 0:
+                        self._cond.wait(wait)
+                        wait = self._try_reserve(queue, lane, priority, tokens)
+                finally:
+                    self._leave(queue, priority)
+                note_queue(lane, depth, time.monotonic() - start)
+        yield Reservation(self, model, tokens)
+
+    @asynccontextmanager
+    async def areserve(self, model: str, lane: str, tokens: int) -> AsyncIterator[Reservation]:
+        """Async ``reserve``: waits with ``asyncio.sleep`` instead of blocking the loop."""
+        start = time.monotonic()
+        with self._cond:
+            entered = self._enter(model, lane, tokens)
+        if entered is not None and entered[2] > 0:
+            queue, priority, wait = entered
+            depth = sum(queue.waiting.values())
+            try:
+                while wait > 0:
+                    await asyncio.sleep(min(wait, _POLL_SECONDS * 10))
+                    with self._cond:
+                        wait = self._try_reserve(queue, lane, priority, tokens)
+            finally:
+                with self._cond:
+                    self._leave(queue, priority)
+            note_queue(lane, depth, time.monotonic() - start)
+        yield Reservation(self, model, tokens)
+
+    def _adjust(self, model: str, delta_tokens: int) -> None:
+        with self._cond:
+            queue = self._queue(model)
+            if queue.tokens is not None:
+                queue.tokens.take(delta_tokens)
+                queue.tokens.level = min(queue.tokens.level, queue.tokens.capacity)
+            self._cond.notify_all()
+
+    def pause(self, model: str, seconds: float) -> None:
+        """Hold new requests for ``model`` (after a 429) for ``seconds``."""
+        with self._cond:
+            queue = self._queue(model)
+            queue.paused_until = max(queue.paused_until, time.monotonic() + seconds)
+
+
+@lru_cache
+def get_scheduler() -> RateLimitScheduler:
+    settings = get_settings()
+    return RateLimitScheduler(
+        dict(settings.model_rate_limits),
+        (settings.llm_rpm, settings.llm_tpm),
+        share=_rate_share,
+        lane_intervals={"search": settings.search_min_interval},
+    )
@@ -0,0 +1,94 @@
+"""Work started ahead of the graph node that needs it.
+
+A node starts a speculation under a content key and records the returned
+token in state; a later node takes it back by token and only reuses the
+result if its own key still matches. Anything else (no token, a token from
+another process after a resume, a changed key) falls back to doing the work
+inline, so speculation can only save time, never change the output.
+"""
+import asyncio
+import contextvars
+import logging
+import threading
+import uuid
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from madd.stores.response_cache import LLMCacheMiss
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Speculation:
+    key: str
+    future: Future | asyncio.Future
+
+    def result(self) -> Any:
+        """Block for the result; ``None`` if the background work failed.
+
+        A replay-mode ``LLMCacheMiss`` is re-raised: falling back to inline
+        work would only miss the cache again.
+        """
+        try:
+            return self.future.result()
+        except LLMCacheMiss:
+            raise
+        except Exception as e:
+            logger.warning(f"Speculative work failed: {e}")
+            return None
+
+    async def aresult(self) -> Any:
+        try:
+            if isinstance(self.future, Future):
+                return await asyncio.wrap_future(self.future)
+            return await self.future
+        except LLMCacheMiss:
+            raise
+        except Exception as e:
+            logger.warning(f"Speculative work failed: {e}")
+            return None
+
+    def cancel(self) -> None:
+        self.future.cancel()
+
+
+class SpeculationRegistry:
+    """Process-wide table of in-flight speculations, keyed by token."""
+
+    def __init__(self, max_workers: int = 2):
+        self._max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending: dict[str, Speculation] = {}
+
+    def _register(self, key: str, future: Future | asyncio.Future) -> str:
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._pending[token] = Speculation(key, future)
+        return token
+
+    def submit(self, key: str, fn: Callable[..., Any], *args: Any) -> str:
+        """Run ``fn(*args)`` on a background thread with the caller's context."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="madd-speculate"
+                )
+            pool = self._pool
+        return self._register(key, pool.submit(contextvars.copy_context().run, fn, *args))
+
+    def create_task(self, key: str, coro: Awaitable[Any]) -> str:
+        """Schedule ``coro`` on the running event loop."""
+        return self._register(key, asyncio.ensure_future(coro))
+
+    def take(self, token: str | None) -> Speculation | None:
+        if not token:
+            return None
+        with self._lock:
+            return self._pending.pop(token, None)
+
+
+speculations = SpeculationRegistry()
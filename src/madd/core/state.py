@@ -1,5 +1,10 @@
 import operator
-from typing import Annotated, TypedDict
+import typing
+from collections.abc import Callable
+from functools import cache
+from typing import Annotated, Any, TypedDict
+
+from pydantic import TypeAdapter
 
 from madd.core.schemas import (
     AuditFinding,
@@ -18,6 +23,12 @@ def _merge_profiles(existing: dict, new: dict) -> dict:
     return merged
 
 
+def _merge_round_summaries(existing: dict, new: dict) -> dict:
+    merged = dict(existing)
+    merged.update(new)
+    return merged
+
+
 class DebateState(TypedDict):
     scenario: Scenario
     round: int
@@ -30,6 +41,8 @@ class DebateState(TypedDict):
     clause_counter: int
     router_plan: RouterPlan | None
     treaty_text: str | None
+    round_summaries: Annotated[dict[int, str], _merge_round_summaries]
+    speculative_refine_id: str | None
 
 
 def create_initial_state(scenario: Scenario) -> DebateState:
@@ -45,4 +58,25 @@ def create_initial_state(scenario: Scenario) -> DebateState:
         clause_counter=0,
         router_plan=None,
         treaty_text=None,
+        round_summaries={},
+        speculative_refine_id=None,
     )
+
+
+@cache
+def state_fields() -> dict[str, tuple[TypeAdapter, Callable[[Any, Any], Any] | None]]:
+    """``DebateState`` keys mapped to their validator and reducer (or ``None``)."""
+    fields = {}
+    for key, hint in typing.get_type_hints(DebateState, include_extras=True).items():
+        reducer = None
+        if typing.get_origin(hint) is Annotated:
+            hint, *metadata = typing.get_args(hint)
+            reducer = next((m for m in metadata if callable(m)), None)
+        fields[key] = (TypeAdapter(hint), reducer)
+    return fields
+
+
+def decode_state_value(key: str, value: Any) -> Any:
+    """Rebuild the typed value of state ``key`` from its JSON form."""
+    field = state_fields().get(key)
+    return field[0].validate_python(value) if field is not None else value
@@ -0,0 +1,127 @@
+"""Live streaming of country statements while turns are generated.
+
+While a listener is installed with ``stream_statements``, turn models stream
+their function-call arguments; ``StatementStreamHandler`` (installed on every
+chat model) incrementally parses them and passes each new piece of
+``public_statement`` to the listener. Without a listener turns are requested
+without streaming. The listener is a context variable, so it follows the
+run into thread pools submitted with ``contextvars.copy_context().run`` and
+into async tasks, and concurrent runs each see only their own turns.
+"""
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import ChatGenerationChunk, GenerationChunk
+from langchain_core.utils.json import parse_partial_json
+
+from madd.core.metrics import current_labels
+
+# Agent calls whose statement is streamed (see ``LLMCall.call``).
+STREAMED_CALLS = {"generate_turn"}
+
+
+@dataclass
+class StatementDelta:
+    country: str | None
+    round: int | None
+    text: str
+
+
+StatementListener = Callable[[StatementDelta], None]
+
+_listener: ContextVar[StatementListener | None] = ContextVar("madd_statement_listener", default=None)
+
+
+@contextmanager
+def stream_statements(listener: StatementListener) -> Iterator[None]:
+    """Send statement deltas of the turns generated inside the block to ``listener``."""
+    token = _listener.set(listener)
+    try:
+        yield
+    finally:
+        _listener.reset(token)
+
+
+def listening() -> bool:
+    """Whether a statement listener is installed in the current context."""
+    return _listener.get() is not None
+
+
+@dataclass
+class _Stream:
+    listener: StatementListener
+    labels: dict[str, Any]
+    arguments: str = ""
+    sent: str = ""
+
+
+class StatementStreamHandler(BaseCallbackHandler):
+    """Turns streamed tool-call argument chunks into statement deltas."""
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._streams: dict[UUID, _Stream] = {}
+
+    def on_llm_new_token(
+        self,
+        token: str | list[str | dict[str, Any]],
+        *,
+        chunk: GenerationChunk | ChatGenerationChunk | None = None,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        tags: list[str] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        # The statement is inside the tool-call arguments, which only chat
+        # chunks carry; ``token`` is the message content and is not used.
+        if not isinstance(chunk, ChatGenerationChunk):
+            return
+        fragment = _argument_fragment(chunk)
+        if not fragment:
+            return
+        with self._lock:
+            stream = self._streams.get(run_id)
+            if stream is None:
+                listener = _listener.get()
+                labels = current_labels()
+                if listener is None or labels.get("call") not in STREAMED_CALLS:
+                    return
+                stream = self._streams[run_id] = _Stream(listener, labels)
+            stream.arguments += fragment
+            parsed = parse_partial_json(stream.arguments)
+            statement = parsed.get("public_statement") if isinstance(parsed, dict) else None
+            # A partially parsed escape can shrink the text; wait for it to settle.
+            if not isinstance(statement, str) or not statement.startswith(stream.sent):
+                return
+            delta = statement[len(stream.sent):]
+            if not delta:
+                return
+            stream.sent = statement
+        stream.listener(StatementDelta(
+            country=stream.labels.get("country"),
+            round=stream.labels.get("round"),
+            text=delta,
+        ))
+
+    def _finish(self, run_id: UUID) -> None:
+        with self._lock:
+            self._streams.pop(run_id, None)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+
+def _argument_fragment(chunk: ChatGenerationChunk) -> str:
+    tool_chunks = getattr(chunk.message, "tool_call_chunks", None) or []
+    return "".join(tc.get("args") or "" for tc in tool_chunks)
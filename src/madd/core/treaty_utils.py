@@ -12,3 +12,95 @@ def get_votable_clauses(treaty: TreatyDraft | None, current_round: int) -> list[
 
 def format_clause_lines(clauses: list[Clause]) -> list[str]:
     return [f"- {c.id}: {c.text} (by {c.proposed_by})" for c in clauses]
+
+
+class ClauseLedger:
+    """Indexed view of a treaty's clauses for compiling one round.
+
+    Clauses are indexed by id and by status, and supporters/objectors/amendments
+    are tracked as insertion-ordered sets so each vote is O(1). Call ``sync()``
+    to write the ordered lists back onto the touched ``Clause`` models.
+    """
+
+    def __init__(self, clauses: list[Clause]):
+        self.clauses = clauses
+        self._by_id: dict[str, Clause] = {}
+        self._pending: dict[str, Clause] = {}
+        self._supporters: dict[str, dict[str, None]] = {}
+        self._objectors: dict[str, dict[str, None]] = {}
+        self._amendments: dict[str, dict[str, None]] = {}
+        self._touched: set[str] = set()
+        for clause in clauses:
+            self._index(clause)
+
+    def _index(self, clause: Clause) -> None:
+        self._by_id[clause.id] = clause
+        if clause.status == ClauseStatus.PROPOSED:
+            self._pending[clause.id] = clause
+
+    def get(self, clause_id: str | None) -> Clause | None:
+        if not clause_id:
+            return None
+        return self._by_id.get(clause_id)
+
+    def add(self, clause: Clause) -> None:
+        self.clauses.append(clause)
+        self._index(clause)
+
+    def votable(self, current_round: int) -> list[Clause]:
+        return [c for c in self._pending.values() if c.proposed_round < current_round]
+
+    def _members(self, index: dict[str, dict[str, None]], clause: Clause, field: str) -> dict[str, None]:
+        members = index.get(clause.id)
+        if members is None:
+            members = dict.fromkeys(getattr(clause, field))
+            index[clause.id] = members
+        self._touched.add(clause.id)
+        return members
+
+    def supporters(self, clause: Clause) -> dict[str, None]:
+        return self._members(self._supporters, clause, "supporters")
+
+    def objectors(self, clause: Clause) -> dict[str, None]:
+        return self._members(self._objectors, clause, "objectors")
+
+    def add_amendment(self, clause: Clause, note: str) -> None:
+        self._members(self._amendments, clause, "amendments").setdefault(note)
+
+    def has_amendments(self, clause: Clause) -> bool:
+        if clause.id in self._amendments:
+            return bool(self._amendments[clause.id])
+        return bool(clause.amendments)
+
+    def apply_vote(self, clause: Clause, country: str, vote: str, current_round: int) -> None:
+        if vote == "support":
+            self.supporters(clause).setdefault(country)
+            self.objectors(clause).pop(country, None)
+        elif vote == "oppose":
+            self.objectors(clause).setdefault(country)
+            self.supporters(clause).pop(country, None)
+        elif vote == "amend":
+            self.objectors(clause).setdefault(country)
+            self.add_amendment(clause, f"[Round {current_round}] {country} proposed amendment")
+        elif vote == "abstain":
+            self.supporters(clause).pop(country, None)
+            self.objectors(clause).pop(country, None)
+
+    def set_status(self, clause: Clause, status: ClauseStatus, resolved_round: int | None) -> None:
+        clause.status = status
+        clause.resolved_round = resolved_round
+        if status == ClauseStatus.PROPOSED:
+            self._pending[clause.id] = clause
+        else:
+            self._pending.pop(clause.id, None)
+
+    def sync(self) -> None:
+        for clause_id in self._touched:
+            clause = self._by_id[clause_id]
+            if clause_id in self._supporters:
+                clause.supporters = list(self._supporters[clause_id])
+            if clause_id in self._objectors:
+                clause.objectors = list(self._objectors[clause_id])
+            if clause_id in self._amendments:
+                clause.amendments = list(self._amendments[clause_id])
+        self._touched.clear()
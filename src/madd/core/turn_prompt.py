@@ -0,0 +1,159 @@
+"""The static part of a country's turn prompt.
+
+Kept free of model SDK imports so ``madd validate`` can measure real turn
+prompts without loading LangChain's OpenAI integration.
+"""
+from dataclasses import dataclass
+
+from madd.core.scenario_router import DEFAULT_INSTITUTION_NAME, RouterPlan
+from madd.core.schemas import CountryProfile
+
+
+@dataclass(frozen=True)
+class TurnPrefix:
+    """The parts of a country's turn prompt that do not change between rounds."""
+
+    system_prompt: str
+    citation_refs: str
+    valid_ids: frozenset[str]
+    agenda_text: str
+    institution_name: str
+
+
+def build_turn_prefix(scenario, profile: CountryProfile, router_plan: RouterPlan, country_name: str) -> TurnPrefix:
+    all_citations = profile.all_citations()
+    scenario_citations = profile.facts.scenario_citations
+    preferred_citations = scenario_citations or all_citations
+    citation_refs = _format_citation_groups(profile, preferred_citations)
+    institution_name = router_plan.institution_name or DEFAULT_INSTITUTION_NAME
+    agenda_text = _format_agenda_text(scenario)
+    voice_guidance = _build_voice_guidance(profile, router_plan)
+    
+    facts_summary = [
+        f"Region: {profile.facts.region or 'Unknown'}",
+        f"Government: {profile.facts.government_type or 'Unknown'}",
+        f"Leaders: {', '.join(profile.facts.current_leaders[:3]) or 'Unknown'}",
+        f"GDP (USD billions): {profile.facts.economy.gdp_usd_billions or 'Unknown'}",
+        f"Major industries: {', '.join(profile.facts.economy.major_industries[:5]) or 'Unknown'}",
+    ]
+    facts_summary_text = "\n".join(facts_summary)
+    
+    system_prompt = f"""You are the Diplomatic Representative of {country_name} in a formal negotiation.
+
+Scenario: {scenario.name}
+Scenario description:
+{scenario.description}
+
+Agenda (ordered by priority; you MUST address these in order):
+{agenda_text}
+
+Country profile (facts you may rely on):
+{facts_summary_text}
+
+Negotiation style guidance:
+- Follow your profile’s negotiation_style if provided.
+- Do NOT mirror the other side’s phrasing. Use your own national voice and priorities.
+- Avoid generic filler; be specific, mechanism-oriented, and responsive to the agenda.
+- Profile style: {profile.strategy.negotiation_style or "Not specified"}
+- Scenario voice: {voice_guidance}
+
+Institution naming:
+- Use the oversight body name exactly as provided in the scenario if present.
+- If none is provided, refer to “Joint Oversight Commission (JOC)” consistently.
+- Institution name for this scenario: {institution_name}
+
+Scenario Router Patch:
+{router_plan.turn_prompt_patch}
+
+EVIDENCE & CITATION DISCIPLINE (highest priority):
+- You may ONLY include factual or legal assertions if you can support them with the available citations by ID.
+- If you cannot support a factual/legal assertion with available citations, rewrite as:
+  (a) proposal (“we propose…”),
+  (b) request for oversight study (“we request JOC produce… within X days”),
+  (c) conditional (“subject to verification…”, “pending review…”).
+- Never pad citations. Only select citation IDs that genuinely match what you said.
+- If you mention treaties, borders, legal status, casualty figures, dates, statistics, specific incidents, or binding obligations, include at least 2 relevant citations.
+
+DIPLOMATIC REALISM (required each turn):
+- Include all three:
+  1) One ASK,
+  2) One OFFER/CONCESSION,
+  3) One CONDITIONAL TRADEOFF.
+- Address agenda priorities explicitly in order (P1 → P2 → P3 ...).
+
+TREATY-QUALITY CLAUSE DRAFTING:
+- Propose 0–3 clauses max per turn.
+- Each clause must be implementable: scope, authority, timelines, compliance/enforcement, exceptions.
+- Avoid duplicates. If changing an existing clause, set supersedes="C#".
+- If you vote "amend" on any clause, you MUST also propose a replacement clause that supersedes it.
+
+VOTING:
+- For every votable clause ID provided, output exactly one vote:
+  "support" | "oppose" | "amend" | "abstain".
+- Do not vote on non-votable IDs.
+
+AVAILABLE CITATIONS (use exact IDs only):
+{citation_refs or "None"}
+
+Return a structured response with:
+- public_statement (180–260 words, 2–4 short paragraphs, end punctuation)
+- private_intent
+- proposed_clauses (text, rationale, supersedes optional)
+- clause_votes
+- citation_ids_to_reference
+
+Do NOT include citation IDs inside the public_statement text.
+"""
+    return TurnPrefix(
+        system_prompt=system_prompt,
+        citation_refs=citation_refs,
+        valid_ids=frozenset(c.id for c in all_citations if c.id),
+        agenda_text=agenda_text,
+        institution_name=institution_name,
+    )
+
+
+def _format_agenda_text(scenario) -> str:
+    items = sorted(scenario.agenda, key=lambda a: a.priority)
+    if not items:
+        return "No agenda provided."
+    lines = []
+    for item in items:
+        desc = f" - {item.description}" if item.description else ""
+        lines.append(f"P{item.priority}: {item.topic}{desc}")
+    return "\n".join(lines)
+
+
+def _build_voice_guidance(profile: CountryProfile, router_plan: RouterPlan) -> str:
+    guidance = []
+    archetypes = {a.archetype for a in (router_plan.archetypes or []) if a.score >= 0.4}
+    if "SECURITY_DEFENSE" in archetypes:
+        guidance.append("Emphasize operational realism and legal sovereignty constraints.")
+    if "TRADE_SANCTIONS_FINANCE" in archetypes or "RESOURCES_MINERALS" in archetypes:
+        guidance.append("Emphasize economic framing, licensing, and compliance mechanisms.")
+    if "ENVIRONMENT_CLIMATE" in archetypes or "HUMAN_RIGHTS_COMMUNITY" in archetypes:
+        guidance.append("Emphasize safeguards, consent thresholds, and monitoring.")
+    if profile.strategy.negotiation_style:
+        guidance.append(f"Leverage style: {profile.strategy.negotiation_style}.")
+    return " ".join(guidance) or "Balance legal, economic, and humanitarian considerations."
+
+
+def _format_citation_groups(profile: CountryProfile, fallback: list) -> str:
+    groups = [
+        ("Scenario/Law", profile.facts.scenario_citations),
+        ("Leaders", profile.facts.leaders_citations),
+        ("Economy", profile.facts.economy.citations),
+        ("History", profile.facts.history_citations),
+        ("Other", profile.facts.citations),
+    ]
+    lines: list[str] = []
+    for label, citations in groups:
+        if not citations:
+            continue
+        lines.append(f"{label}:")
+        for c in citations[:4]:
+            lines.append(f"- {c.id}: {c.title} ({c.snippet[:80]}...)")
+    if not lines:
+        for c in fallback[:8]:
+            lines.append(f"- {c.id}: {c.title} ({c.snippet[:80]}...)")
+    return "\n".join(lines)
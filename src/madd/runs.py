@@ -0,0 +1,135 @@
+"""Query the run catalog (``madd runs ...``).
+
+    madd runs list [--scenario NAME] [--since 30d]
+    madd runs query "arctic AND shipping" [--kind clause] [--status accepted]
+    madd runs scores [--country Japan] [--since 30d] [--final]
+    madd runs reindex                  # rebuild the catalog from run directories
+    madd runs prune [--dry-run]        # delete profile blobs no snapshot references
+
+Every subcommand takes ``--output-dir`` (the directory holding
+``catalog.sqlite``, default ``output``) and ``--json``.
+"""
+import argparse
+import json
+import re
+import sqlite3
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+_SINCE_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_since(value: str) -> datetime:
+    """``30d``/``12h``/``2w`` ago, or an ISO date or time (taken as UTC)."""
+    match = re.fullmatch(r"(\d+)([mhdw])", value.strip())
+    if match:
+        amount, unit = match.groups()
+        return datetime.now(UTC) - timedelta(**{_SINCE_UNITS[unit]: int(amount)})
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(f"expected e.g. 30d, 12h or 2025-01-31, got {value!r}") from err
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("output"),
+        help="Directory holding catalog.sqlite (default: output)"
+    )
+    common.add_argument("--json", action="store_true", help="Print results as JSON")
+    filters = argparse.ArgumentParser(add_help=False)
+    filters.add_argument("--scenario", default=None, help="Only runs of this scenario name")
+    filters.add_argument("--since", type=parse_since, default=None, help="Only runs finished since, e.g. 30d or 2025-01-31")
+
+    parser = argparse.ArgumentParser(prog="madd runs", description="Query the catalog of finished runs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", parents=[common, filters], help="List indexed runs, newest first")
+    query = commands.add_parser("query", parents=[common, filters], help="Full-text search over clauses and statements")
+    query.add_argument("text", help="FTS5 query, e.g. 'fishing AND quota' or '\"joint patrol\"'")
+    query.add_argument("--kind", choices=["clause", "statement"], default=None)
+    query.add_argument("--status", default=None, help="Only clauses with this final status, e.g. accepted")
+    query.add_argument("--country", default=None, help="Only text by this country")
+    query.add_argument("--limit", type=int, default=50)
+    scores = commands.add_parser("scores", parents=[common, filters], help="Average judge score per country")
+    scores.add_argument("--country", default=None)
+    scores.add_argument("--final", action="store_true", help="Only each run's final-round scores")
+    commands.add_parser("reindex", parents=[common], help="Rebuild the catalog from the run directories")
+    prune = commands.add_parser("prune", parents=[common], help="Delete profile blobs that no run snapshot references")
+    prune.add_argument("--dry-run", action="store_true", help="Only list the blobs that would be deleted")
+    return parser
+
+
+def _print_rows(rows: list[dict], columns: list[str]) -> None:
+    if not rows:
+        print("No matches.")
+        return
+    widths = {c: max(len(c), *(len(str(row.get(c, ""))) for row in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row.get(c, "") if row.get(c) is not None else "").ljust(widths[c]) for c in columns))
+
+
+def main(argv: list[str] | None = None) -> int:
+    from madd.stores import catalog
+
+    args = build_parser().parse_args(argv)
+    root = args.output_dir
+    try:
+        if args.command == "prune":
+            from madd.stores.snapshot import prune_profile_blobs
+
+            pruned = prune_profile_blobs(root, dry_run=args.dry_run)
+            rows = [{"path": str(path)} for path in pruned]
+            columns = ["path"]
+            if not args.json:
+                verb = "Would delete" if args.dry_run else "Deleted"
+                print(f"{verb} {len(pruned)} unreferenced profile blobs under {root}")
+                return 0
+        elif args.command == "reindex":
+            run_ids = catalog.reindex(root)
+            rows = [{"run_id": run_id} for run_id in run_ids]
+            columns = ["run_id"]
+            if not args.json:
+                print(f"Indexed {len(run_ids)} runs into {catalog.catalog_path(root)}")
+                return 0
+        elif args.command == "list":
+            rows = catalog.list_runs(root, scenario=args.scenario, since=args.since)
+            columns = ["run_id", "scenario", "rounds", "finished_at", "accepted", "pending", "cost_usd"]
+        elif args.command == "query":
+            rows = catalog.search(
+                root,
+                args.text,
+                kind=args.kind,
+                status=args.status,
+                country=args.country,
+                scenario=args.scenario,
+                since=args.since,
+                limit=args.limit,
+            )
+            columns = ["run_id", "kind", "country", "round", "clause_id", "status", "snippet"]
+        else:
+            rows = catalog.average_scores(
+                root,
+                country=args.country,
+                scenario=args.scenario,
+                since=args.since,
+                final_round=args.final,
+            )
+            columns = ["country", "average", "scores", "runs"]
+    except (OSError, ValueError, sqlite3.Error) as err:
+        print(f"Error: {err}", file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_rows(rows, columns)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
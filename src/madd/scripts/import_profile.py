@@ -0,0 +1,101 @@
+"""Cold-start import benchmark for the ``madd`` entry points.
+
+Imports each module in a fresh interpreter under ``python -X importtime``,
+reports the total and the slowest imports, and fails when an entry point
+eagerly loads one of ``HEAVY_MODULES``. Run it in CI with
+``madd --import-profile`` (or ``python -m madd.scripts.import_profile``).
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+
+ENTRY_MODULES = ("madd", "madd.cli", "madd.batch", "madd.core.dry_run", "madd.ui.web")
+
+# Only needed once a graph node runs; entry points must not import them.
+HEAVY_MODULES = ("langgraph", "langchain_openai", "openai", "madd.agents")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    total_ms: float
+    slowest: list[tuple[str, float]] = field(default_factory=list)
+    heavy: list[str] = field(default_factory=list)
+
+
+def _import_times(code: str) -> list[tuple[str, int, bool]]:
+    """``(module, cumulative_us, top_level)`` for each import made running ``code``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit status {proc.returncode}"
+        raise RuntimeError(f"{code!r} failed: {error}")
+    times = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            _, cumulative_us, indent, name = match.groups()
+            times.append((name, int(cumulative_us), len(indent) == 1))
+    return times
+
+
+def profile_import(module: str, top: int = 10) -> ImportProfile:
+    """Import ``module`` in a new interpreter and collect ``-X importtime`` data.
+
+    Modules the interpreter imports at startup (``site`` and ``.pth`` hooks)
+    are excluded.
+    """
+    startup = {name for name, _, _ in _import_times("pass")}
+    cumulative = {
+        name: (us, top_level)
+        for name, us, top_level in _import_times(f"import {module}")
+        if name not in startup
+    }
+    total_us = sum(us for us, top_level in cumulative.values() if top_level)
+    slowest = sorted(cumulative.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    heavy = [name for name in HEAVY_MODULES if name in cumulative]
+    return ImportProfile(
+        module=module,
+        total_ms=round(total_us / 1000, 1),
+        slowest=[(name, round(us / 1000, 1)) for name, (us, _) in slowest],
+        heavy=heavy,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="madd --import-profile",
+        description="Measure cold-start import time of the madd entry points",
+    )
+    parser.add_argument("modules", nargs="*", default=list(ENTRY_MODULES), help="Modules to import")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list per module")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args(argv)
+
+    try:
+        profiles = [profile_import(module, args.top) for module in args.modules]
+    except RuntimeError as err:
+        print(f"Error: {err}", file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps([asdict(profile) for profile in profiles], indent=2))
+    else:
+        for profile in profiles:
+            print(f"import {profile.module}: {profile.total_ms:.1f} ms")
+            for name, ms in profile.slowest:
+                print(f"  {ms:8.1f} ms  {name}")
+            if profile.heavy:
+                print(f"  eagerly imports: {', '.join(profile.heavy)}")
+    return 1 if any(profile.heavy for profile in profiles) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
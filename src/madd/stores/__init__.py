@@ -1,31 +1,63 @@
-from madd.stores.profile_store import (
-    load_profile,
-    save_profile,
-    ensure_profile,
-    get_profile_path,
-)
-from madd.stores.run_store import (
-    create_run_dir,
-    save_all_outputs,
-    save_state_snapshot,
-    save_transcript,
-    save_treaty,
-    save_scorecards,
-    save_audit,
-    save_summary,
-)
+from typing import TYPE_CHECKING
+
+from madd._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from madd.stores.journal import open_journal, replay_journal
+    from madd.stores.profile_store import (
+        ensure_profile,
+        get_profile_path,
+        load_profile,
+        save_profile,
+    )
+    from madd.stores.run_store import (
+        create_run_dir,
+        save_all_outputs,
+        save_audit,
+        save_metrics,
+        save_scorecards,
+        save_summary,
+        save_transcript,
+        save_treaty,
+    )
+    from madd.stores.snapshot import load_state_snapshot, save_state_snapshot
+
+_EXPORTS = {
+    "load_profile": "madd.stores.profile_store",
+    "save_profile": "madd.stores.profile_store",
+    "ensure_profile": "madd.stores.profile_store",
+    "get_profile_path": "madd.stores.profile_store",
+    "open_journal": "madd.stores.journal",
+    "replay_journal": "madd.stores.journal",
+    "create_run_dir": "madd.stores.run_store",
+    "save_all_outputs": "madd.stores.run_store",
+    "save_state_snapshot": "madd.stores.snapshot",
+    "load_state_snapshot": "madd.stores.snapshot",
+    "save_transcript": "madd.stores.run_store",
+    "save_treaty": "madd.stores.run_store",
+    "save_scorecards": "madd.stores.run_store",
+    "save_audit": "madd.stores.run_store",
+    "save_summary": "madd.stores.run_store",
+    "save_metrics": "madd.stores.run_store",
+}
 
 __all__ = [
     "load_profile",
     "save_profile",
     "ensure_profile",
     "get_profile_path",
+    "open_journal",
+    "replay_journal",
     "create_run_dir",
     "save_all_outputs",
     "save_state_snapshot",
+    "load_state_snapshot",
     "save_transcript",
     "save_treaty",
     "save_scorecards",
     "save_audit",
     "save_summary",
+    "save_metrics",
 ]
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
@@ -0,0 +1,283 @@
+"""SQLite catalog of finished runs for cross-run queries.
+
+``<output-dir>/catalog.sqlite`` holds one row per run (scenario, countries,
+rounds, cost, clause totals) plus its clauses, judge scores, audit findings
+and country statements, with an FTS5 index over clause and statement text.
+Runners call ``index_run`` once a run's artifacts are written, so the
+catalog grows incrementally; ``reindex`` rebuilds it from the run
+directories on disk (e.g. for runs from before the catalog existed).
+
+Runs are keyed by their path relative to the catalog's directory
+(``run_20250101_120000``, ``batch_20250101_120000/run_0003``).
+"""
+import json
+import logging
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILENAME = "catalog.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    scenario TEXT,
+    countries TEXT,
+    rounds INTEGER,
+    started_at TEXT,
+    finished_at TEXT,
+    cost_usd REAL,
+    accepted INTEGER,
+    pending INTEGER
+);
+CREATE TABLE IF NOT EXISTS clauses (
+    run_id TEXT, clause_id TEXT, text TEXT, proposed_by TEXT, status TEXT,
+    proposed_round INTEGER, resolved_round INTEGER
+);
+CREATE TABLE IF NOT EXISTS scores (run_id TEXT, round INTEGER, country TEXT, score REAL);
+CREATE TABLE IF NOT EXISTS audit (
+    run_id TEXT, severity TEXT, category TEXT, country TEXT, round INTEGER, description TEXT
+);
+CREATE TABLE IF NOT EXISTS statements (run_id TEXT, round INTEGER, country TEXT, text TEXT);
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(
+    text, kind UNINDEXED, run_id UNINDEXED, country UNINDEXED, round UNINDEXED, ref UNINDEXED
+);
+CREATE INDEX IF NOT EXISTS clauses_run ON clauses(run_id);
+CREATE INDEX IF NOT EXISTS scores_country ON scores(country);
+CREATE INDEX IF NOT EXISTS audit_run ON audit(run_id);
+CREATE INDEX IF NOT EXISTS statements_run ON statements(run_id);
+"""
+
+_RUN_TABLES = ("runs", "clauses", "scores", "audit", "statements", "search")
+
+
+def catalog_path(root: Path) -> Path:
+    return Path(root) / CATALOG_FILENAME
+
+
+@contextmanager
+def open_catalog(root: Path, *, readonly: bool = False) -> Iterator[sqlite3.Connection]:
+    path = catalog_path(root)
+    if readonly:
+        if not path.exists():
+            raise FileNotFoundError(f"No run catalog at {path}; run 'madd runs reindex' first")
+        conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True, timeout=30)
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30)
+        # WAL lets concurrent runs index while analysts query.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+    conn.row_factory = sqlite3.Row
+    with closing(conn):
+        yield conn
+
+
+def _read_json(path: Path, default: Any) -> Any:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _iso_mtime(path: Path) -> str | None:
+    try:
+        return datetime.fromtimestamp(path.stat().st_mtime, UTC).isoformat()
+    except OSError:
+        return None
+
+
+def _load_state(run_dir: Path):
+    from madd.stores.snapshot import load_state_snapshot
+
+    for name in ("state.json.gz", "state.json"):
+        if (run_dir / name).exists():
+            return load_state_snapshot(run_dir / name), run_dir / name
+    return None, None
+
+
+def _journal_span(run_dir: Path) -> tuple[str | None, str | None]:
+    """When the run's first and last journal entries were written."""
+    from madd.stores.journal import journal_path, read_journal
+
+    if not journal_path(run_dir).exists():
+        return None, None
+    first = last = None
+    with closing(read_journal(run_dir)) as entries:
+        for entry in entries:
+            first = first or entry.get("at")
+            last = entry.get("at") or last
+    return first, last
+
+
+def index_run(run_dir: Path, root: Path | None = None) -> str:
+    """Add (or refresh) the run in ``run_dir`` in the catalog under ``root``.
+
+    ``root`` defaults to the run directory's parent. Returns the run's key.
+    """
+    run_dir = Path(run_dir)
+    root = Path(root) if root is not None else run_dir.parent
+    run_id = run_dir.resolve().relative_to(root.resolve()).as_posix()
+
+    clauses = _read_json(run_dir / "clauses.json", [])
+    scorecards = _read_json(run_dir / "scorecards.json", [])
+    audit = _read_json(run_dir / "audit.json", [])
+    cost = _read_json(run_dir / "metrics.json", {}).get("totals", {}).get("cost_usd")
+    state, state_path = _load_state(run_dir)
+    scenario = state["scenario"] if state is not None else None
+    messages = state["messages"] if state is not None else []
+    started_at, finished_at = _journal_span(run_dir)
+    if finished_at is None:
+        # Runs without a journal: the file times, which a copy may have reset.
+        finished_at = _iso_mtime(state_path) if state_path else _iso_mtime(run_dir / "clauses.json")
+
+    run_row = (
+        run_id,
+        scenario.name if scenario else None,
+        json.dumps(scenario.countries) if scenario else None,
+        state.get("round") if state is not None else None,
+        started_at,
+        finished_at,
+        cost,
+        sum(1 for c in clauses if c.get("status") == "accepted"),
+        sum(1 for c in clauses if c.get("status") not in ("accepted", "rejected")),
+    )
+    with open_catalog(root) as conn, conn:
+        for table in _RUN_TABLES:
+            conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+        conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", run_row)
+        conn.executemany("INSERT INTO clauses VALUES (?, ?, ?, ?, ?, ?, ?)", [
+            (run_id, c.get("id"), c.get("text"), c.get("proposed_by"), c.get("status"),
+             c.get("proposed_round"), c.get("resolved_round"))
+            for c in clauses
+        ])
+        conn.executemany("INSERT INTO scores VALUES (?, ?, ?, ?)", [
+            (run_id, card.get("round_number"), score.get("country"), score.get("score"))
+            for card in scorecards
+            for score in card.get("scores", [])
+        ])
+        conn.executemany("INSERT INTO audit VALUES (?, ?, ?, ?, ?, ?)", [
+            (run_id, f.get("severity"), f.get("category"), f.get("country"), f.get("round_number"),
+             f.get("description"))
+            for f in audit
+        ])
+        conn.executemany("INSERT INTO statements VALUES (?, ?, ?, ?)", [
+            (run_id, m.round_number, m.country, m.public_statement) for m in messages
+        ])
+        conn.executemany("INSERT INTO search VALUES (?, ?, ?, ?, ?, ?)", [
+            *((c.get("text"), "clause", run_id, c.get("proposed_by"), c.get("proposed_round"), c.get("id"))
+              for c in clauses),
+            *((m.public_statement, "statement", run_id, m.country, m.round_number, None)
+              for m in messages),
+        ])
+    return run_id
+
+
+def try_index_run(run_dir: Path, root: Path | None = None) -> str | None:
+    """``index_run`` for runners: a catalog failure is logged, never raised."""
+    try:
+        return index_run(run_dir, root)
+    except Exception as err:
+        logger.warning(f"Could not add {run_dir} to the run catalog: {err}")
+        return None
+
+
+def reindex(root: Path) -> list[str]:
+    """Index every run directory (one with a ``clauses.json``) under ``root``."""
+    root = Path(root)
+    return [index_run(path.parent, root) for path in sorted(root.rglob("clauses.json"))]
+
+
+def _run_filters(scenario: str | None, since: datetime | None) -> tuple[str, list[Any]]:
+    clauses, params = [], []
+    if scenario:
+        clauses.append("runs.scenario = ?")
+        params.append(scenario)
+    if since:
+        clauses.append("runs.finished_at >= ?")
+        params.append(since.isoformat())
+    return "".join(f" AND {c}" for c in clauses), params
+
+
+def list_runs(root: Path, *, scenario: str | None = None, since: datetime | None = None) -> list[dict]:
+    where, params = _run_filters(scenario, since)
+    with open_catalog(root, readonly=True) as conn:
+        rows = conn.execute(
+            f"SELECT * FROM runs WHERE 1 = 1{where} ORDER BY finished_at DESC", params
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def search(
+    root: Path,
+    text: str,
+    *,
+    kind: str | None = None,
+    status: str | None = None,
+    country: str | None = None,
+    scenario: str | None = None,
+    since: datetime | None = None,
+    limit: int = 50,
+) -> list[dict]:
+    """Full-text search (FTS5 syntax) over clause and statement text.
+
+    ``status`` keeps clauses with that final status (e.g. ``accepted``).
+    """
+    where, params = _run_filters(scenario, since)
+    if kind:
+        where += " AND search.kind = ?"
+        params.append(kind)
+    if country:
+        where += " AND search.country = ?"
+        params.append(country)
+    if status:
+        where += " AND clauses.status = ?"
+        params.append(status)
+    query = f"""
+        SELECT search.run_id, runs.scenario, runs.finished_at, search.kind, search.country,
+               search.round, search.ref AS clause_id, clauses.status,
+               snippet(search, 0, '[', ']', '...', 16) AS snippet
+        FROM search
+        JOIN runs ON runs.run_id = search.run_id
+        LEFT JOIN clauses ON clauses.run_id = search.run_id AND clauses.clause_id = search.ref
+        WHERE search MATCH ?{where}
+        ORDER BY rank
+        LIMIT ?
+    """
+    with open_catalog(root, readonly=True) as conn:
+        rows = conn.execute(query, [text, *params, limit]).fetchall()
+    return [dict(row) for row in rows]
+
+
+def average_scores(
+    root: Path,
+    *,
+    country: str | None = None,
+    scenario: str | None = None,
+    since: datetime | None = None,
+    final_round: bool = False,
+) -> list[dict]:
+    """Average judge score per country; ``final_round`` keeps each run's last round."""
+    where, params = _run_filters(scenario, since)
+    if country:
+        where += " AND scores.country = ?"
+        params.append(country)
+    if final_round:
+        where += " AND scores.round = (SELECT MAX(round) FROM scores s WHERE s.run_id = scores.run_id)"
+    query = f"""
+        SELECT scores.country, ROUND(AVG(scores.score), 2) AS average, COUNT(*) AS scores,
+               COUNT(DISTINCT scores.run_id) AS runs
+        FROM scores JOIN runs ON runs.run_id = scores.run_id
+        WHERE 1 = 1{where}
+        GROUP BY scores.country
+        ORDER BY average DESC
+    """
+    with open_catalog(root, readonly=True) as conn:
+        rows = conn.execute(query, params).fetchall()
+    return [dict(row) for row in rows]
@@ -0,0 +1,115 @@
+"""Append-only run journal: one JSON line per completed graph node.
+
+Each line holds the state delta a node returned (new messages, audit
+findings, scorecards, the updated treaty), so the transcript is on disk as
+the debate progresses and ``tail -f journal.jsonl`` follows a live run. The
+first line is the initial state; a resumed run appends the checkpointed state
+it continues from. ``replay_journal`` folds the lines back into a typed
+``DebateState`` with the same reducers the graph uses, and the final
+artifacts are written from it.
+"""
+import json
+from collections.abc import Generator, Iterator, Mapping
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import IO, Any, cast
+
+from pydantic_core import to_json
+
+from madd.core.state import DebateState, decode_state_value, state_fields
+
+JOURNAL_FILENAME = "journal.jsonl"
+# Entries that replace the whole state instead of applying a delta.
+START_ENTRY = "__start__"
+RESUME_ENTRY = "__resume__"
+
+
+def journal_path(run_dir: Path) -> Path:
+    return Path(run_dir) / JOURNAL_FILENAME
+
+
+class RunJournal:
+    def __init__(self, file: IO[bytes], seq: int = 0):
+        self._file = file
+        self.seq = seq
+
+    def append(self, node: str, update: dict[str, Any]) -> None:
+        """Write one node's update and flush it to disk."""
+        self.seq += 1
+        entry = {"seq": self.seq, "node": node, "at": datetime.now(UTC).isoformat(), "update": update}
+        self._file.write(to_json(entry, fallback=str) + b"\n")
+        self._file.flush()
+
+
+@contextmanager
+def open_journal(run_dir: Path) -> Iterator[RunJournal]:
+    """Open the run's journal for appending, continuing its sequence numbers."""
+    path = journal_path(run_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    seq = 0
+    if path.exists():
+        seq = max((entry.get("seq", 0) for entry in read_journal(run_dir)), default=0)
+    with open(path, "a+b") as file:
+        # End a line cut off by a crash so the next entry starts on its own.
+        if file.tell():
+            file.seek(-1, 2)
+            if file.read(1) != b"\n":
+                file.write(b"\n")
+        yield RunJournal(file, seq)
+
+
+def journaled_updates(
+    graph,
+    graph_input: Mapping[str, Any] | None,
+    config: dict,
+    journal: RunJournal,
+) -> Iterator[tuple[str, Any]]:
+    """Stream ``(node, update)`` pairs of a run, journaling each before it is yielded.
+
+    ``graph_input=None`` resumes from the checkpoint in ``config``, whose state
+    is journaled first.
+    """
+    if graph_input is None:
+        journal.append(RESUME_ENTRY, dict(graph.get_state(config).values))
+    else:
+        journal.append(START_ENTRY, dict(graph_input))
+    for update_batch in graph.stream(graph_input, config, stream_mode="updates"):
+        for node, update in update_batch.items():
+            if isinstance(update, dict) and update:
+                journal.append(node, update)
+            yield node, update
+
+
+def read_journal(run_dir: Path) -> Generator[dict, None, None]:
+    """Yield the journal's entries; a line cut off by a crash is skipped."""
+    with open(journal_path(run_dir), "rb") as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def apply_update(state: dict[str, Any], update: dict[str, Any]) -> dict[str, Any]:
+    """Merge a node's update into ``state`` as the graph would."""
+    merged = dict(state)
+    fields = state_fields()
+    for key, value in update.items():
+        reducer = fields[key][1] if key in fields else None
+        merged[key] = reducer(merged[key], value) if reducer is not None and key in merged else value
+    return merged
+
+
+def replay_journal(run_dir: Path) -> DebateState:
+    """Rebuild the run's latest state from its journal."""
+    state: dict[str, Any] = {}
+    for entry in read_journal(run_dir):
+        update = {key: decode_state_value(key, value) for key, value in entry["update"].items()}
+        if entry["node"] in (START_ENTRY, RESUME_ENTRY):
+            state = update
+        else:
+            state = apply_update(state, update)
+    if not state:
+        raise ValueError(f"Run journal {journal_path(run_dir)} has no entries")
+    return cast(DebateState, state)
@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 
 from madd.core.config import get_settings
 from madd.core.schemas import CountryProfile
+from madd.stores.atomic import atomic_open
 
 logger = logging.getLogger(__name__)
 
@@ -52,11 +53,31 @@ def load_profile(country_name: str, scenario_key: str | None = None) -> CountryP
 def save_profile(profile: CountryProfile, scenario_key: str | None = None) -> Path:
     path = get_profile_path(profile.facts.name, scenario_key)
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
+    with atomic_open(path, "w", encoding="utf-8") as f:
         f.write(profile.model_dump_json(indent=2))
     return path
 
 
+def usable_cached_profile(country_name: str, scenario_key: str | None) -> CountryProfile | None:
+    cached = load_profile(country_name, scenario_key)
+    if cached and cached.all_citations():
+        return cached
+    if cached and not cached.all_citations():
+        logger.warning(f"Cached profile for {country_name} has no citations; regenerating.")
+    return None
+
+
+def _store_generated_profile(
+    country_name: str,
+    profile: CountryProfile | None,
+    scenario_key: str | None,
+) -> CountryProfile:
+    if not profile or not profile.all_citations():
+        raise ValueError(f"Profile for {country_name} has no citations; cannot proceed.")
+    save_profile(profile, scenario_key)
+    return profile
+
+
 def ensure_profile(
     country_name: str,
     scenario_description: str,
@@ -66,11 +87,9 @@ def ensure_profile(
 ) -> CountryProfile:
     from madd.agents.researcher import generate_profile
     
-    cached = load_profile(country_name, scenario_key)
-    if cached and cached.all_citations():
+    cached = usable_cached_profile(country_name, scenario_key)
+    if cached:
         return cached
-    if cached and not cached.all_citations():
-        logger.warning(f"Cached profile for {country_name} has no citations; regenerating.")
     
     profile = None
     for _attempt in range(2):
@@ -82,7 +101,30 @@ def ensure_profile(
         )
         if profile.all_citations():
             break
-    if not profile or not profile.all_citations():
-        raise ValueError(f"Profile for {country_name} has no citations; cannot proceed.")
-    save_profile(profile, scenario_key)
-    return profile
+    return _store_generated_profile(country_name, profile, scenario_key)
+
+
+async def aensure_profile(
+    country_name: str,
+    scenario_description: str,
+    scenario_name: str | None = None,
+    scenario_key: str | None = None,
+    router_plan: "RouterPlan | None" = None,
+) -> CountryProfile:
+    from madd.agents.researcher import agenerate_profile
+    
+    cached = usable_cached_profile(country_name, scenario_key)
+    if cached:
+        return cached
+    
+    profile = None
+    for _attempt in range(2):
+        profile = await agenerate_profile(
+            country_name,
+            scenario_description,
+            scenario_name=scenario_name,
+            router_plan=router_plan,
+        )
+        if profile.all_citations():
+            break
+    return _store_generated_profile(country_name, profile, scenario_key)
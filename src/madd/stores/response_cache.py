@@ -0,0 +1,235 @@
+"""Content-addressed cache for structured LLM responses.
+
+Entries are keyed by a hash of (role, model, temperature, schema, messages) and
+carry a digest over their own contents, so a corrupted (truncated or mangled)
+entry is detected on read and treated as a miss instead of being replayed.
+The digest is not a signature: it does not protect against deliberate edits.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import suppress
+from datetime import UTC, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables import Runnable, RunnableConfig
+from pydantic import BaseModel
+
+from madd.core.config import get_settings
+from madd.core.metrics import mark_cached
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCacheMiss(Exception):
+    """Raised in replay mode when a request has no cached response.
+
+    ``run_llm_flow`` re-raises it instead of handing it to the agent, and the
+    graph's best-effort fallbacks let it through, so a replay miss fails the
+    run instead of silently producing a different one.
+    """
+
+
+def _canonical(obj: Any) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_cache_key(
+    role: str,
+    model: str,
+    temperature: float,
+    schema: type[BaseModel],
+    messages: list,
+) -> str:
+    schema_id = f"{schema.__module__}.{schema.__qualname__}:{_sha256(_canonical(schema.model_json_schema()))}"
+    payload = {
+        "role": role,
+        "model": model,
+        "temperature": temperature,
+        "schema": schema_id,
+        "messages": [[getattr(m, "type", ""), getattr(m, "content", m)] for m in messages],
+    }
+    return _sha256(_canonical(payload))
+
+
+def _entry_digest(key: str, response: dict) -> str:
+    return _sha256(_canonical({"key": key, "response": response}))
+
+
+class ResponseCache(ABC):
+    """Backend interface for cached structured responses."""
+
+    @abstractmethod
+    def get(self, key: str) -> dict | None:
+        """Return the cached response for ``key``, or ``None``."""
+
+    @abstractmethod
+    def put(self, key: str, response: dict, meta: dict | None = None) -> None:
+        """Store ``response`` under ``key``."""
+
+
+class DiskResponseCache(ResponseCache):
+    """One JSON file per key, evicted least-recently-used past ``max_bytes``."""
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int = 0):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        self._sizes: OrderedDict[str, int] | None = None
+        self._total = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        if self._sizes is None:
+            entries = []
+            if self.cache_dir.exists():
+                for path in self.cache_dir.glob("*/*.json"):
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, path.stem, stat.st_size))
+            entries.sort()
+            self._sizes = OrderedDict((key, size) for _, key, size in entries)
+            self._total = sum(self._sizes.values())
+        return self._sizes
+
+    def _forget(self, key: str) -> None:
+        sizes = self._load_index()
+        self._total -= sizes.pop(key, 0)
+        self._path(key).unlink(missing_ok=True)
+
+    def get(self, key: str) -> dict | None:
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+            response = entry.get("response")
+            if (
+                entry.get("key") != key
+                or not isinstance(response, dict)
+                or entry.get("digest") != _entry_digest(key, response)
+            ):
+                logger.warning(f"Discarding tampered LLM cache entry {key[:12]}")
+                self._forget(key)
+                return None
+            sizes = self._load_index()
+            if key in sizes:
+                sizes.move_to_end(key)
+            with suppress(OSError):
+                os.utime(path)
+            return response
+
+    def put(self, key: str, response: dict, meta: dict | None = None) -> None:
+        entry = {
+            "key": key,
+            "created_at": datetime.now(UTC).isoformat(),
+            "meta": meta or {},
+            "response": response,
+            "digest": _entry_digest(key, response),
+        }
+        data = json.dumps(entry, indent=2, default=str)
+        path = self._path(key)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            sizes = self._load_index()
+            self._total -= sizes.pop(key, 0)
+            sizes[key] = len(data.encode("utf-8"))
+            self._total += sizes[key]
+            self._evict()
+
+    def _evict(self) -> None:
+        if not self.max_bytes:
+            return
+        sizes = self._load_index()
+        while self._total > self.max_bytes and len(sizes) > 1:
+            oldest = next(iter(sizes))
+            self._forget(oldest)
+
+
+class CachedStructuredModel(Runnable):
+    """Structured-output runnable backed by the LLM response cache.
+
+    In ``replay`` mode a miss raises ``LLMCacheMiss`` instead of calling the
+    model.
+    """
+
+    def __init__(
+        self,
+        inner: Runnable,
+        cache: ResponseCache,
+        role: str,
+        model: str,
+        temperature: float,
+        schema: type[BaseModel],
+        replay_only: bool = False,
+    ):
+        self.inner = inner
+        self.cache = cache
+        self.role = role
+        self.model = model
+        self.temperature = temperature
+        self.schema = schema
+        self.replay_only = replay_only
+
+    def _lookup(self, input: Any) -> tuple[str, BaseModel | None]:
+        key = make_cache_key(self.role, self.model, self.temperature, self.schema, input)
+        cached = self.cache.get(key)
+        if cached is not None:
+            mark_cached()
+            return key, self.schema.model_validate(cached)
+        if self.replay_only:
+            raise LLMCacheMiss(f"No cached {self.schema.__name__} response for {self.role} ({key[:12]})")
+        return key, None
+
+    def _store(self, key: str, result: Any) -> None:
+        if isinstance(result, BaseModel):
+            self.cache.put(
+                key,
+                result.model_dump(mode="json"),
+                meta={"role": self.role, "model": self.model, "schema": self.schema.__name__},
+            )
+
+    def invoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        key, cached = self._lookup(input)
+        if cached is not None:
+            return cached
+        result = self.inner.invoke(input, config, **kwargs)
+        self._store(key, result)
+        return result
+
+    async def ainvoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        key, cached = self._lookup(input)
+        if cached is not None:
+            return cached
+        result = await self.inner.ainvoke(input, config, **kwargs)
+        self._store(key, result)
+        return result
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache:
+    settings = get_settings()
+    return DiskResponseCache(
+        settings.llm_cache_dir,
+        max_bytes=int(settings.llm_cache_max_mb * 1024 * 1024),
+    )
@@ -1,116 +1,153 @@
-import json
+"""Run directories and the artifacts written into them.
+
+``save_all_outputs`` builds the citation lookups once (``RunIndex``) and
+writes the artifacts concurrently: JSON is encoded in one pass by
+pydantic-core and markdown is streamed line by line through a buffered file.
+Each artifact's write time and size are added to the run's metrics.
+"""
+import functools
+import logging
+import secrets
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import IO, Any
+
+from pydantic_core import to_json
 
+from madd.core.metrics import MetricsRecorder, current_recorder
 from madd.core.schemas import Citation
 from madd.core.state import DebateState
+from madd.stores.atomic import atomic_open, write_bytes_atomic
+from madd.stores.snapshot import save_state_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Writer threads per run; writes are short, so a few are enough to overlap I/O.
+_WRITE_WORKERS = 4
+_WRITE_BUFFER = 1 << 16
+
+
+_run_id_lock = threading.Lock()
+_last_run_micros = 0
 
 
-def create_run_dir(base_dir: str = "output") -> Path:
-    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-    run_dir = Path(base_dir) / f"run_{ts}"
-    run_dir.mkdir(parents=True, exist_ok=True)
-    return run_dir
+def new_run_id(prefix: str = "run") -> str:
+    """Return ``<prefix>_<UTC time to the microsecond>_<random hex>``.
 
+    IDs sort in creation order; within a process they strictly increase, and
+    the random suffix separates processes that start in the same microsecond.
+    """
+    global _last_run_micros
+    with _run_id_lock:
+        micros = max(time.time_ns() // 1000, _last_run_micros + 1)
+        _last_run_micros = micros
+    seconds, fraction = divmod(micros, 1_000_000)
+    stamp = datetime.fromtimestamp(seconds, UTC).strftime("%Y%m%d_%H%M%S")
+    return f"{prefix}_{stamp}_{fraction:06d}_{secrets.token_hex(3)}"
 
-def _serialize(val):
-    if hasattr(val, 'model_dump'):
-        return val.model_dump(mode="json")
-    elif isinstance(val, list):
-        return [_serialize(v) for v in val]
-    elif isinstance(val, dict):
-        return {k: _serialize(v) for k, v in val.items()}
-    return val
 
+def create_run_dir(base_dir: str = "output", prefix: str = "run") -> Path:
+    """Create a new, empty run directory; never reuses an existing one."""
+    base = Path(base_dir)
+    base.mkdir(parents=True, exist_ok=True)
+    while True:
+        run_dir = base / new_run_id(prefix)
+        try:
+            # mkdir is atomic: of two writers racing for a name, one gets FileExistsError.
+            run_dir.mkdir()
+            return run_dir
+        except FileExistsError:
+            continue
 
-def save_state_snapshot(state: DebateState, run_dir: Path, label: str = "state") -> Path:
-    path = run_dir / f"{label}.json"
-    data = {k: _serialize(v) for k, v in state.items()}
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2, default=str)
+
+def _write_json(path: Path, data: Any) -> Path:
+    write_bytes_atomic(path, to_json(data, indent=2, fallback=str))
     return path
 
 
-def collect_all_citations(state: DebateState) -> list[Citation]:
-    seen = set()
-    citations = []
+def _open_text(path: Path) -> AbstractContextManager[IO[str]]:
+    return atomic_open(path, "w", encoding="utf-8", buffering=_WRITE_BUFFER)
+
+
+@dataclass
+class RunIndex:
+    """Citation lookups shared by the writers, built in one pass over the state."""
+
+    citations: dict[str, Citation]
+    # Cited IDs in order of first use, including unknown ones.
+    used_ids: list[str]
+
+    @property
+    def used_citations(self) -> list[Citation]:
+        return [self.citations[cid] for cid in self.used_ids if cid in self.citations]
+
+
+def build_run_index(state: DebateState) -> RunIndex:
+    citations: dict[str, Citation] = {}
     for profile in state.get("profiles", {}).values():
         for c in profile.all_citations():
-            if c.id and c.id not in seen:
-                seen.add(c.id)
-                citations.append(c)
-    return citations
+            if c.id and c.id not in citations:
+                citations[c.id] = c
+    used: dict[str, None] = {}
+    for msg in state.get("messages", []):
+        used.update(dict.fromkeys(msg.references_used))
+    return RunIndex(citations=citations, used_ids=list(used))
+
+
+def collect_all_citations(state: DebateState) -> list[Citation]:
+    return list(build_run_index(state).citations.values())
 
 
 def collect_used_citations(state: DebateState) -> list[Citation]:
-    cite_index = build_citation_index(state)
-    used_ids = set()
-    for msg in state.get("messages", []):
-        for cid in msg.references_used:
-            used_ids.add(cid)
-    citations = []
-    for cid in used_ids:
-        if cid in cite_index:
-            citations.append(cite_index[cid])
-    return citations
+    return build_run_index(state).used_citations
 
 
 def build_citation_index(state: DebateState) -> dict[str, Citation]:
-    return {c.id: c for c in collect_all_citations(state)}
+    return build_run_index(state).citations
 
 
-def save_sources(state: DebateState, run_dir: Path) -> Path:
-    path = run_dir / "sources.json"
-    citations = collect_used_citations(state)
-    data = [c.model_dump(mode="json") for c in citations]
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2, default=str)
-    return path
+def save_sources(state: DebateState, run_dir: Path, index: RunIndex | None = None) -> Path:
+    index = index or build_run_index(state)
+    return _write_json(run_dir / "sources.json", index.used_citations)
 
 
-def save_transcript(state: DebateState, run_dir: Path) -> Path:
+def save_transcript(state: DebateState, run_dir: Path, index: RunIndex | None = None) -> Path:
     path = run_dir / "transcript.md"
-    cite_index = build_citation_index(state)
-    
-    lines = [f"# Debate Transcript\n\n**Scenario**: {state['scenario'].name}\n"]
-    
-    for msg in state.get("messages", []):
-        lines.append(f"\n## Round {msg.round_number} - {msg.country}\n")
-        statement = msg.public_statement
-        if msg.is_truncated:
-            note = msg.truncation_note or "Statement truncated"
-            statement = f"{statement}\n\n[Truncation: {note}]"
-        lines.append(f"\n{statement}\n")
-        
-        refs = []
-        for cid in msg.references_used:
-            if cid in cite_index:
-                refs.append(f"[{cid}]")
+    index = index or build_run_index(state)
+    cite_index = index.citations
+
+    with _open_text(path) as f:
+        f.write(f"# Debate Transcript\n\n**Scenario**: {state['scenario'].name}\n")
+        for msg in state.get("messages", []):
+            f.write(f"\n## Round {msg.round_number} - {msg.country}\n")
+            statement = msg.public_statement
+            if msg.is_truncated:
+                note = msg.truncation_note or "Statement truncated"
+                statement = f"{statement}\n\n[Truncation: {note}]"
+            f.write(f"\n{statement}\n")
+
+            refs = [f"[{cid}]" if cid in cite_index else f"[{cid}?]" for cid in msg.references_used]
+            sources_line = ", ".join(refs) if refs else "(none)"
+            f.write(f"\n*Sources: {sources_line}*\n")
+
+            if msg.proposed_clauses:
+                f.write("\n**Proposed Clauses:**\n")
+                for clause in msg.proposed_clauses:
+                    f.write(f"- {clause.text}\n")
+
+        f.write("\n---\n\n## References\n\n")
+        for cid in index.used_ids:
+            c = cite_index.get(cid)
+            if c:
+                f.write(f"- [{cid}] {c.title} ({c.url})\n")
             else:
-                refs.append(f"[{cid}?]")
-        sources_line = ", ".join(refs) if refs else "(none)"
-        lines.append(f"\n*Sources: {sources_line}*\n")
-        
-        if msg.proposed_clauses:
-            lines.append("\n**Proposed Clauses:**\n")
-            for clause in msg.proposed_clauses:
-                lines.append(f"- {clause.text}\n")
-    
-    lines.append("\n---\n\n## References\n\n")
-    used_ids = []
-    for msg in state.get("messages", []):
-        for cid in msg.references_used:
-            if cid not in used_ids:
-                used_ids.append(cid)
-    for cid in used_ids:
-        c = cite_index.get(cid)
-        if c:
-            lines.append(f"- [{cid}] {c.title} ({c.url})\n")
-        else:
-            lines.append(f"- [{cid}] Unknown source\n")
-    
-    with open(path, "w") as f:
-        f.writelines(lines)
+                f.write(f"- [{cid}] Unknown source\n")
     return path
 
 
@@ -140,31 +177,20 @@ def save_treaty(state: DebateState, run_dir: Path) -> Path:
         else:
             lines.append("*No treaty was finalized.*\n")
     
-    with open(path, "w") as f:
+    with _open_text(path) as f:
         f.writelines(lines)
     return path
 
 
 def save_scorecards(state: DebateState, run_dir: Path) -> Path:
-    path = run_dir / "scorecards.json"
-    scorecards = state.get("scorecards", [])
-    data = [s.model_dump(mode="json") for s in scorecards]
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2, default=str)
-    return path
+    return _write_json(run_dir / "scorecards.json", state.get("scorecards", []))
 
 
 def save_audit(state: DebateState, run_dir: Path) -> Path:
-    path = run_dir / "audit.json"
-    audit = state.get("audit", [])
-    data = [a.model_dump(mode="json") for a in audit]
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2, default=str)
-    return path
+    return _write_json(run_dir / "audit.json", state.get("audit", []))
 
 
 def save_clause_ledger(state: DebateState, run_dir: Path) -> Path:
-    path = run_dir / "clauses.json"
     treaty = state.get("treaty")
     clauses = treaty.clauses if treaty else []
     data = []
@@ -181,18 +207,16 @@ def save_clause_ledger(state: DebateState, run_dir: Path) -> Path:
             "amendments": list(c.amendments),
             "supersedes": c.supersedes,
         })
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2, default=str)
-    return path
+    return _write_json(run_dir / "clauses.json", data)
 
 
-def save_summary(state: DebateState, run_dir: Path) -> Path:
+def save_summary(state: DebateState, run_dir: Path, index: RunIndex | None = None) -> Path:
     path = run_dir / "summary.md"
     scenario = state["scenario"]
     scorecards = state.get("scorecards", [])
     audit = state.get("audit", [])
     treaty = state.get("treaty")
-    citations = collect_used_citations(state)
+    citations = (index or build_run_index(state)).used_citations
     
     lines = ["# Debate Summary\n\n"]
     lines.append(f"**Scenario**: {scenario.name}\n\n")
@@ -218,19 +242,50 @@ def save_summary(state: DebateState, run_dir: Path) -> Path:
             if finding.evidence:
                 lines.append(f"  - Evidence: {', '.join(finding.evidence[:2])}\n")
     
-    with open(path, "w") as f:
+    with _open_text(path) as f:
         f.writelines(lines)
     return path
 
 
-def save_all_outputs(state: DebateState, run_dir: Path) -> dict[str, Path]:
-    return {
-        "state": save_state_snapshot(state, run_dir),
-        "sources": save_sources(state, run_dir),
-        "transcript": save_transcript(state, run_dir),
-        "treaty": save_treaty(state, run_dir),
-        "scorecards": save_scorecards(state, run_dir),
-        "audit": save_audit(state, run_dir),
-        "clauses": save_clause_ledger(state, run_dir),
-        "summary": save_summary(state, run_dir),
+def save_metrics(metrics: MetricsRecorder, run_dir: Path) -> Path:
+    return _write_json(run_dir / "metrics.json", metrics.to_dict())
+
+
+def _timed(write: Callable[[], Path]) -> tuple[Path, float]:
+    start = time.perf_counter()
+    path = write()
+    return path, time.perf_counter() - start
+
+
+def save_all_outputs(
+    state: DebateState,
+    run_dir: Path,
+    metrics: MetricsRecorder | None = None,
+) -> dict[str, Path]:
+    """Write every run artifact; ``metrics`` defaults to the active recorder."""
+    if metrics is None:
+        metrics = current_recorder()
+    index = build_run_index(state)
+    writers: dict[str, Callable[[], Path]] = {
+        "state": functools.partial(save_state_snapshot, state, run_dir),
+        "sources": functools.partial(save_sources, state, run_dir, index),
+        "transcript": functools.partial(save_transcript, state, run_dir, index),
+        "treaty": functools.partial(save_treaty, state, run_dir),
+        "scorecards": functools.partial(save_scorecards, state, run_dir),
+        "audit": functools.partial(save_audit, state, run_dir),
+        "clauses": functools.partial(save_clause_ledger, state, run_dir),
+        "summary": functools.partial(save_summary, state, run_dir, index),
     }
+    with ThreadPoolExecutor(max_workers=_WRITE_WORKERS, thread_name_prefix="madd-write") as pool:
+        futures = {name: pool.submit(_timed, write) for name, write in writers.items()}
+        outputs = {}
+        for name, future in futures.items():
+            path, seconds = future.result()
+            outputs[name] = path
+            size = path.stat().st_size
+            logger.debug(f"Wrote {path.name} ({size} bytes) in {seconds * 1000:.1f} ms")
+            if metrics is not None:
+                metrics.add_artifact(name, seconds, size)
+    if metrics is not None:
+        outputs["metrics"] = save_metrics(metrics, run_dir)
+    return outputs
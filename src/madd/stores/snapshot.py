@@ -0,0 +1,177 @@
+"""Compact final-state snapshots with shared, content-addressed profiles.
+
+``state.json.gz`` holds a run's final ``DebateState`` as gzip-compressed
+JSON without the country profiles. Each profile is stored once, named by
+the SHA-256 of its JSON, in a blob directory shared by the runs of an
+archive (``<output-dir>/_profiles`` by default), and the snapshot only
+references the hash. Runs that reuse cached profiles therefore add a few
+kilobytes instead of a copy of every profile and its citations.
+
+``load_state_snapshot`` returns a ``SnapshotState`` mapping that decodes a
+key into typed objects only when it is first read, so a query touching
+``scorecards`` never builds the messages or loads a profile. Snapshots
+written before this format (plain ``state.json``) load the same way.
+
+Blobs outlive the runs that wrote them; ``prune_profile_blobs`` (``madd runs
+prune``) deletes the ones no snapshot references any more.
+"""
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+from pydantic_core import to_json
+
+from madd.core.schemas import CountryProfile
+from madd.core.state import DebateState, decode_state_value
+from madd.stores.atomic import write_bytes_atomic
+
+SNAPSHOT_FORMAT = "madd-snapshot/1"
+PROFILE_BLOB_DIRNAME = "_profiles"
+_COMPRESS_LEVEL = 6
+
+
+def profile_blob_dir(run_dir: Path) -> Path:
+    return Path(run_dir).parent / PROFILE_BLOB_DIRNAME
+
+
+def _write_gzip(path: Path, data: bytes) -> None:
+    # mtime=0 keeps the bytes reproducible.
+    write_bytes_atomic(path, gzip.compress(data, compresslevel=_COMPRESS_LEVEL, mtime=0))
+
+
+def save_profile_blob(profile: CountryProfile, blob_dir: Path) -> str:
+    """Store ``profile`` under its content hash (once) and return the hash."""
+    raw = to_json(profile)
+    digest = hashlib.sha256(raw).hexdigest()
+    path = blob_dir / f"{digest}.json.gz"
+    if not path.exists():
+        blob_dir.mkdir(parents=True, exist_ok=True)
+        _write_gzip(path, raw)
+    return digest
+
+
+def load_profile_blob(blob_dir: Path, digest: str) -> CountryProfile:
+    """Load the profile stored under ``digest``; a blob whose content does not match it raises."""
+    path = blob_dir / f"{digest}.json.gz"
+    with gzip.open(path, "rb") as f:
+        raw = f.read()
+    if hashlib.sha256(raw).hexdigest() != digest:
+        raise ValueError(f"Profile blob {path} does not match its hash")
+    return CountryProfile.model_validate_json(raw)
+
+
+def save_state_snapshot(
+    state: DebateState,
+    run_dir: Path,
+    label: str = "state",
+    blob_dir: Path | None = None,
+) -> Path:
+    blob_dir = Path(blob_dir) if blob_dir is not None else profile_blob_dir(run_dir)
+    refs = {
+        country: save_profile_blob(profile, blob_dir)
+        for country, profile in state.get("profiles", {}).items()
+    }
+    payload = {
+        "format": SNAPSHOT_FORMAT,
+        "profile_dir": os.path.relpath(blob_dir, run_dir),
+        "profiles": refs,
+        "state": {key: value for key, value in state.items() if key != "profiles"},
+    }
+    path = Path(run_dir) / f"{label}.json.gz"
+    _write_gzip(path, to_json(payload, fallback=str))
+    return path
+
+
+class SnapshotState(Mapping[str, Any]):
+    """Read-only ``DebateState`` view that decodes each key on first access."""
+
+    def __init__(self, raw: dict[str, Any], profile_refs: dict[str, str] | None = None, blob_dir: Path | None = None):
+        if profile_refs is not None and blob_dir is None:
+            raise ValueError("profile_refs need the blob_dir holding the profiles")
+        self._raw = raw
+        self._profile_refs = profile_refs
+        self._blob_dir = blob_dir
+        self._decoded: dict[str, Any] = {}
+
+    def _keys(self) -> list[str]:
+        keys = list(self._raw)
+        if self._profile_refs is not None and "profiles" not in self._raw:
+            keys.append("profiles")
+        return keys
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._decoded:
+            if key == "profiles" and self._profile_refs is not None and self._blob_dir is not None:
+                blob_dir = self._blob_dir
+                self._decoded[key] = {
+                    country: load_profile_blob(blob_dir, digest)
+                    for country, digest in self._profile_refs.items()
+                }
+            else:
+                self._decoded[key] = decode_state_value(key, self._raw[key])
+        return self._decoded[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def profile_refs(self) -> dict[str, str]:
+        """Country to profile hash, without loading the profiles."""
+        return dict(self._profile_refs or {})
+
+
+def load_state_snapshot(path: Path) -> SnapshotState:
+    """Open a ``state.json.gz`` snapshot, or a plain ``state.json`` from older runs."""
+    path = Path(path)
+    if path.suffix == ".gz":
+        with gzip.open(path, "rb") as f:
+            payload = json.load(f)
+        if payload.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} is not a {SNAPSHOT_FORMAT} snapshot")
+        blob_dir = (path.parent / payload["profile_dir"]).resolve()
+        return SnapshotState(payload["state"], payload["profiles"], blob_dir)
+    with open(path, encoding="utf-8") as f:
+        return SnapshotState(json.load(f))
+
+
+def _snapshot_refs(path: Path) -> tuple[Path, set[str]]:
+    """The blob directory and profile hashes a ``state.json.gz`` refers to."""
+    with gzip.open(path, "rb") as f:
+        payload = json.load(f)
+    return (path.parent / payload["profile_dir"]).resolve(), set(payload.get("profiles", {}).values())
+
+
+def prune_profile_blobs(root: Path, *, min_age: float = 3600.0, dry_run: bool = False) -> list[Path]:
+    """Delete the profile blobs under ``root`` that no snapshot under ``root`` references.
+
+    Blobs modified less than ``min_age`` seconds ago are kept, since a run
+    writes its blobs before its snapshot. Returns the deleted (or, with
+    ``dry_run``, the deletable) paths.
+    """
+    root = Path(root)
+    referenced: dict[Path, set[str]] = {}
+    for path in root.rglob("state.json.gz"):
+        try:
+            blob_dir, digests = _snapshot_refs(path)
+        except (OSError, ValueError, KeyError) as err:
+            # Without its references every blob could look unused.
+            raise ValueError(f"Cannot read {path}, not pruning: {err}") from err
+        referenced.setdefault(blob_dir, set()).update(digests)
+    cutoff = time.time() - min_age
+    pruned = []
+    for blob_dir in root.rglob(PROFILE_BLOB_DIRNAME):
+        keep = referenced.get(blob_dir.resolve(), set())
+        for blob in blob_dir.glob("*.json.gz"):
+            if blob.name.removesuffix(".json.gz") in keep or blob.stat().st_mtime > cutoff:
+                continue
+            if not dry_run:
+                blob.unlink(missing_ok=True)
+            pruned.append(blob)
+    return sorted(pruned)
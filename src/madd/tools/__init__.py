@@ -1,3 +1,21 @@
-from madd.tools.web_search import web_search, search_country_info
+from typing import TYPE_CHECKING
 
-__all__ = ["web_search", "search_country_info"]
+from madd._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from madd.tools.web_search import (
+        search_country_info,
+        web_search,
+    )
+
+_EXPORTS = {
+    "web_search": "madd.tools.web_search",
+    "search_country_info": "madd.tools.web_search",
+}
+
+__all__ = [
+    "web_search",
+    "search_country_info",
+]
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
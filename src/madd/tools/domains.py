@@ -0,0 +1,13 @@
+"""Default search domain allow-lists per research area.
+
+Kept free of client imports so the scenario router can use them without
+loading the search and model SDKs.
+"""
+
+DEFAULT_LAW_DOMAINS = ["un.org", "icj-cij.org", "itlos.org", "pca-cpa.org"]
+DEFAULT_SECURITY_DOMAINS = ["nato.int", "state.gov", "defense.gov", "gov.uk", "europa.eu", "un.org"]
+DEFAULT_ECON_DOMAINS = ["worldbank.org", "imf.org", "oecd.org", "data.worldbank.org"]
+DEFAULT_ENV_DOMAINS = ["unep.org", "ipcc.ch", "un.org"]
+DEFAULT_RIGHTS_DOMAINS = ["ohchr.org", "ilo.org", "un.org", "icrc.org"]
+
+DEFAULT_ECONOMIC_DOMAINS = DEFAULT_ECON_DOMAINS
@@ -0,0 +1,43 @@
+import contextvars
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from madd.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ResearchScheduler:
+    """Process-wide pool for research searches.
+
+    Every search submitted here shares one global concurrency limit; request
+    rates are left to the rate-limit scheduler's search lane, which every web
+    search passes through. Tasks never wait on other tasks,
+    so callers may fan out from their own worker threads without deadlocking.
+    Tasks run in a copy of the submitter's context, keeping its metric labels.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="madd-research",
+        )
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future[T]:
+        return self._pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+@lru_cache
+def get_research_scheduler() -> ResearchScheduler:
+    settings = get_settings()
+    logger.debug("Research scheduler concurrency=%s", settings.research_concurrency)
+    return ResearchScheduler(max_concurrency=settings.research_concurrency)
@@ -0,0 +1,191 @@
+"""SQLite-backed cache for web search results.
+
+All queries live in one WAL-mode database with an index on last access, so
+lookups avoid per-query files and eviction is a single indexed delete.
+Citations are stored as one JSON array and validated in a single pass on hit.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from pydantic import TypeAdapter
+
+from madd.core.config import get_settings
+from madd.core.schemas import Citation
+
+logger = logging.getLogger(__name__)
+
+_CITATIONS = TypeAdapter(list[Citation])
+
+DB_FILENAME = "search_cache.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    citations TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS search_cache_accessed ON search_cache (accessed_at);
+"""
+
+
+class SearchCache:
+    """Single-file search cache with TTL expiry and LRU eviction.
+
+    ``ttl_seconds`` and ``max_entries`` of 0 disable expiry and eviction.
+    """
+
+    def __init__(self, path: str | Path, ttl_seconds: float = 0, max_entries: int = 0):
+        self.path = Path(path)
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self.max_entries = max(0, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.lookup_seconds = 0.0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path,
+            timeout=30.0,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> tuple[str, list[Citation]] | None:
+        start = time.perf_counter()
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, citations, created_at FROM search_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row and self.ttl_seconds and now - row[2] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self.expired += 1
+                row = None
+            if row:
+                self._conn.execute(
+                    "UPDATE search_cache SET accessed_at = ? WHERE key = ?",
+                    (now, key),
+                )
+        result = None
+        if row:
+            try:
+                result = (row[0], _CITATIONS.validate_json(row[1]))
+            except ValueError:
+                logger.debug(f"Dropping unreadable search cache entry {key}")
+                self.delete(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            self.lookup_seconds += time.perf_counter() - start
+        return result
+
+    def put(self, key: str, text: str, citations: list[Citation]) -> None:
+        payload = _CITATIONS.dump_json(citations).decode("utf-8")
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, text, citations, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, text, payload, now, now),
+            )
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+
+    def _evict(self) -> None:
+        if not self.max_entries:
+            return
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM search_cache WHERE key IN "
+                "(SELECT key FROM search_cache ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+
+    def import_json_dir(self, cache_dir: str | Path) -> int:
+        """Bulk-import a legacy one-JSON-file-per-query cache directory.
+
+        Existing rows win over imported files. Returns the number of rows added.
+        """
+        rows = []
+        for path in Path(cache_dir).glob("*.json"):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                c_raw = data.get("citations") or []
+                if not isinstance(c_raw, list):
+                    c_raw = []
+                citations = _CITATIONS.validate_python([c for c in c_raw if c])
+                mtime = path.stat().st_mtime
+            except Exception:
+                continue
+            rows.append((
+                path.stem,
+                data.get("text", "") or "",
+                _CITATIONS.dump_json(citations).decode("utf-8"),
+                mtime,
+                mtime,
+            ))
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO search_cache (key, text, citations, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute("COMMIT")
+            added = self._conn.total_changes - before
+            self._evict()
+        return added
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "lookups": lookups,
+                "avg_lookup_ms": (self.lookup_seconds / lookups * 1000) if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache
+def get_search_cache() -> SearchCache:
+    settings = get_settings()
+    cache_dir = Path(settings.search_cache_dir)
+    db_path = cache_dir / DB_FILENAME
+    is_new = not db_path.exists()
+    cache = SearchCache(
+        db_path,
+        ttl_seconds=settings.search_cache_ttl_hours * 3600,
+        max_entries=settings.search_cache_max_entries,
+    )
+    if is_new:
+        imported = cache.import_json_dir(cache_dir)
+        if imported:
+            logger.info(f"Imported {imported} legacy search cache entries into {db_path}")
+    return cache
@@ -1,26 +1,27 @@
 import hashlib
-import json
 import logging
 from datetime import datetime, timezone
-from pathlib import Path
 from urllib.parse import urlparse
 
-from openai import OpenAI
-
 from madd.core.config import get_settings
+from madd.core.history import estimate_tokens
+from madd.core.llm import get_openai_client, llm_slot, record_token_usage
+from madd.core.metrics import CallRecord, note_usage, record_call
+from madd.core.scheduler import SEARCH_TOKEN_ESTIMATE, get_scheduler
 from madd.core.schemas import Citation
+from madd.stores.response_cache import LLMCacheMiss
+from madd.tools.domains import (
+    DEFAULT_ECON_DOMAINS,
+    DEFAULT_ECONOMIC_DOMAINS,  # noqa: F401  (re-exported)
+    DEFAULT_ENV_DOMAINS,
+    DEFAULT_LAW_DOMAINS,
+    DEFAULT_RIGHTS_DOMAINS,
+    DEFAULT_SECURITY_DOMAINS,
+)
+from madd.tools.search_cache import get_search_cache
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_LAW_DOMAINS = ["un.org", "icj-cij.org", "itlos.org", "pca-cpa.org"]
-DEFAULT_SECURITY_DOMAINS = ["nato.int", "state.gov", "defense.gov", "gov.uk", "europa.eu", "un.org"]
-DEFAULT_ECON_DOMAINS = ["worldbank.org", "imf.org", "oecd.org", "data.worldbank.org"]
-DEFAULT_ENV_DOMAINS = ["unep.org", "ipcc.ch", "un.org"]
-DEFAULT_RIGHTS_DOMAINS = ["ohchr.org", "ilo.org", "un.org", "icrc.org"]
-
-DEFAULT_ECONOMIC_DOMAINS = DEFAULT_ECON_DOMAINS
-
-
 def _citation_id_from_url(url: str) -> str:
     return f"cite_{hashlib.sha256(url.encode()).hexdigest()[:10]}"
 
@@ -55,36 +56,21 @@ def _load_cache(cache_key: str, max_results: int) -> dict | None:
     settings = get_settings()
     if not settings.search_cache_enabled:
         return None
-    cache_path = Path(settings.search_cache_dir) / f"{cache_key}.json"
-    if cache_path.exists():
-        try:
-            with open(cache_path) as f:
-                data = json.load(f)
-                c_raw = data.get("citations") or []
-                if not isinstance(c_raw, list):
-                    c_raw = []
-                citations = [Citation.model_validate(c) for c in c_raw if c]
-                return {
-                    "text": data.get("text", "") or "",
-                    "citations": citations[:max_results],
-                }
-        except Exception:
-            return None
-    return None
+    cached = get_search_cache().get(cache_key)
+    if cached is None:
+        return None
+    text, citations = cached
+    return {
+        "text": text,
+        "citations": citations[:max_results],
+    }
 
 
 def _save_cache(cache_key: str, text: str, citations: list[Citation]) -> None:
     settings = get_settings()
     if not settings.search_cache_enabled:
         return
-    cache_dir = Path(settings.search_cache_dir)
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    cache_path = cache_dir / f"{cache_key}.json"
-    with open(cache_path, "w") as f:
-        json.dump({
-            "text": text,
-            "citations": [c.model_dump(mode="json") for c in citations],
-        }, f)
+    get_search_cache().put(cache_key, text, citations)
 
 
 def _parse_sources_from_response(response, topic: str | None, now: datetime) -> list[Citation]:
@@ -177,6 +163,20 @@ def web_search(
     user_location: str | None = None,
     topic: str | None = None,
     use_cache: bool = True,
+) -> tuple[str, list[Citation]]:
+    settings = get_settings()
+    with record_call("search", settings.search_model) as record:
+        return _web_search(query, max_results, allowed_domains, user_location, topic, use_cache, record)
+
+
+def _web_search(
+    query: str,
+    max_results: int,
+    allowed_domains: list[str] | None,
+    user_location: str | None,
+    topic: str | None,
+    use_cache: bool,
+    record: CallRecord,
 ) -> tuple[str, list[Citation]]:
     cache_key = _cache_key(query, allowed_domains, user_location)
     
@@ -188,10 +188,14 @@ def web_search(
             if not text and citations:
                 text = _synthesize_text_from_citations(citations)
             logger.debug(f"Cache hit for query: {query[:50]}...")
+            record.cached = True
             return text, citations
     
     settings = get_settings()
-    client = OpenAI(api_key=settings.openai_api_key)
+    if settings.llm_cache_mode == "replay":
+        # Replays must not make live (billed) searches any more than model calls.
+        raise LLMCacheMiss(f"No cached search result for {query[:50]!r} ({cache_key})")
+    client = get_openai_client()
     
     tool_config: dict = {"type": "web_search"}
     if allowed_domains:
@@ -199,17 +203,30 @@ def web_search(
     if user_location:
         tool_config["user_location"] = {"type": "approximate", "country": user_location}
     
+    scheduler = get_scheduler()
     try:
-        response = client.responses.create(
-            model=settings.search_model,
-            tools=[tool_config],
-            input=query,
-            include=["web_search_call.action.sources"],
-        )
+        with scheduler.reserve(
+            settings.search_model, "search", estimate_tokens(query) + SEARCH_TOKEN_ESTIMATE
+        ) as reservation, llm_slot():
+            response = client.responses.create(
+                model=settings.search_model,
+                tools=[tool_config],
+                input=query,
+                include=["web_search_call.action.sources"],
+            )
     except Exception as e:
         logger.warning(f"Web search failed: {e}")
+        record.error = f"{type(e).__name__}: {e}"
         return "", []
     
+    usage = getattr(response, "usage", None)
+    input_tokens = getattr(usage, "input_tokens", None)
+    output_tokens = getattr(usage, "output_tokens", None)
+    if isinstance(input_tokens, int) and isinstance(output_tokens, int):
+        record_token_usage(settings.search_model, input_tokens, output_tokens)
+        note_usage(input_tokens, output_tokens)
+        reservation.settle(input_tokens + output_tokens)
+    
     now = datetime.now(timezone.utc)
     citations = _parse_sources_from_response(response, topic, now)
     text_content = _extract_text_from_response(response)
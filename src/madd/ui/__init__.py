@@ -1,5 +1,18 @@
 """UI helpers for Multi-Agent Diplomatic Debate."""
 
-from .web import run_scenario_from_yaml_text
+from typing import TYPE_CHECKING
 
-__all__ = ["run_scenario_from_yaml_text"]
+from madd._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from madd.ui.web import run_scenario_from_yaml_text
+
+_EXPORTS = {
+    "run_scenario_from_yaml_text": "madd.ui.web",
+}
+
+__all__ = [
+    "run_scenario_from_yaml_text",
+]
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
@@ -0,0 +1,214 @@
+"""Background debate jobs for the web UI.
+
+Submitting a run returns a ``Job`` immediately; runs execute on a bounded
+thread pool and record their progress (current node and round) and every
+streamed event, so any number of clients can poll a job's status or follow
+its event log while it runs.
+
+Events carry increasing IDs so a client can resume after a given event.
+Once a node finishes, the statement deltas streamed during it are merged
+into one full-text ``statement`` event per turn (marked ``"replace": true``),
+so the log grows with the number of turns, not the number of deltas.
+"""
+import bisect
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+TERMINAL_STATUSES = ("done", "failed")
+
+# ``(id, kind, data)``
+JobEvent = tuple[int, str, dict]
+
+
+@dataclass
+class Job:
+    id: str
+    status: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    run_id: str | None = None
+    scenario_name: str | None = None
+    node: str | None = None
+    round: int | None = None
+    outputs: dict[str, str] = field(default_factory=dict)
+    summary: str = ""
+    error: str | None = None
+    trace: str = ""
+    events: list[JobEvent] = field(default_factory=list)
+    _last_event_id: int = field(default=0, repr=False)
+    # Index in ``events`` of the first statement delta not merged yet.
+    _unmerged_from: int | None = field(default=None, repr=False)
+    _changed: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def record(self, kind: str, data: dict) -> None:
+        """Append an event and update progress; wakes clients following the job.
+
+        A ``"done"`` or ``"failed"`` event also finishes the job.
+        """
+        with self._changed:
+            if kind in TERMINAL_STATUSES:
+                self.finished_at = time.time()
+                self.status = kind
+            elif kind == "run":
+                self.run_id = data.get("run_id")
+            elif kind == "node":
+                self.node = data.get("node")
+                if data.get("round") is not None:
+                    self.round = data["round"]
+            if kind == "statement":
+                if self._unmerged_from is None:
+                    self._unmerged_from = len(self.events)
+            else:
+                self._merge_statements()
+            self._last_event_id += 1
+            self.events.append((self._last_event_id, kind, data))
+            self._changed.notify_all()
+
+    def _merge_statements(self) -> None:
+        """Replace the pending statement deltas with one event per turn. Caller holds the lock.
+
+        Each merged event takes the ID of its turn's last delta: a client that
+        saw that delta already has the whole text, and one that stopped before
+        it gets the full text with ``replace`` set.
+        """
+        if self._unmerged_from is None:
+            return
+        turns: dict[tuple, list] = {}
+        for event_id, _kind, data in self.events[self._unmerged_from:]:
+            key = (data.get("country"), data.get("round"))
+            merged = turns.setdefault(key, [event_id, data.get("text", "")])
+            if merged[0] != event_id:
+                merged[0] = event_id
+                merged[1] += data.get("text", "")
+        self.events[self._unmerged_from:] = sorted(
+            (event_id, "statement", {"country": country, "round": round_, "text": text, "replace": True})
+            for (country, round_), (event_id, text) in turns.items()
+        )
+        self._unmerged_from = None
+
+    def follow(self, timeout: float = 15.0, after: int = 0) -> Iterator[JobEvent | None]:
+        """Yield the events with an ID above ``after`` until the job finishes.
+
+        Yields ``None`` when no event arrived for ``timeout`` seconds, so
+        callers can send keep-alives.
+        """
+        sent = after
+        while True:
+            with self._changed:
+                if sent >= self._last_event_id and not self.finished:
+                    self._changed.wait(timeout)
+                start = bisect.bisect_right(self.events, sent, key=lambda event: event[0])
+                pending = self.events[start:]
+                done = self.finished
+            if pending:
+                sent = pending[-1][0]
+            elif not done:
+                yield None
+            yield from pending
+            if done and sent >= self._last_event_id:
+                return
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "run_id": self.run_id,
+            "scenario_name": self.scenario_name,
+            "node": self.node,
+            "round": self.round,
+            "outputs": self.outputs,
+            "summary": self.summary,
+            "error": self.error,
+        }
+
+
+def _read_preview(path: Path, *, limit: int = 8000) -> str:
+    if not path.exists():
+        return "Missing output file."
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return "Unable to read output file."
+    text = text.strip()
+    if len(text) <= limit:
+        return text
+    return text[: limit - 20].rstrip() + "\n\n... (truncated)"
+
+
+RunFn = Callable[..., Any]
+
+
+class JobQueue:
+    """Runs debates on ``workers`` threads; keeps the latest ``history`` jobs."""
+
+    def __init__(self, run: RunFn, *, workers: int = 2, history: int = 100):
+        self._run = run
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="madd-job")
+        self._history = history
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+
+    def submit(self, yaml_text: str, *, output_dir: Path, rounds: int | None = None, resume: str | None = None) -> Job:
+        job = Job(id=uuid.uuid4().hex[:12])
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._pool.submit(self._execute, job, yaml_text, output_dir, rounds, resume)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> list[Job]:
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(self._jobs) - self._history)]:
+            del self._jobs[job_id]
+
+    def _execute(self, job: Job, yaml_text: str, output_dir: Path, rounds: int | None, resume: str | None) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            result = self._run(
+                yaml_text,
+                output_dir=output_dir,
+                rounds=rounds,
+                resume=resume,
+                on_event=job.record,
+            )
+        except Exception as err:
+            job.error = f"Run failed: {err}"
+            job.trace = traceback.format_exc()
+            job.record("failed", {"message": job.error, "trace": job.trace})
+            return
+        job.scenario_name = result.scenario.name
+        job.outputs = {
+            name: f"/runs/{result.run_dir.name}/{path.name}"
+            for name, path in result.outputs.items()
+        }
+        summary = result.outputs.get("summary")
+        job.summary = _read_preview(summary) if summary else ""
+        job.record("done", {"run_id": result.run_dir.name, "outputs": job.outputs, "summary": job.summary})
@@ -1,20 +1,37 @@
 import argparse
+import json
 import re
 import textwrap
-import traceback
-from dataclasses import dataclass
+import threading
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
 from html import escape
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Any
 from urllib.parse import parse_qs, urlparse
 
-from madd.core.graph import build_graph
+from madd._lazy import lazy_function
+from madd.core.metrics import collect_metrics
 from madd.core.scenario import Scenario, load_scenario_from_text
 from madd.core.state import create_initial_state
+from madd.core.streaming import stream_statements
+from madd.stores.catalog import try_index_run
+from madd.stores.checkpoint_store import (
+    checkpoint_config,
+    load_checkpoint_state,
+    open_checkpointer,
+    resolve_run_dir,
+)
+from madd.stores.journal import journaled_updates, open_journal, replay_journal
 from madd.stores.run_store import create_run_dir, save_all_outputs
+from madd.ui.jobs import Job, JobQueue
+
+# LangGraph is only needed once a run starts, not to serve the studio.
+build_graph = lazy_function("madd.core.graph", "build_graph")
 
 ALLOWED_EXTENSIONS = {
+    "gz",
     "json",
     "md",
     "txt",
@@ -35,36 +52,49 @@ def run_scenario_from_yaml_text(
     *,
     output_dir: Path | str = "output",
     rounds: int | None = None,
+    resume: str | None = None,
+    on_event: Callable[[str, dict], None] | None = None,
 ) -> DebateRunResult:
-    scenario = load_scenario_from_text(yaml_text)
-    if rounds is not None:
-        scenario = scenario.model_copy(update={"max_rounds": rounds})
-
-    initial_state = create_initial_state(scenario)
-    graph = build_graph()
-    final_state = None
-    for event in graph.stream(initial_state, stream_mode="values"):
-        final_state = event
-
-    if final_state is None:
-        raise RuntimeError("Debate run did not produce a final state")
-
-    run_dir = create_run_dir(str(output_dir))
-    outputs = save_all_outputs(final_state, run_dir)
-    return DebateRunResult(scenario=scenario, run_dir=run_dir, outputs=outputs)
-
-
-def _read_preview(path: Path, *, limit: int = 8000) -> str:
-    if not path.exists():
-        return "Missing output file."
-    try:
-        text = path.read_text(encoding="utf-8")
-    except OSError:
-        return "Unable to read output file."
-    text = text.strip()
-    if len(text) <= limit:
-        return text
-    return text[: limit - 20].rstrip() + "\n\n... (truncated)"
+    """Run a scenario, or continue the checkpointed run ``resume``.
+
+    When resuming, ``yaml_text`` and ``rounds`` are ignored in favour of the
+    checkpointed state. ``on_event(kind, data)`` receives ``"statement"``
+    deltas while turns are generated and a ``"node"`` event per finished node.
+    """
+    if resume:
+        run_dir = resolve_run_dir(output_dir, resume)
+        graph_input = None
+    else:
+        scenario = load_scenario_from_text(yaml_text)
+        if rounds is not None:
+            scenario = scenario.model_copy(update={"max_rounds": rounds})
+        graph_input = create_initial_state(scenario)
+        run_dir = create_run_dir(str(output_dir))
+
+    config = checkpoint_config(run_dir.name)
+    with (
+        collect_metrics() as metrics,
+        open_checkpointer(run_dir) as checkpointer,
+        open_journal(run_dir) as journal,
+    ):
+        graph = build_graph(checkpointer)
+        if resume:
+            load_checkpoint_state(graph, run_dir.name)
+        updates = journaled_updates(graph, graph_input, config, journal)
+        if on_event is None:
+            for _node, _update in updates:
+                pass
+        else:
+            on_event("run", {"run_id": run_dir.name})
+            with stream_statements(lambda delta: on_event("statement", asdict(delta))):
+                for node, update in updates:
+                    round_number = update.get("round") if isinstance(update, dict) else None
+                    on_event("node", {"node": node, "round": round_number})
+    final_state = replay_journal(run_dir)
+
+    outputs = save_all_outputs(final_state, run_dir, metrics)
+    try_index_run(run_dir)
+    return DebateRunResult(scenario=final_state["scenario"], run_dir=run_dir, outputs=outputs)
 
 
 def _file_link(filename: str) -> bool:
@@ -166,7 +196,61 @@ def _html_template(title: str, body: str) -> str:
 </html>"""
 
 
-def _build_index_page() -> str:
+# Follows a job's Server-Sent Events: one <pre> per country turn filled as the
+# statement streams in, then the output links and summary once the run is done.
+# The stream replays the job from its start, so reloading the page is safe, and
+# a reconnect resumes after the last event seen (Last-Event-ID). A failed run
+# is reported as "failed": "error" is the browser's own connection-error event.
+_JOB_PAGE_SCRIPT = """<script>
+(() => {
+  const live = document.getElementById("live");
+  const status = document.getElementById("live-status");
+  const turns = document.getElementById("live-turns");
+  const result = document.getElementById("live-result");
+  const blocks = {};
+  const source = new EventSource(live.dataset.events);
+  const on = (kind, handle) => source.addEventListener(kind, (event) => handle(JSON.parse(event.data)));
+  on("run", (data) => { status.textContent = "Run " + data.run_id; });
+  on("node", (data) => {
+    status.textContent = "Finished " + data.node + (data.round ? " (round " + data.round + ")" : "");
+  });
+  on("statement", (data) => {
+    const key = data.country + "|" + data.round;
+    if (!blocks[key]) {
+      const title = document.createElement("h4");
+      title.textContent = data.country + " - round " + data.round;
+      blocks[key] = document.createElement("pre");
+      turns.append(title, blocks[key]);
+    }
+    blocks[key].textContent = (data.replace ? "" : blocks[key].textContent) + data.text;
+  });
+  on("done", (data) => {
+    source.close();
+    status.textContent = "Run complete: " + data.run_id;
+    for (const [name, url] of Object.entries(data.outputs)) {
+      const link = document.createElement("a");
+      link.href = url;
+      link.target = "_blank";
+      link.textContent = name;
+      result.append(link, " ");
+    }
+    const summary = document.createElement("pre");
+    summary.textContent = data.summary;
+    result.append(summary);
+  });
+  on("failed", (data) => {
+    source.close();
+    status.textContent = data.message;
+    status.className = "pill err";
+    const trace = document.createElement("pre");
+    trace.textContent = data.trace;
+    result.append(trace);
+  });
+})();
+</script>"""
+
+
+def _build_index_page(jobs: list[Job] | None = None) -> str:
     sample_yaml = textwrap.dedent(
         """\
         name: "Greenland Security and Critical Minerals"
@@ -192,10 +276,12 @@ def _build_index_page() -> str:
       <h1>MADD Scenario Studio</h1>
       <p>Paste a scenario YAML below and run a full debate iteration.</p>
       <div class=\"card\">
-        <form method=\"post\" action=\"/run\">
+        <form id=\"run-form\" method=\"post\" action=\"/run\">
           <div class=\"row\">
             <label for=\"rounds\"><strong>Override rounds:</strong></label>
             <input id=\"rounds\" name=\"rounds\" type=\"number\" min=\"1\" max=\"10\" />
+            <label for=\"resume\"><strong>Resume run ID:</strong></label>
+            <input id=\"resume\" name=\"resume\" type=\"text\" placeholder=\"run_...\" />
             <button type=\"submit\">Run Debate</button>
           </div>
           <br />
@@ -203,42 +289,39 @@ def _build_index_page() -> str:
           <textarea id=\"scenario\" name=\"scenario_yaml\">{escape(sample_yaml)}</textarea>
         </form>
       </div>
+      {_build_jobs_card(jobs or [])}
       """
     )
 
 
-def _build_results_page(result: DebateRunResult, *, duration_ms: int | None = None, trace: str = "") -> str:
-    output_links = []
-    for name, path in result.outputs.items():
-        safe_name = escape(str(path.name))
-        run_file = f"/runs/{result.run_dir.name}/{safe_name}"
-        output_links.append(
-            f'<a href="{run_file}" target="_blank" rel="noreferrer">{safe_name} ({escape(name)})</a>'
-        )
-    if not output_links:
-        output_links = ["<span class=\"err\">No files produced.</span>"]
+def _build_jobs_card(jobs: list[Job]) -> str:
+    if not jobs:
+        return ""
+    rows = "".join(
+        f'<div><a href="/jobs/{job.id}">{escape(job.scenario_name or job.run_id or job.id)}</a> '
+        f'<span class="pill">{escape(job.status)}</span></div>'
+        for job in jobs
+    )
+    return f'<div class="card"><h3>Recent runs</h3><div class="files">{rows}</div></div>'
 
+
+def _build_job_page(job: Job) -> str:
     return _html_template(
-        f"Run Complete: {escape(result.scenario.name)}",
+        f"Run {job.id}",
         f"""
-      <h1>Run Complete</h1>
+      <h1>Debate Run</h1>
       <div class=\"card\">
-        <div class=\"pill\">Scenario: {escape(result.scenario.name)}</div>
-        <div class=\"pill\">Countries: {len(result.scenario.countries)}</div>
-        <div class=\"pill\">Rounds: {result.scenario.max_rounds}</div>
-        <div class=\"pill\">Run directory: {escape(result.run_dir.as_posix())}</div>
-        {f'<div class=\"pill\">Time: {duration_ms}ms</div>' if duration_ms else ''}
+        <div class=\"pill\">Job: {escape(job.id)}</div>
+        <div class=\"pill\">Status: <a href=\"/jobs/{job.id}/status\">{escape(job.status)}</a></div>
       </div>
-      <div class=\"card\">
-        <h3>Outputs</h3>
-        <div class=\"files\">{''.join(f'<div>{link}</div>' for link in output_links)}</div>
+      <div class=\"card\" id=\"live\" data-events=\"/jobs/{job.id}/events\">
+        <h3>Live output</h3>
+        <div id=\"live-status\" class=\"pill\">Queued...</div>
+        <div id=\"live-turns\"></div>
+        <div id=\"live-result\"></div>
       </div>
-      <div class=\"card\">
-        <h3>Summary Preview</h3>
-        <pre>{escape(_read_preview(result.outputs['summary']))}</pre>
-      </div>
-      {f'<div class=\"card\"><h3>Error Trace</h3><pre>{escape(trace)}</pre></div>' if trace else ''}
       <p><a href=\"/\">Start another run</a></p>
+      {_JOB_PAGE_SCRIPT}
       """
     )
 
@@ -264,6 +347,15 @@ def _send_html(handler: BaseHTTPRequestHandler, html: str, *, status: int = 200)
     handler.wfile.write(body)
 
 
+def _send_json(handler: BaseHTTPRequestHandler, payload: Any, *, status: int = 200) -> None:
+    body = json.dumps(payload, default=str).encode("utf-8")
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
 def _send_text_file(handler: BaseHTTPRequestHandler, path: Path) -> None:
     try:
         raw = path.read_bytes()
@@ -272,20 +364,66 @@ def _send_text_file(handler: BaseHTTPRequestHandler, path: Path) -> None:
         handler.end_headers()
         return
     handler.send_response(200)
-    handler.send_header("Content-Type", "text/plain; charset=utf-8")
+    if path.suffix == ".gz":
+        # Compressed snapshots are sent as-is; the browser inflates them.
+        inner = Path(path.stem).suffix
+        handler.send_header("Content-Type", "application/json" if inner == ".json" else "application/octet-stream")
+        handler.send_header("Content-Encoding", "gzip")
+    else:
+        handler.send_header("Content-Type", "text/plain; charset=utf-8")
     handler.send_header("Content-Length", str(len(raw)))
     handler.end_headers()
     handler.wfile.write(raw)
 
 
-def _make_handler(output_root: Path):
+class _EventStream:
+    """Writes Server-Sent Events to a response; safe to call from several threads.
+
+    A disconnected client only stops the stream, the run itself continues.
+    """
+
+    def __init__(self, handler: BaseHTTPRequestHandler):
+        self.handler = handler
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def send(self, kind: str, data: dict, event_id: int | None = None) -> None:
+        event_line = f"id: {event_id}\n" if event_id is not None else ""
+        frame = f"{event_line}event: {kind}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+        with self._lock:
+            if self.closed:
+                return
+            try:
+                self.handler.wfile.write(frame)
+                self.handler.wfile.flush()
+            except OSError:
+                self.closed = True
+
+    def keep_alive(self) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            try:
+                self.handler.wfile.write(b": keep-alive\n\n")
+                self.handler.wfile.flush()
+            except OSError:
+                self.closed = True
+
+
+def _make_handler(output_root: Path, jobs: JobQueue):
     output_root = output_root.resolve()
 
     class DebateStudioHandler(BaseHTTPRequestHandler):
         def do_GET(self) -> None:
             parsed = urlparse(self.path)
             if parsed.path == "/":
-                _send_html(self, _build_index_page())
+                _send_html(self, _build_index_page(jobs.list()))
+                return
+            if parsed.path == "/jobs":
+                _send_json(self, [job.to_dict() for job in jobs.list()])
+                return
+            if parsed.path.startswith("/jobs/"):
+                self._get_job(parsed.path.removeprefix("/jobs/"))
                 return
             if parsed.path == "/health":
                 self.send_response(200)
@@ -330,7 +468,11 @@ def _make_handler(output_root: Path):
             body = self.rfile.read(content_length).decode("utf-8")
             data = parse_qs(body, keep_blank_values=True)
             yaml_text = data.get("scenario_yaml", [""])[0]
-            if not yaml_text.strip():
+            resume = data.get("resume", [""])[0].strip() or None
+            if resume and not _file_link(resume):
+                _send_html(self, _build_error_page("Invalid run ID"), status=400)
+                return
+            if not yaml_text.strip() and not resume:
                 _send_html(self, _build_error_page("Scenario YAML is required"), status=400)
                 return
 
@@ -343,21 +485,49 @@ def _make_handler(output_root: Path):
                     _send_html(self, _build_error_page("Invalid value for rounds"), status=400)
                     return
 
-            import time
+            job = jobs.submit(yaml_text, output_dir=output_root, rounds=rounds, resume=resume)
+            self.send_response(303)
+            self.send_header("Location", f"/jobs/{job.id}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
 
-            start = time.time()
-            try:
-                result = run_scenario_from_yaml_text(
-                    yaml_text,
-                    output_dir=output_root,
-                    rounds=rounds,
-                )
-            except Exception as err:
-                trace = traceback.format_exc()
-                _send_html(self, _build_error_page(f"Run failed: {err}", trace=trace), status=500)
+        def _get_job(self, job_path: str) -> None:
+            job_id, _, view = job_path.partition("/")
+            job = jobs.get(job_id) if _file_link(job_id) else None
+            if job is None:
+                self.send_error(404)
                 return
-            elapsed_ms = int((time.time() - start) * 1000)
-            _send_html(self, _build_results_page(result, duration_ms=elapsed_ms))
+            if view == "":
+                _send_html(self, _build_job_page(job))
+            elif view == "status":
+                _send_json(self, job.to_dict())
+            elif view == "events":
+                self._follow_job(job)
+            else:
+                self.send_error(404)
+
+        def _follow_job(self, job: Job) -> None:
+            """Stream the job's events as Server-Sent Events until it finishes.
+
+            A reconnecting client's ``Last-Event-ID`` resumes after that event.
+            """
+            try:
+                after = int(self.headers.get("Last-Event-ID", 0))
+            except ValueError:
+                after = 0
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            events = _EventStream(self)
+            for event in job.follow(after=after):
+                if event is None:
+                    events.keep_alive()
+                else:
+                    event_id, kind, data = event
+                    events.send(kind, data, event_id)
+                if events.closed:
+                    return
 
         def log_message(self, fmt: str, *args: Any) -> None:
             # Keep server quiet unless explicitly debugging.
@@ -388,6 +558,12 @@ def build_parser() -> argparse.ArgumentParser:
         default=Path("output"),
         help="Base output directory",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Number of debate runs executed at the same time",
+    )
     parser.add_argument(
         "--open",
         action="store_true",
@@ -399,8 +575,9 @@ def build_parser() -> argparse.ArgumentParser:
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
-    handler = _make_handler(args.output_dir.resolve())
-    server = HTTPServer((args.host, args.port), handler)
+    jobs = JobQueue(run_scenario_from_yaml_text, workers=args.workers)
+    handler = _make_handler(args.output_dir.resolve(), jobs)
+    server = ThreadingHTTPServer((args.host, args.port), handler)
 
     if args.open:
         import webbrowser
@@ -415,6 +592,7 @@ def main(argv: list[str] | None = None) -> int:
         return 0
     finally:
         server.server_close()
+        jobs.shutdown(wait=False)
     return 0
 
 
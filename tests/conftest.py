@@ -1,8 +1,19 @@
 import os
 import sys
 
+import pytest
+
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
 if project_root not in sys.path:
-    sys.path.insert(0, project_root)
\ No newline at end of file
+    sys.path.insert(0, project_root)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_llm_clients():
+    from madd.core.llm import clear_clients
+
+    clear_clients()
+    yield
+    clear_clients()
@@ -0,0 +1,91 @@
+import json
+
+from madd import batch
+from madd.core.config import get_settings
+from madd.core.schemas import RoundScorecard
+
+
+def _write_manifest(tmp_path, body: str):
+    scenario = tmp_path / "scenario.yaml"
+    scenario.write_text(
+        "name: Test\ndescription: Test scenario\ncountries: [A, B]\nmax_rounds: 3\n",
+        encoding="utf-8",
+    )
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(body, encoding="utf-8")
+    return manifest
+
+
+def test_manifest_expands_overrides_and_repeats(tmp_path):
+    manifest = _write_manifest(tmp_path, """
+runs:
+  - scenario: scenario.yaml
+    rounds: [1, 2]
+    repeat: 2
+    settings:
+      turn_model: m1
+      MADD_TURN_TEMP: [0.3, 0.7]
+""")
+
+    jobs = batch.load_manifest(manifest).jobs
+
+    assert len(jobs) == 8
+    assert jobs[0].scenario == str(tmp_path / "scenario.yaml")
+    assert {j.rounds for j in jobs} == {1, 2}
+    assert {j.settings["MADD_TURN_TEMP"] for j in jobs} == {0.3, 0.7}
+    assert batch._env_name("turn_model") == "MADD_TURN_MODEL"
+
+
+def test_run_batch_in_process_writes_index(monkeypatch, tmp_path):
+    from madd.core import graph as graph_module
+    from madd.core.schemas import Citation, CountryFacts, CountryProfile, DebateMessage
+
+    seen_models = []
+
+    def fake_profile(country, *args, **kwargs):
+        cite = Citation(id="cite_a", title="UNCLOS", url="https://un.org/los")
+        return CountryProfile(facts=CountryFacts(name=country, scenario_citations=[cite]))
+
+    def fake_turn(state, country):
+        seen_models.append(get_settings().turn_model)
+        return DebateMessage(round_number=state["round"], country=country, public_statement="ok")
+
+    monkeypatch.setattr(graph_module, "ensure_profile", fake_profile)
+    monkeypatch.setattr(graph_module, "generate_turn", fake_turn)
+    monkeypatch.setattr(graph_module, "evaluate_round", lambda s: RoundScorecard(round_number=s["round"]))
+    monkeypatch.setattr(graph_module, "verify_claims", lambda s: [])
+    monkeypatch.setattr(graph_module, "refine_treaty", lambda s: "Treaty text")
+    manifest = _write_manifest(tmp_path, """
+runs:
+  - scenario: scenario.yaml
+    rounds: 1
+    settings:
+      turn_model: [m1, m2]
+""")
+
+    index_path = batch.run_batch(manifest, output_dir=tmp_path / "out", workers=1, llm_concurrency=2)
+
+    index = json.loads(index_path.read_text())
+    assert index["totals"]["runs"] == 2
+    assert index["totals"]["ok"] == 2
+    assert [r["run_id"] for r in index["runs"]] == ["run_0000", "run_0001"]
+    assert all((index_path.parent / r["run_id"] / "summary.md").exists() for r in index["runs"])
+    assert seen_models == ["m1", "m1", "m2", "m2"]
+    assert get_settings().turn_model != "m2"
+
+
+def test_plan_batch_totals_jobs_without_running(monkeypatch, tmp_path):
+    monkeypatch.setattr(get_settings(), "profiles_dir", str(tmp_path / "profiles"))
+    manifest = _write_manifest(tmp_path, """
+runs:
+  - scenario: scenario.yaml
+    rounds: [1, 2]
+""")
+
+    plan = batch.plan_batch(manifest)
+
+    assert plan["totals"]["runs"] == 2
+    # The second run reuses the profiles the first one researches.
+    assert plan["runs"][1]["search_calls"] == 0
+    assert plan["totals"]["llm_calls"] == sum(r["llm_calls"] for r in plan["runs"])
+    assert not (tmp_path / "out").exists()
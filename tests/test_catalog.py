@@ -0,0 +1,93 @@
+import json
+from datetime import UTC, datetime, timedelta
+
+from madd import runs
+from madd.core.scenario import Scenario
+from madd.core.schemas import (
+    Clause,
+    ClauseStatus,
+    CountryScore,
+    DebateMessage,
+    RoundScorecard,
+    TreatyDraft,
+)
+from madd.core.state import create_initial_state
+from madd.stores import catalog
+from madd.stores.run_store import save_all_outputs
+
+
+def _write_run(run_dir, *, clause_text: str, status: ClauseStatus, japan_score: float):
+    state = create_initial_state(Scenario(name="Arctic", description="Desc", countries=["Japan", "Norway"], max_rounds=1))
+    state["round"] = 1
+    state["messages"] = [
+        DebateMessage(round_number=1, country="Japan", public_statement="We support joint fishing patrols."),
+        DebateMessage(round_number=1, country="Norway", public_statement="Shipping lanes must stay open."),
+    ]
+    state["treaty"] = TreatyDraft(clauses=[
+        Clause(id="C1", text=clause_text, proposed_by="Norway", proposed_round=1, status=status),
+    ])
+    state["scorecards"] = [RoundScorecard(round_number=1, scores=[
+        CountryScore(country="Japan", score=japan_score),
+        CountryScore(country="Norway", score=5),
+    ])]
+    run_dir.mkdir(parents=True)
+    save_all_outputs(state, run_dir)
+    return run_dir
+
+
+def test_catalog_indexes_runs_and_answers_queries(tmp_path):
+    first = _write_run(tmp_path / "run_1", clause_text="Establish a krill fishing quota", status=ClauseStatus.ACCEPTED, japan_score=8)
+    second = _write_run(
+        tmp_path / "batch_1" / "run_0000",
+        clause_text="Limit krill harvesting near Svalbard",
+        status=ClauseStatus.REJECTED,
+        japan_score=6,
+    )
+
+    assert catalog.index_run(first) == "run_1"
+    assert catalog.index_run(second, tmp_path) == "batch_1/run_0000"
+    # Re-indexing a run replaces its rows instead of duplicating them.
+    catalog.index_run(first)
+
+    accepted = catalog.search(tmp_path, "krill", status="accepted")
+    assert [(r["run_id"], r["clause_id"]) for r in accepted] == [("run_1", "C1")]
+    assert len(catalog.search(tmp_path, "krill")) == 2
+    statements = catalog.search(tmp_path, "patrols", kind="statement", country="Japan")
+    assert {r["run_id"] for r in statements} == {"run_1", "batch_1/run_0000"}
+
+    japan = catalog.average_scores(tmp_path, country="Japan", since=datetime.now(UTC) - timedelta(days=30))
+    assert japan == [{"country": "Japan", "average": 7.0, "scores": 2, "runs": 2}]
+    assert catalog.average_scores(tmp_path, since=datetime.now(UTC) + timedelta(days=1)) == []
+    runs_listed = catalog.list_runs(tmp_path, scenario="Arctic")
+    assert {r["run_id"]: r["accepted"] for r in runs_listed} == {"run_1": 1, "batch_1/run_0000": 0}
+
+
+def test_runs_cli_reindexes_and_queries(tmp_path, capsys):
+    _write_run(tmp_path / "run_1", clause_text="Establish a krill fishing quota", status=ClauseStatus.ACCEPTED, japan_score=8)
+
+    assert runs.main(["query", "krill", "--output-dir", str(tmp_path)]) == 2
+    assert runs.main(["reindex", "--output-dir", str(tmp_path)]) == 0
+    capsys.readouterr()
+    assert runs.main(["query", "krill", "--status", "accepted", "--json", "--output-dir", str(tmp_path)]) == 0
+
+    rows = json.loads(capsys.readouterr().out)
+    assert rows[0]["snippet"] == "Establish a [krill] fishing quota"
+    assert runs.parse_since("2025-01-31") == datetime(2025, 1, 31, tzinfo=UTC)
+
+
+def test_catalog_takes_run_times_from_the_journal(tmp_path):
+    from madd.stores.journal import journal_path
+
+    run_dir = _write_run(tmp_path / "run_1", clause_text="Establish a krill fishing quota", status=ClauseStatus.ACCEPTED, japan_score=8)
+    entries = [
+        {"seq": 1, "node": "__start__", "at": "2024-03-01T10:00:00+00:00", "update": {}},
+        {"seq": 2, "node": "judge", "at": "2024-03-01T10:05:00+00:00", "update": {}},
+    ]
+    journal_path(run_dir).write_text("".join(json.dumps(entry) + "\n" for entry in entries))
+
+    catalog.index_run(run_dir)
+
+    (row,) = catalog.list_runs(tmp_path)
+    assert (row["started_at"], row["finished_at"]) == ("2024-03-01T10:00:00+00:00", "2024-03-01T10:05:00+00:00")
+    # The files were just written, but the run finished long before.
+    assert catalog.list_runs(tmp_path, since=datetime.now(UTC) - timedelta(days=30)) == []
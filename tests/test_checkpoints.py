@@ -0,0 +1,130 @@
+from madd.core import graph as graph_module
+from madd.core.scenario import Scenario
+from madd.core.schemas import (
+    Citation,
+    CountryFacts,
+    CountryProfile,
+    DebateMessage,
+    ProposedClause,
+    RoundScorecard,
+)
+from madd.core.state import create_initial_state
+from madd.stores.checkpoint_store import (
+    checkpoint_config,
+    load_checkpoint_state,
+    open_checkpointer,
+    resolve_run_dir,
+)
+
+
+def _fake_profile(country, *args, **kwargs):
+    cite = Citation(id=f"cite_{country.lower()}", title="UNCLOS", url="https://un.org/los")
+    return CountryProfile(facts=CountryFacts(name=country, scenario_citations=[cite]))
+
+
+def test_interrupted_run_resumes_from_last_node(monkeypatch, tmp_path):
+    scenario = Scenario(name="Test", description="Test", countries=["A", "B"], max_rounds=3)
+    refine_calls = {"count": 0}
+    turn_rounds = []
+
+    def fake_generate_turn(state, country):
+        turn_rounds.append(state["round"])
+        return DebateMessage(
+            round_number=state["round"],
+            country=country,
+            public_statement=f"{country} statement",
+            proposed_clauses=[ProposedClause(text=f"Clause from {country}")],
+        )
+
+    def flaky_refine(state):
+        refine_calls["count"] += 1
+        if refine_calls["count"] == 1:
+            raise RuntimeError("rate limited")
+        return "Treaty text"
+
+    monkeypatch.setattr(graph_module, "ensure_profile", _fake_profile)
+    monkeypatch.setattr(graph_module, "generate_turn", fake_generate_turn)
+    monkeypatch.setattr(graph_module, "evaluate_round", lambda s: RoundScorecard(round_number=s["round"]))
+    monkeypatch.setattr(graph_module, "verify_claims", lambda s: [])
+    monkeypatch.setattr(graph_module, "refine_treaty", flaky_refine)
+
+    run_dir = tmp_path / "run_1"
+    config = checkpoint_config(run_dir.name)
+    with open_checkpointer(run_dir) as checkpointer:
+        graph = graph_module.build_graph(checkpointer)
+        try:
+            for _event in graph.stream(create_initial_state(scenario), config, stream_mode="values"):
+                pass
+        except RuntimeError:
+            pass
+        assert len(turn_rounds) == 6
+
+    assert resolve_run_dir(tmp_path, "run_1") == run_dir
+    with open_checkpointer(run_dir) as checkpointer:
+        graph = graph_module.build_graph(checkpointer)
+        for _event in graph.stream(None, config, stream_mode="values"):
+            pass
+        final_state = load_checkpoint_state(graph, run_dir.name)
+
+    assert len(turn_rounds) == 6
+    assert final_state["treaty_text"] == "Treaty text"
+    assert final_state["round"] == 3
+    assert len(final_state["messages"]) == 6
+    assert final_state["treaty"].clauses[0].id == "C1"
+
+
+def test_journal_replays_interrupted_and_resumed_run(monkeypatch, tmp_path):
+    from madd.stores.journal import (
+        journal_path,
+        journaled_updates,
+        open_journal,
+        read_journal,
+        replay_journal,
+    )
+
+    scenario = Scenario(name="Test", description="Test", countries=["A", "B"], max_rounds=2)
+    refine_calls = {"count": 0}
+
+    def flaky_refine(state):
+        refine_calls["count"] += 1
+        if refine_calls["count"] == 1:
+            raise RuntimeError("rate limited")
+        return "Treaty text"
+
+    monkeypatch.setattr(graph_module, "ensure_profile", _fake_profile)
+    monkeypatch.setattr(graph_module, "generate_turn", lambda state, country: DebateMessage(
+        round_number=state["round"],
+        country=country,
+        public_statement=f"{country} statement",
+        proposed_clauses=[ProposedClause(text=f"Clause from {country}")],
+    ))
+    monkeypatch.setattr(graph_module, "evaluate_round", lambda s: RoundScorecard(round_number=s["round"]))
+    monkeypatch.setattr(graph_module, "verify_claims", lambda s: [])
+    monkeypatch.setattr(graph_module, "refine_treaty", flaky_refine)
+
+    run_dir = tmp_path / "run_1"
+    config = checkpoint_config(run_dir.name)
+    with open_checkpointer(run_dir) as checkpointer, open_journal(run_dir) as journal:
+        graph = graph_module.build_graph(checkpointer)
+        try:
+            for _update in journaled_updates(graph, create_initial_state(scenario), config, journal):
+                pass
+        except RuntimeError:
+            pass
+
+    # The transcript is on disk before the run finishes.
+    assert len(replay_journal(run_dir)["messages"]) == 4
+    with open(journal_path(run_dir), "ab") as file:
+        file.write(b'{"seq": 99, "node": "judge", "upd')
+
+    with open_checkpointer(run_dir) as checkpointer, open_journal(run_dir) as journal:
+        graph = graph_module.build_graph(checkpointer)
+        for _update in journaled_updates(graph, None, config, journal):
+            pass
+        checkpoint_state = load_checkpoint_state(graph, run_dir.name)
+
+    entries = list(read_journal(run_dir))
+    assert entries[0]["node"] == "__start__"
+    assert "__resume__" in [e["node"] for e in entries]
+    assert [e["seq"] for e in entries] == list(range(1, len(entries) + 1))
+    assert replay_journal(run_dir) == checkpoint_state
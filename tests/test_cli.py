@@ -20,3 +20,40 @@ def test_cli_parser_supports_watch_and_print_summary_flags():
     assert parsed.rounds == 2
     assert parsed.output_dir == Path("/tmp/madd_out")
     assert parsed.scenario == Path("examples/scenarios/greenland.yaml")
+
+
+def test_cli_parser_supports_resume_without_scenario():
+    parser = build_parser()
+    parsed = parser.parse_args(["--resume", "run_20250101_000000"])
+
+    assert parsed.resume == "run_20250101_000000"
+    assert parsed.scenario is None
+
+
+def test_cli_parser_runs_scenario_files_named_like_commands():
+    parser = build_parser()
+
+    assert parser.parse_args(["run", "batch"]).scenario == Path("batch")
+    assert parser.parse_args(["validate", "batch", "--json"]).command == "validate"
+    args, extra = parser.parse_known_args(["runs", "query", "quota", "--kind", "clause"])
+    assert args.command == "runs"
+    assert extra == ["query", "quota", "--kind", "clause"]
+
+
+def test_cli_import_skips_graph_and_model_sdks(monkeypatch):
+    import madd
+    from madd.scripts.import_profile import profile_import
+
+    monkeypatch.setenv("PYTHONPATH", str(Path(madd.__file__).parents[1]))
+    profile = profile_import("madd.cli", top=1)
+
+    assert profile.heavy == []
+    assert profile.slowest[0][0] == "madd.cli"
+
+
+def test_package_all_lists_match_lazy_exports():
+    import importlib
+
+    for name in ("madd", "madd.core", "madd.agents", "madd.stores", "madd.tools", "madd.ui"):
+        package = importlib.import_module(name)
+        assert set(package.__all__) - {"__version__"} == set(package._EXPORTS), name
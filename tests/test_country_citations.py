@@ -16,7 +16,7 @@ class FakeLLM:
 
     def invoke(self, messages):
         fields = getattr(self.schema, "model_fields", {}) if self.schema else {}
-        if "public_statement" in fields:
+        if "clause_votes" in fields:
             return self.schema(
                 public_statement="We support UNCLOS-based navigation rules.",
                 clause_votes={},
@@ -52,7 +52,7 @@ def test_generate_turn_enforces_citations(monkeypatch):
     state["profiles"] = {"TestLand": profile}
     state["treaty"] = TreatyDraft()
 
-    monkeypatch.setattr(country_agent, "ChatOpenAI", FakeLLM)
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", FakeLLM)
 
     msg = country_agent.generate_turn(state, "TestLand")
 
@@ -72,15 +72,16 @@ class RewriteLLM:
     def invoke(self, messages):
         self.calls += 1
         fields = getattr(self.schema, "model_fields", {}) if self.schema else {}
-        if "public_statement" in fields and "citation_ids_to_reference" in fields:
+        if "clause_votes" in fields:
             return self.schema(
                 public_statement="We request a joint study and propose mechanisms.",
                 clause_votes={},
                 citation_ids_to_reference=[],
             )
-        if "citation_ids_to_reference" in fields:
-            return self.schema(citation_ids_to_reference=[])
-        return self.schema(public_statement="We propose a study and conditional cooperation.")
+        return self.schema(
+            citation_ids_to_reference=[],
+            public_statement="We propose a study and conditional cooperation.",
+        )
 
 
 def test_second_pass_rewrite_when_no_citations(monkeypatch):
@@ -110,9 +111,65 @@ def test_second_pass_rewrite_when_no_citations(monkeypatch):
     state["profiles"] = {"TestLand": profile}
     state["treaty"] = TreatyDraft()
 
-    monkeypatch.setattr(country_agent, "ChatOpenAI", RewriteLLM)
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", RewriteLLM)
 
     msg = country_agent.generate_turn(state, "TestLand")
 
     assert "propose" in msg.public_statement.lower()
     assert msg.references_used == []
+
+
+class DeficientTurnLLM:
+    schemas = []
+
+    def __init__(self, *args, **kwargs):
+        self.schema = None
+
+    def with_structured_output(self, schema, method=None):
+        self.schema = schema
+        return self
+
+    def invoke(self, messages):
+        DeficientTurnLLM.schemas.append(self.schema.__name__)
+        if "clause_votes" in self.schema.model_fields:
+            return self.schema(
+                public_statement="We will consider the proposal and",
+                clause_votes={"C1": "amend"},
+                citation_ids_to_reference=[],
+            )
+        return self.schema(
+            citation_ids_to_reference=["cite_a"],
+            public_statement="We will consider the proposal and respond within 30 days.",
+            replacement_clauses=[{"text": "Revised inspection clause.", "supersedes": "C1"}],
+        )
+
+
+def test_all_turn_deficiencies_are_repaired_in_one_call(monkeypatch):
+    from madd.core.metrics import collect_metrics
+    from madd.core.schemas import Clause, ClauseStatus
+
+    cite = Citation(id="cite_a", title="UNCLOS", url="https://un.org/los", snippet="Law of the Sea.")
+    scenario = Scenario(name="Test", description="Test", countries=["TestLand", "OtherLand"], max_rounds=2)
+    state = create_initial_state(scenario)
+    state["round"] = 2
+    state["profiles"] = {"TestLand": CountryProfile(facts=CountryFacts(name="TestLand", scenario_citations=[cite]))}
+    state["treaty"] = TreatyDraft(clauses=[Clause(
+        id="C1", text="Inspection clause", proposed_by="OtherLand", proposed_round=1, status=ClauseStatus.PROPOSED,
+    )])
+    DeficientTurnLLM.schemas = []
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", DeficientTurnLLM)
+
+    with collect_metrics() as metrics:
+        msg = country_agent.generate_turn(state, "TestLand")
+
+    assert DeficientTurnLLM.schemas == ["TurnLLMOutput", "TurnRepairOutput"]
+    assert msg.references_used == ["cite_a"]
+    assert msg.public_statement.endswith("30 days.")
+    assert msg.is_truncated is False
+    assert [(p.text, p.supersedes) for p in msg.proposed_clauses] == [("Revised inspection clause.", "C1")]
+    assert metrics.events == {
+        "turn_repair": 1,
+        "turn_repair.missing_amendments": 1,
+        "turn_repair.missing_citations": 1,
+        "turn_repair.truncated": 1,
+    }
@@ -53,8 +53,51 @@ def test_missing_votes_default_to_abstain(monkeypatch):
     ]
     state["treaty"] = treaty
 
-    monkeypatch.setattr(country_agent, "ChatOpenAI", FakeLLM)
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", FakeLLM)
 
     msg = country_agent.generate_turn(state, "A")
 
     assert msg.clause_votes.get("C1") == "abstain"
+
+
+def test_turn_prompt_prefix_is_stable_and_built_once(monkeypatch):
+    from madd.core.metrics import collect_metrics
+
+    prompts = []
+
+    class RecordingLLM(FakeLLM):
+        def invoke(self, messages):
+            prompts.append(messages)
+            return super().invoke(messages)
+
+    cite = Citation(
+        id="cite_a",
+        title="UNCLOS",
+        url="https://un.org/los",
+        snippet="Law of the Sea framework.",
+        retrieved_at=datetime.now(timezone.utc),
+    )
+    scenario = Scenario(name="Prefix", description="Prefix test", countries=["A", "B"], max_rounds=3)
+    state = create_initial_state(scenario)
+    state["profiles"] = {"A": CountryProfile(facts=CountryFacts(name="A", scenario_citations=[cite]))}
+    builds = []
+    build = country_agent.build_turn_prefix
+    monkeypatch.setattr(country_agent, "build_turn_prefix", lambda *args: builds.append(args) or build(*args))
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", RecordingLLM)
+
+    with collect_metrics() as metrics:
+        for round_number in (1, 2):
+            state["round"] = round_number
+            country_agent.generate_turn(state, "A")
+
+    assert len(builds) == 1
+    assert prompts[0][0].content == prompts[1][0].content
+    assert prompts[0][0].content == build(*builds[0]).system_prompt
+    assert prompts[0][1].content != prompts[1][1].content
+    assert metrics.calls[0].prefix_tokens > 0
+    assert metrics.totals()["prefix_tokens"] == 2 * metrics.calls[0].prefix_tokens
+
+    # A different profile (e.g. a refreshed one) gets its own prefix.
+    state["profiles"] = {"A": state["profiles"]["A"].model_copy(deep=True)}
+    country_agent.generate_turn(state, "A")
+    assert len(builds) == 2
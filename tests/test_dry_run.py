@@ -0,0 +1,57 @@
+from madd.core.config import get_settings
+from madd.core.dry_run import format_plan, plan_run
+from madd.core.scenario import Scenario
+from madd.core.schemas import Citation, CountryFacts, CountryProfile
+from madd.stores.profile_store import make_scenario_key, save_profile
+
+
+def _scenario(rounds: int = 3) -> Scenario:
+    return Scenario(name="Test", description="Arctic shipping lanes", countries=["A", "B", "C"], max_rounds=rounds)
+
+
+def test_plan_run_counts_calls_and_splits_cached_profiles(monkeypatch, tmp_path):
+    monkeypatch.setattr(get_settings(), "profiles_dir", str(tmp_path))
+    scenario = _scenario()
+    cite = Citation(id="cite_a", title="UNCLOS", url="https://un.org/los")
+    save_profile(
+        CountryProfile(facts=CountryFacts(name="A", scenario_citations=[cite])),
+        make_scenario_key(scenario.name, scenario.description),
+    )
+
+    plan = plan_run(scenario)
+
+    assert plan.cached_profiles == ["A"]
+    assert plan.research_profiles == ["B", "C"]
+    nodes = {node.node: node for node in plan.nodes}
+    assert nodes["ensure_profiles"].llm_calls == 2
+    assert nodes["ensure_profiles"].search_calls == 2 * len(plan.router_plan.research_topics)
+    assert nodes["opening_statements"].llm_calls == 3
+    assert nodes["negotiate_round"].llm_calls == 6
+    assert nodes["verify"].llm_calls == nodes["judge"].llm_calls == 3
+    assert nodes["refine_treaty"].llm_calls == 1
+    assert plan.totals().llm_calls == 18
+    assert "Profiles to research: B, C" in format_plan(plan)
+
+
+def test_plan_run_counts_profiles_known_from_earlier_runs(monkeypatch, tmp_path):
+    monkeypatch.setattr(get_settings(), "profiles_dir", str(tmp_path))
+    known: set[str] = set()
+
+    first = plan_run(_scenario(1), known_profiles=known)
+    second = plan_run(_scenario(2), known_profiles=known)
+
+    assert first.research_profiles == ["A", "B", "C"]
+    assert second.research_profiles == []
+    assert second.nodes[0].search_calls == 0
+    assert not list(tmp_path.iterdir())
+
+
+def test_dry_run_import_skips_agents_and_model_sdks(monkeypatch):
+    from pathlib import Path
+
+    import madd
+    from madd.scripts.import_profile import profile_import
+
+    monkeypatch.setenv("PYTHONPATH", str(Path(madd.__file__).parents[1]))
+
+    assert profile_import("madd.core.dry_run", top=1).heavy == []
@@ -2,6 +2,8 @@ from datetime import datetime, timezone
 
 from madd.core.graph import build_graph, _compile_treaty
 from madd.core.schemas import (
+    AuditFinding,
+    AuditSeverity,
     Citation,
     CountryProfile,
     CountryFacts,
@@ -99,3 +101,193 @@ def test_clause_counter_increments():
 
     assert updates["clause_counter"] == 3
     assert updated_treaty.clauses[-1].id == "C3"
+
+
+def test_simultaneous_turns_use_round_start_snapshot(monkeypatch):
+    import time
+
+    from madd.core.config import get_settings
+    from madd.core.graph import _negotiate_round
+
+    scenario = Scenario(
+        name="Test",
+        description="Test scenario",
+        countries=["A", "B", "C"],
+        max_rounds=3,
+    )
+    state = create_initial_state(scenario)
+    state["round"] = 1
+    state["profiles"] = {c: _make_profile(c) for c in scenario.countries}
+    state["messages"] = [
+        DebateMessage(round_number=1, country=c, public_statement=f"{c} opening")
+        for c in scenario.countries
+    ]
+    seen_counts = {}
+    delays = {"A": 0.05, "B": 0.0, "C": 0.02}
+
+    def fake_generate_turn(state, country):
+        seen_counts[country] = len(state["messages"])
+        time.sleep(delays[country])
+        return DebateMessage(
+            round_number=state["round"],
+            country=country,
+            public_statement=f"{country} statement",
+        )
+
+    settings = get_settings().model_copy(update={"simultaneous_turns": True, "turn_concurrency": 3})
+    monkeypatch.setattr("madd.core.graph.get_settings", lambda: settings)
+    monkeypatch.setattr("madd.core.graph.generate_turn", fake_generate_turn)
+
+    updates = _negotiate_round(state)
+
+    assert [m.country for m in updates["messages"]] == ["A", "B", "C"]
+    assert all(m.round_number == 2 for m in updates["messages"])
+    assert seen_counts == {"A": 3, "B": 3, "C": 3}
+
+
+def test_async_graph_runs_all_rounds_with_checkpoints(monkeypatch, tmp_path):
+    import asyncio
+
+    from madd.core.graph import build_async_graph
+    from madd.stores.checkpoint_store import (
+        aload_checkpoint_state,
+        checkpoint_config,
+        open_async_checkpointer,
+    )
+
+    scenario = Scenario(name="Test", description="Test scenario", countries=["A", "B"], max_rounds=2)
+
+    async def fake_ensure_profile(country, *args, **kwargs):
+        return _make_profile(country)
+
+    async def fake_generate_turn(state, country):
+        return DebateMessage(
+            round_number=state["round"],
+            country=country,
+            public_statement=f"{country} statement",
+            proposed_clauses=[ProposedClause(text=f"Clause from {country}")] if state["round"] == 1 else [],
+        )
+
+    async def fake_evaluate_round(state):
+        return RoundScorecard(round_number=state["round"])
+
+    async def fake_verify_claims(state):
+        return []
+
+    async def fake_refine_treaty(state):
+        return "Treaty text"
+
+    monkeypatch.setattr("madd.core.graph.aensure_profile", fake_ensure_profile)
+    monkeypatch.setattr("madd.core.graph.agenerate_turn", fake_generate_turn)
+    monkeypatch.setattr("madd.core.graph.aevaluate_round", fake_evaluate_round)
+    monkeypatch.setattr("madd.core.graph.averify_claims", fake_verify_claims)
+    monkeypatch.setattr("madd.core.graph.arefine_treaty", fake_refine_treaty)
+
+    async def run():
+        async with open_async_checkpointer(tmp_path) as checkpointer:
+            graph = build_async_graph(checkpointer)
+            final = await graph.ainvoke(create_initial_state(scenario), checkpoint_config("run"))
+            return final, await aload_checkpoint_state(graph, "run")
+
+    final_state, saved = asyncio.run(run())
+
+    assert final_state["round"] == 2
+    assert len(final_state["messages"]) == 4
+    assert len(final_state["scorecards"]) == 2
+    assert final_state["treaty_text"] == "Treaty text"
+    assert saved["treaty_text"] == "Treaty text"
+
+
+def test_verify_and_judge_run_in_parallel_and_join(monkeypatch):
+    import threading
+
+    scenario = Scenario(name="Test", description="Test scenario", countries=["A", "B"], max_rounds=2)
+    # Both nodes must be in flight at once for either to pass the barrier.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_evaluate_round(state):
+        barrier.wait()
+        return RoundScorecard(round_number=state["round"])
+
+    def fake_verify_claims(state):
+        barrier.wait()
+        return [AuditFinding(
+            severity=AuditSeverity.INFO,
+            category="checked",
+            description="ok",
+            round_number=state["round"],
+        )]
+
+    monkeypatch.setattr("madd.core.graph.ensure_profile", lambda country, *a, **kw: _make_profile(country))
+    monkeypatch.setattr("madd.core.graph.generate_turn", lambda state, country: DebateMessage(
+        round_number=state["round"], country=country, public_statement=f"{country} statement",
+    ))
+    monkeypatch.setattr("madd.core.graph.evaluate_round", fake_evaluate_round)
+    monkeypatch.setattr("madd.core.graph.verify_claims", fake_verify_claims)
+    monkeypatch.setattr("madd.core.graph.refine_treaty", lambda state: "Treaty text")
+
+    final_state = build_graph().invoke(create_initial_state(scenario))
+
+    assert [s.round_number for s in final_state["scorecards"]] == [1, 2]
+    assert [f.round_number for f in final_state["audit"]] == [1, 2]
+    assert final_state["treaty_text"] == "Treaty text"
+
+
+def _speculative_settings(monkeypatch):
+    from madd.core.config import get_settings
+
+    settings = get_settings().model_copy(update={"speculative_refine": True})
+    monkeypatch.setattr("madd.core.graph.get_settings", lambda: settings)
+
+
+def test_speculative_refinement_is_reused_when_clauses_are_unchanged(monkeypatch):
+    import threading
+
+    _speculative_settings(monkeypatch)
+    scenario = Scenario(name="Test", description="Test scenario", countries=["A", "B"], max_rounds=2)
+    judged = threading.Event()
+    refine_calls = []
+
+    def fake_evaluate_round(state):
+        judged.set()
+        return RoundScorecard(round_number=state["round"])
+
+    def fake_refine(state):
+        refine_calls.append(state["round"])
+        return "Speculative treaty"
+
+    monkeypatch.setattr("madd.core.graph.ensure_profile", lambda country, *a, **kw: _make_profile(country))
+    monkeypatch.setattr("madd.core.graph.generate_turn", lambda state, country: DebateMessage(
+        round_number=state["round"], country=country, public_statement=f"{country} statement",
+        proposed_clauses=[ProposedClause(text=f"Clause from {country}")],
+    ))
+    monkeypatch.setattr("madd.core.graph.evaluate_round", fake_evaluate_round)
+    monkeypatch.setattr("madd.core.graph.verify_claims", lambda state: [])
+    monkeypatch.setattr("madd.core.graph.refine_treaty", fake_refine)
+
+    final_state = build_graph().invoke(create_initial_state(scenario))
+
+    assert final_state["treaty_text"] == "Speculative treaty"
+    assert refine_calls == [2]
+    assert final_state["speculative_refine_id"]
+
+
+def test_speculative_refinement_is_discarded_when_clauses_change(monkeypatch):
+    from madd.core.graph import _compile_treaty_node, _refine_treaty
+
+    _speculative_settings(monkeypatch)
+    scenario = Scenario(name="Test", description="Test scenario", countries=["A", "B"], max_rounds=1)
+    state = create_initial_state(scenario)
+    state["round"] = 1
+    state["messages"] = [DebateMessage(
+        round_number=1, country="A", public_statement="Statement",
+        proposed_clauses=[ProposedClause(text="Original clause")],
+    )]
+    monkeypatch.setattr("madd.core.graph.refine_treaty", lambda s: s["treaty"].clauses[0].text)
+
+    updates = _compile_treaty_node(state)
+    treaty = updates["treaty"].model_copy(deep=True)
+    treaty.clauses[0].text = "Amended clause"
+    result = _refine_treaty({**state, **updates, "treaty": treaty})
+
+    assert result["treaty_text"] == "Amended clause"
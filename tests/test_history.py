@@ -0,0 +1,77 @@
+from madd.core.history import build_history_context, estimate_tokens, summarize_round
+from madd.core.schemas import Clause, ClauseStatus, DebateMessage, TreatyDraft
+
+COUNTRIES = ["Denmark", "United States", "Canada"]
+
+
+def _debate(rounds: int) -> tuple[list[DebateMessage], TreatyDraft]:
+    messages, clauses = [], []
+    for r in range(1, rounds + 1):
+        for country in COUNTRIES:
+            statement = f"{country} opens round {r} on basing access. " + "We propose verification steps. " * 30
+            messages.append(DebateMessage(round_number=r, country=country, public_statement=statement))
+            clauses.append(Clause(
+                id=f"C{len(clauses) + 1}",
+                text=f"Clause from {country} in round {r}. " * 10,
+                proposed_by=country,
+                proposed_round=r,
+                status=ClauseStatus.ACCEPTED if r < rounds else ClauseStatus.PROPOSED,
+                resolved_round=r + 1 if r < rounds else None,
+            ))
+    return messages, TreatyDraft(clauses=clauses)
+
+
+def _context(rounds: int, budget: int = 2000):
+    messages, treaty = _debate(rounds)
+    summaries = {r: summarize_round(r, messages, treaty.clauses) for r in range(1, rounds)}
+    votable = {c.id for c in treaty.clauses if c.status == ClauseStatus.PROPOSED}
+    return build_history_context(
+        messages, summaries, treaty, votable, rounds + 1, window=4, token_budget=budget,
+    )
+
+
+def test_summarize_round_lists_speakers_proposals_and_outcomes():
+    messages, treaty = _debate(3)
+    summary = summarize_round(2, messages, treaty.clauses)
+
+    assert summary.startswith("Round 2:")
+    assert "- Denmark: Denmark opens round 2 on basing access. Proposed C4." in summary
+    assert "Outcome: accepted C1, C2, C3." in summary
+    assert "round 3" not in summary
+
+
+def test_history_stays_within_budget_as_rounds_grow():
+    early = _context(3)
+    late = _context(15)
+
+    assert early.tokens <= 2000 and late.tokens <= 2000
+    assert estimate_tokens(late.history + late.treaty_summary) < 2 * estimate_tokens(
+        early.history + early.treaty_summary
+    )
+
+
+def test_recent_turns_are_verbatim_and_older_rounds_summarized():
+    context = _context(6, budget=4000)
+
+    assert "Most recent turns:\nRound 5 - Canada:" in context.history
+    assert "Round 6 - Canada: Canada opens round 6" in context.history
+    assert "Earlier rounds (summarized):" in context.history
+    assert "Round 4:\n- Denmark:" in context.history
+
+
+def test_clause_listing_drops_settled_text_and_votable_clauses():
+    context = _context(6)
+
+    assert context.treaty_summary.startswith("Accepted earlier (text omitted): C1, C2")
+    assert "C13 [accepted]" in context.treaty_summary
+    assert "C16" not in context.treaty_summary
+
+
+def test_settled_clause_ids_are_capped_to_the_latest():
+    context = _context(15, budget=1000)
+    settled_line = context.treaty_summary.splitlines()[0]
+
+    assert settled_line.startswith("Accepted earlier (text omitted): 39 clauses, latest C20, ")
+    assert settled_line.endswith("C39")
+    assert "C1," not in settled_line
+    assert context.tokens <= 1000
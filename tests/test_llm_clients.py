@@ -0,0 +1,93 @@
+import pytest
+from pydantic import BaseModel
+
+from madd.core import llm
+
+
+class FakeChat:
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        FakeChat.created += 1
+        self.kwargs = kwargs
+
+    def with_structured_output(self, schema, method=None):
+        return (self, schema, method)
+
+
+class SchemaA(BaseModel):
+    value: str = ""
+
+
+class SchemaB(BaseModel):
+    value: int = 0
+
+
+def test_chat_models_are_shared_per_role_model_temperature(monkeypatch):
+    FakeChat.created = 0
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", FakeChat)
+
+    first = llm.get_chat_model("turn", "gpt-test", 0.7)
+    again = llm.get_chat_model("turn", "gpt-test", 0.7)
+    other = llm.get_chat_model("judge", "gpt-test", 0.0)
+
+    assert first is again
+    assert other is not first
+    assert FakeChat.created == 2
+
+
+def test_structured_runnables_are_prebuilt_per_schema(monkeypatch):
+    FakeChat.created = 0
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", FakeChat)
+
+    a = llm.get_structured_model("turn", "gpt-test", 0.7, SchemaA)
+    b = llm.get_structured_model("turn", "gpt-test", 0.7, SchemaB)
+
+    assert llm.get_structured_model("turn", "gpt-test", 0.7, SchemaA) is a
+    a, b = a.inner.inner.plain, b.inner.inner.plain
+    assert a[1] is SchemaA and b[1] is SchemaB
+    assert a[2] == "function_calling"
+    assert a[0] is b[0]
+    assert FakeChat.created == 1
+
+
+class EchoModel:
+    def __init__(self, name):
+        self.name = name
+
+    def invoke(self, input, config=None, **kwargs):
+        return self.name
+
+
+def test_turns_stream_only_while_a_listener_is_installed():
+    from madd.core.streaming import stream_statements
+
+    model = llm.ListenerStreamedModel(EchoModel("plain"), lambda: EchoModel("streamed"))
+
+    assert model.invoke([]) == "plain"
+    with stream_statements(lambda delta: None):
+        assert model.invoke([]) == "streamed"
+
+
+class FakeAsyncModel:
+    def __init__(self, replies):
+        self.replies = list(replies)
+
+    async def ainvoke(self, messages):
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return f"{reply}:{messages}"
+
+
+def test_async_flow_driver_sends_results_and_throws_errors_back():
+    import asyncio
+
+    model = FakeAsyncModel([RuntimeError("rate limited"), "ok"])
+
+    def flow():
+        with pytest.raises(RuntimeError, match="rate limited"):
+            yield llm.LLMCall(model, "first", "draft")
+        return (yield llm.LLMCall(model, "second", "repair"))
+
+    assert asyncio.run(llm.arun_llm_flow(flow())) == "ok:second"
@@ -0,0 +1,152 @@
+import contextvars
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from madd.core.metrics import (
+    MetricsCallbackHandler,
+    collect_metrics,
+    estimate_cost,
+    instrument_node,
+    metrics_scope,
+    note_attempt,
+    prompt_prefix,
+    record_call,
+    track,
+)
+
+
+def _llm_result(input_tokens: int, output_tokens: int) -> LLMResult:
+    message = AIMessage(
+        content="",
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        },
+    )
+    return LLMResult(generations=[[ChatGeneration(message=message)]])
+
+
+def test_calls_are_attributed_to_node_round_country_and_call():
+    handler = MetricsCallbackHandler()
+
+    @track("generate_turn")
+    def turn():
+        with record_call("llm", "gpt-5-mini"):
+            note_attempt()
+            note_attempt()
+            handler.on_llm_end(_llm_result(1000, 200))
+
+    node = instrument_node("negotiate_round", lambda state: turn())
+    with collect_metrics() as metrics, metrics_scope(country="Canada"):
+        node({"round": 2})
+
+    (call,) = metrics.calls
+    assert (call.node, call.round, call.country, call.call) == ("negotiate_round", 2, "Canada", "generate_turn")
+    assert call.total_tokens == 1200
+    assert call.retries == 1
+    assert call.cost_usd == pytest.approx(estimate_cost("gpt-5-mini", 1000, 200))
+    assert [n.node for n in metrics.nodes] == ["negotiate_round"]
+    assert metrics.aggregate("country")["Canada"]["total_tokens"] == 1200
+
+
+def test_node_that_advances_the_round_is_recorded_under_the_new_round():
+    @track("generate_turn")
+    def turn():
+        with record_call("llm", "gpt-5-mini"):
+            pass
+
+    def negotiate(state):
+        with metrics_scope(round=state["round"] + 1):
+            turn()
+        return {"round": state["round"] + 1}
+
+    with collect_metrics() as metrics:
+        instrument_node("negotiate_round", negotiate)({"round": 2})
+
+    assert [call.round for call in metrics.calls] == [3]
+    assert [node.round for node in metrics.nodes] == [3]
+
+
+def test_prompt_prefix_and_provider_cache_reads_are_recorded():
+    message = AIMessage(
+        content="",
+        usage_metadata={
+            "input_tokens": 1000,
+            "output_tokens": 10,
+            "total_tokens": 1010,
+            "input_token_details": {"cache_read": 768},
+        },
+    )
+    with collect_metrics() as metrics:
+        with prompt_prefix(800), record_call("llm", "gpt-5-mini"):
+            MetricsCallbackHandler().on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]))
+        with record_call("llm", "gpt-5-mini"):
+            pass
+
+    assert [(c.prefix_tokens, c.cached_input_tokens) for c in metrics.calls] == [(800, 768), (0, 0)]
+    assert metrics.totals()["cached_input_tokens"] == 768
+
+
+def test_errors_are_recorded_and_reraised():
+    with (
+        collect_metrics() as metrics,
+        pytest.raises(RuntimeError),
+        record_call("llm", "gpt-5-mini"),
+    ):
+        raise RuntimeError("boom")
+
+    assert metrics.calls[0].error == "RuntimeError: boom"
+    assert metrics.totals()["errors"] == 1
+
+
+def test_labels_follow_copied_context_into_threads():
+    def search():
+        with record_call("search", "gpt-5-mini"):
+            return threading.current_thread().name
+
+    with (
+        collect_metrics() as metrics,
+        metrics_scope(node="ensure_profiles", country="Japan"),
+        ThreadPoolExecutor(max_workers=2) as pool,
+    ):
+        pool.submit(contextvars.copy_context().run, search).result()
+
+    assert metrics.calls[0].node == "ensure_profiles"
+    assert metrics.calls[0].country == "Japan"
+
+
+def test_nothing_is_recorded_without_a_collector():
+    with record_call("llm", "gpt-5-mini") as record:
+        pass
+    assert record.seconds >= 0
+
+
+def test_unknown_models_have_no_cost_estimate():
+    assert estimate_cost("local-model", 10, 10) is None
+    assert estimate_cost("gpt-5-mini-2025-08-07", 1_000_000, 0) == pytest.approx(0.25)
+
+
+def test_metrics_json_is_written_with_outputs(tmp_path):
+    from madd.core.scenario import Scenario
+    from madd.core.state import create_initial_state
+    from madd.stores.run_store import save_all_outputs
+
+    scenario = Scenario(name="Test", description="Test scenario", countries=["A", "B"], max_rounds=1)
+    with (
+        collect_metrics() as metrics,
+        metrics_scope(node="judge", round=1),
+        record_call("llm", "gpt-5-mini"),
+    ):
+        pass
+    outputs = save_all_outputs(create_initial_state(scenario), tmp_path, metrics)
+
+    data = json.loads(outputs["metrics"].read_text())
+    assert data["totals"]["calls"] == 1
+    assert data["by_node"]["judge"]["calls"] == 1
+    assert data["calls"][0]["round"] == 1
@@ -0,0 +1,57 @@
+import threading
+import time
+
+from madd.agents.researcher import _research_topics
+from madd.core.schemas import Citation
+from madd.tools.research_scheduler import ResearchScheduler
+
+
+def test_scheduler_caps_global_concurrency():
+    scheduler = ResearchScheduler(max_concurrency=2)
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def task():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    futures = [scheduler.submit(task) for _ in range(6)]
+    for future in futures:
+        future.result()
+    scheduler.shutdown()
+
+    assert peak == 2
+
+
+def test_research_topics_keep_topic_order(monkeypatch):
+    scheduler = ResearchScheduler(max_concurrency=4)
+    monkeypatch.setattr("madd.agents.researcher.get_research_scheduler", lambda: scheduler)
+    delays = {"economy": 0.05, "leaders": 0.0, "law": 0.02}
+
+    def fake_search(country, topic_key, query_hint=None, scenario_context=None, allowed_domains=None):
+        if topic_key == "law":
+            raise RuntimeError("search down")
+        time.sleep(delays[topic_key])
+        cite = Citation(id=f"cite_{topic_key}", title=topic_key, url=f"https://un.org/{topic_key}")
+        return f"{country} {topic_key}", [cite]
+
+    monkeypatch.setattr("madd.agents.researcher.search_country_info", fake_search)
+
+    context, citations = _research_topics(
+        "TestLand",
+        {"economy": "gdp", "leaders": "government", "law": "treaties"},
+        {},
+        "Scenario",
+    )
+    scheduler.shutdown()
+
+    assert context.index("ECONOMY") < context.index("LEADERS")
+    assert "LAW" not in context
+    assert list(citations) == ["economy", "leaders", "law"]
+    assert citations["law"] == []
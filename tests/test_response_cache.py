@@ -0,0 +1,93 @@
+import json
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel
+
+from madd.core.llm import LLMCall, run_llm_flow
+from madd.stores.response_cache import (
+    CachedStructuredModel,
+    DiskResponseCache,
+    LLMCacheMiss,
+    make_cache_key,
+)
+
+
+class Answer(BaseModel):
+    text: str = ""
+
+
+class CountingLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages, config=None, **kwargs):
+        self.calls += 1
+        return Answer(text=f"answer {self.calls}")
+
+
+MESSAGES = [SystemMessage(content="system"), HumanMessage(content="question")]
+
+
+def _cached(inner, cache, replay_only=False):
+    return CachedStructuredModel(inner, cache, "turn", "gpt-test", 0.7, Answer, replay_only=replay_only)
+
+
+def test_cache_key_depends_on_request():
+    base = make_cache_key("turn", "gpt-test", 0.7, Answer, MESSAGES)
+
+    assert base == make_cache_key("turn", "gpt-test", 0.7, Answer, list(MESSAGES))
+    assert base != make_cache_key("turn", "gpt-test", 0.2, Answer, MESSAGES)
+    assert base != make_cache_key("turn", "gpt-test", 0.7, Answer, MESSAGES[:1])
+
+
+def test_cached_model_replays_responses(tmp_path):
+    inner = CountingLLM()
+    model = _cached(inner, DiskResponseCache(tmp_path))
+
+    first = model.invoke(MESSAGES)
+    second = model.invoke(MESSAGES)
+
+    assert inner.calls == 1
+    assert second == first
+
+
+def test_replay_mode_fails_on_miss(tmp_path):
+    model = _cached(CountingLLM(), DiskResponseCache(tmp_path), replay_only=True)
+
+    with pytest.raises(LLMCacheMiss):
+        model.invoke(MESSAGES)
+
+
+def test_replay_miss_bypasses_agent_fallbacks(tmp_path):
+    model = _cached(CountingLLM(), DiskResponseCache(tmp_path), replay_only=True)
+
+    def flow():
+        try:
+            return (yield LLMCall(model, MESSAGES, "generate_turn"))
+        except Exception:
+            return Answer(text="fallback")
+
+    with pytest.raises(LLMCacheMiss):
+        run_llm_flow(flow())
+
+
+def test_corrupted_entry_is_discarded(tmp_path):
+    cache = DiskResponseCache(tmp_path)
+    cache.put("ab" * 32, {"text": "original"})
+    path = next(tmp_path.glob("*/*.json"))
+    entry = json.loads(path.read_text())
+    entry["response"]["text"] = "edited"
+    path.write_text(json.dumps(entry))
+
+    assert cache.get("ab" * 32) is None
+    assert not path.exists()
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskResponseCache(tmp_path, max_bytes=1)
+    cache.put("aa" * 32, {"text": "first"})
+    cache.put("bb" * 32, {"text": "second"})
+
+    assert cache.get("aa" * 32) is None
+    assert cache.get("bb" * 32) == {"text": "second"}
@@ -98,7 +98,7 @@ def test_research_uses_router_topics(monkeypatch):
     )
 
     monkeypatch.setattr(researcher_agent, "search_country_info", fake_search)
-    monkeypatch.setattr(researcher_agent, "ChatOpenAI", FakeResearchLLM)
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", FakeResearchLLM)
 
     researcher_agent.generate_profile(
         "TestLand",
@@ -160,7 +160,7 @@ def test_country_prompt_includes_patch(monkeypatch):
     state["treaty"] = TreatyDraft()
     state["router_plan"] = RouterPlan(turn_prompt_patch="PATCH_TEST")
 
-    monkeypatch.setattr(country_agent, "ChatOpenAI", PromptCaptureLLM)
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", PromptCaptureLLM)
 
     country_agent.generate_turn(state, "A")
 
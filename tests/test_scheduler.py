@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+
+from madd.core.metrics import collect_metrics, record_call
+from madd.core.scheduler import RateLimitScheduler
+
+
+def test_unlimited_models_are_admitted_immediately():
+    scheduler = RateLimitScheduler({}, (0, 0))
+    with collect_metrics() as metrics:
+        for _ in range(100):
+            with scheduler.reserve("gpt-5-mini", "turn", 10_000):
+                pass
+    assert metrics.queues == {}
+
+
+def test_token_budget_delays_requests_past_the_burst():
+    scheduler = RateLimitScheduler({"gpt-5-mini": (0, 600)}, (0, 0))  # 10 tokens/s
+    with scheduler.reserve("gpt-5-mini", "turn", 600):
+        pass
+
+    start = time.monotonic()
+    with (
+        collect_metrics() as metrics,
+        record_call("llm", "gpt-5-mini") as record,
+        scheduler.reserve("gpt-5-mini", "judge", 5),
+    ):
+        pass
+
+    assert time.monotonic() - start == pytest.approx(0.5, abs=0.2)
+    assert record.queue_seconds > 0.3
+    assert metrics.queues["judge"]["waits"] == 1
+    assert metrics.queues["judge"]["max_depth"] == 1
+
+
+def test_search_lane_spaces_request_starts():
+    scheduler = RateLimitScheduler({}, (0, 0), lane_intervals={"search": 0.1})
+    start = time.monotonic()
+    for _ in range(3):
+        with scheduler.reserve("gpt-5-mini", "search", 100):
+            pass
+    with scheduler.reserve("gpt-5-mini", "turn", 100):
+        pass
+
+    assert time.monotonic() - start == pytest.approx(0.2, abs=0.08)
+
+
+def test_settling_refunds_an_overestimate():
+    scheduler = RateLimitScheduler({}, (0, 600))
+    with scheduler.reserve("gpt-5-mini", "turn", 600) as reservation:
+        reservation.settle(100)
+
+    start = time.monotonic()
+    with scheduler.reserve("gpt-5-mini", "turn", 400):
+        pass
+    assert time.monotonic() - start < 0.1
+
+
+def test_turns_are_served_ahead_of_waiting_verifier_calls():
+    scheduler = RateLimitScheduler({}, (0, 0))
+    scheduler.pause("gpt-5-mini", 0.2)
+    served = []
+
+    def call(lane):
+        with scheduler.reserve("gpt-5-mini", lane, 100):
+            served.append(lane)
+
+    verifier = threading.Thread(target=call, args=("verify",))
+    verifier.start()
+    time.sleep(0.05)
+    turn = threading.Thread(target=call, args=("turn",))
+    turn.start()
+    verifier.join(2)
+    turn.join(2)
+
+    assert served == ["turn", "verify"]
+
+
+def test_rate_limit_responses_pause_the_model(monkeypatch):
+    from madd.core import llm
+
+    scheduler = RateLimitScheduler({}, (0, 0))
+    monkeypatch.setattr("madd.core.llm.get_scheduler", lambda: scheduler)
+
+    class Response:
+        status_code = 429
+        headers = {"retry-after": "0.3"}
+
+    with record_call("llm", "gpt-5-mini"):
+        llm._note_rate_limited(Response())
+
+    start = time.monotonic()
+    with scheduler.reserve("gpt-5-mini", "turn", 100):
+        pass
+    assert time.monotonic() - start == pytest.approx(0.3, abs=0.15)
+
+
+def test_async_reservations_wait_without_blocking_the_loop():
+    import asyncio
+
+    scheduler = RateLimitScheduler({}, (0, 0))
+    scheduler.pause("gpt-5-mini", 0.2)
+    ticks = []
+
+    async def ticker():
+        for _ in range(3):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.03)
+
+    async def reserve():
+        async with scheduler.areserve("gpt-5-mini", "turn", 100):
+            return time.monotonic()
+
+    async def main():
+        admitted, _ = await asyncio.gather(reserve(), ticker())
+        return admitted
+
+    admitted = asyncio.run(main())
+    assert len(ticks) == 3 and ticks[-1] < admitted
@@ -58,7 +58,7 @@ def test_clause_accounting_fields(monkeypatch):
     ]
     state["treaty"] = treaty
 
-    monkeypatch.setattr(judge_agent, "ChatOpenAI", FakeLLM)
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", FakeLLM)
 
     scorecard = judge_agent.evaluate_round(state)
 
@@ -0,0 +1,63 @@
+import json
+import time
+
+from madd.core.schemas import Citation
+from madd.tools.search_cache import SearchCache
+
+
+def _cite(n: int) -> Citation:
+    return Citation(id=f"cite_{n}", title=f"Source {n}", url=f"https://un.org/{n}", snippet="Snippet")
+
+
+def test_round_trip_and_counters(tmp_path):
+    cache = SearchCache(tmp_path / "cache.sqlite3")
+    cache.put("k1", "text", [_cite(1), _cite(2)])
+
+    hit = cache.get("k1")
+    miss = cache.get("k2")
+
+    assert hit is not None
+    assert hit[0] == "text"
+    assert [c.id for c in hit[1]] == ["cite_1", "cite_2"]
+    assert miss is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_ttl_expires_entries(tmp_path):
+    cache = SearchCache(tmp_path / "cache.sqlite3", ttl_seconds=0.01)
+    cache.put("k1", "text", [_cite(1)])
+    time.sleep(0.05)
+
+    assert cache.get("k1") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = SearchCache(tmp_path / "cache.sqlite3", max_entries=2)
+    cache.put("k1", "one", [])
+    time.sleep(0.01)
+    cache.put("k2", "two", [])
+    time.sleep(0.01)
+    cache.get("k1")
+    time.sleep(0.01)
+    cache.put("k3", "three", [])
+
+    assert cache.get("k2") is None
+    assert cache.get("k1") is not None
+    assert cache.get("k3") is not None
+
+
+def test_imports_legacy_json_cache(tmp_path):
+    legacy = tmp_path / "legacy"
+    legacy.mkdir()
+    with open(legacy / "abc123.json", "w") as f:
+        json.dump({"text": "legacy", "citations": [_cite(1).model_dump(mode="json")]}, f)
+    (legacy / "broken.json").write_text("{not json")
+    cache = SearchCache(tmp_path / "cache.sqlite3")
+
+    assert cache.import_json_dir(legacy) == 1
+    text, citations = cache.get("abc123")
+    assert text == "legacy"
+    assert citations[0].url == "https://un.org/1"
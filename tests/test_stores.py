@@ -1,10 +1,14 @@
+from unittest.mock import patch
+
 import pytest
-import json
-from pathlib import Path
-from unittest.mock import patch, MagicMock
 
-from madd.stores.profile_store import load_profile, save_profile, get_profile_path, make_scenario_key
-from madd.core.schemas import CountryProfile, CountryFacts, CountryStrategy
+from madd.core.schemas import CountryFacts, CountryProfile
+from madd.stores.profile_store import (
+    get_profile_path,
+    load_profile,
+    make_scenario_key,
+    save_profile,
+)
 
 
 def test_profile_path():
@@ -38,3 +42,106 @@ def test_load_nonexistent(tmp_path):
         
         loaded = load_profile("NonExistent")
         assert loaded is None
+
+
+def test_state_snapshots_share_profiles_and_load_lazily(tmp_path):
+    from madd.core.scenario import Scenario
+    from madd.core.schemas import Citation, RoundScorecard
+    from madd.core.state import create_initial_state
+    from madd.stores.snapshot import load_state_snapshot, save_state_snapshot
+
+    cite = Citation(id="cite_a", title="UNCLOS", url="https://un.org/los")
+    state = create_initial_state(Scenario(name="Test", description="Desc", countries=["A", "B"], max_rounds=1))
+    state["profiles"] = {c: CountryProfile(facts=CountryFacts(name=c, citations=[cite])) for c in ("A", "B")}
+    state["scorecards"] = [RoundScorecard(round_number=1)]
+    state["round_summaries"] = {1: "Opening"}
+
+    paths = []
+    for run_id in ("run_1", "run_2"):
+        (tmp_path / run_id).mkdir()
+        paths.append(save_state_snapshot(state, tmp_path / run_id))
+
+    assert paths[0].name == "state.json.gz"
+    assert len(list((tmp_path / "_profiles").iterdir())) == 2
+    snapshot = load_state_snapshot(paths[1])
+    assert snapshot["scorecards"] == state["scorecards"]
+    assert "profiles" not in snapshot._decoded
+    assert set(snapshot.profile_refs()) == {"A", "B"}
+    assert dict(snapshot) == state
+
+
+def test_profile_blobs_are_verified_and_pruned_when_unreferenced(tmp_path):
+    import gzip
+    import os
+    import shutil
+
+    from madd.core.scenario import Scenario
+    from madd.core.state import create_initial_state
+    from madd.stores.snapshot import load_state_snapshot, prune_profile_blobs, save_state_snapshot
+
+    state = create_initial_state(Scenario(name="Test", description="Desc", countries=["A", "B"], max_rounds=1))
+    for run_id, name in (("run_1", "A"), ("run_2", "B")):
+        state["profiles"] = {name: CountryProfile(facts=CountryFacts(name=name))}
+        (tmp_path / run_id).mkdir()
+        save_state_snapshot(state, tmp_path / run_id)
+    blobs = sorted((tmp_path / "_profiles").iterdir())
+    for blob in blobs:
+        os.utime(blob, (0, 0))
+
+    assert prune_profile_blobs(tmp_path) == []
+    shutil.rmtree(tmp_path / "run_1")
+    assert len(prune_profile_blobs(tmp_path, dry_run=True)) == 1
+    assert len(list((tmp_path / "_profiles").iterdir())) == 2
+    assert len(prune_profile_blobs(tmp_path)) == 1
+
+    snapshot = load_state_snapshot(tmp_path / "run_2" / "state.json.gz")
+    (blob,) = (tmp_path / "_profiles").iterdir()
+    blob.write_bytes(gzip.compress(b'{"facts": {"name": "Tampered"}}'))
+    with pytest.raises(ValueError, match="does not match"):
+        snapshot["profiles"]
+
+
+def test_load_state_snapshot_reads_plain_json(tmp_path):
+    from pydantic_core import to_json
+
+    from madd.core.scenario import Scenario
+    from madd.core.state import create_initial_state
+    from madd.stores.snapshot import load_state_snapshot
+
+    state = create_initial_state(Scenario(name="Test", description="Desc", countries=["A", "B"], max_rounds=2))
+    state["profiles"] = {"A": CountryProfile(facts=CountryFacts(name="A"))}
+    path = tmp_path / "state.json"
+    path.write_bytes(to_json(dict(state), indent=2))
+
+    snapshot = load_state_snapshot(path)
+
+    assert snapshot["profiles"]["A"].facts.name == "A"
+    assert snapshot["scenario"].max_rounds == 2
+
+
+def test_create_run_dir_is_unique_and_time_ordered(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from madd.stores.run_store import create_run_dir
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        run_dirs = list(pool.map(lambda _: create_run_dir(str(tmp_path)), range(64)))
+
+    assert len({d.name for d in run_dirs}) == 64
+    assert all(d.is_dir() and not any(d.iterdir()) for d in run_dirs)
+    first, second = create_run_dir(str(tmp_path)), create_run_dir(str(tmp_path))
+    assert first.name < second.name
+    assert create_run_dir(str(tmp_path), prefix="batch").name.startswith("batch_")
+
+
+def test_atomic_open_leaves_target_untouched_on_error(tmp_path):
+    from madd.stores.atomic import atomic_open
+
+    target = tmp_path / "summary.md"
+    target.write_text("old", encoding="utf-8")
+    with pytest.raises(RuntimeError), atomic_open(target) as f:
+        f.write("partial")
+        raise RuntimeError("disk full")
+
+    assert target.read_text(encoding="utf-8") == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["summary.md"]
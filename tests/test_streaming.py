@@ -0,0 +1,65 @@
+import io
+import json
+from uuid import uuid4
+
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+from madd.cli import WatchPrinter
+from madd.core.metrics import metrics_scope
+from madd.core.streaming import StatementDelta, StatementStreamHandler, stream_statements
+
+
+def _chunk(args: str) -> ChatGenerationChunk:
+    message = AIMessageChunk(content="", tool_call_chunks=[{"name": None, "args": args, "id": None, "index": 0}])
+    return ChatGenerationChunk(message=message)
+
+
+def _feed(handler, arguments: str, size: int = 5) -> None:
+    run_id = uuid4()
+    for i in range(0, len(arguments), size):
+        handler.on_llm_new_token("", chunk=_chunk(arguments[i:i + size]), run_id=run_id)
+    handler.on_llm_end(None, run_id=run_id)
+
+
+def test_statement_deltas_follow_streamed_tool_arguments():
+    handler = StatementStreamHandler()
+    deltas = []
+    arguments = json.dumps({"public_statement": 'We "propose" a\njoint study.', "clause_votes": {"C1": "accept"}})
+
+    with (
+        stream_statements(deltas.append),
+        metrics_scope(country="Denmark", round=2, call="generate_turn"),
+    ):
+        _feed(handler, arguments)
+
+    assert "".join(d.text for d in deltas) == 'We "propose" a\njoint study.'
+    assert {(d.country, d.round) for d in deltas} == {("Denmark", 2)}
+
+
+def test_only_turn_generation_is_streamed_and_only_with_a_listener():
+    handler = StatementStreamHandler()
+    deltas = []
+    arguments = json.dumps({"public_statement": "Repaired statement."})
+
+    _feed(handler, arguments)
+    with stream_statements(deltas.append), metrics_scope(call="repair_turn"):
+        _feed(handler, arguments)
+
+    assert deltas == []
+
+
+def test_watch_printer_marks_each_speaker_and_progress_line():
+    out = io.StringIO()
+    printer = WatchPrinter(out)
+
+    printer.statement(StatementDelta("Denmark", 1, "We "))
+    printer.statement(StatementDelta("Denmark", 1, "agree."))
+    printer.statement(StatementDelta("Canada", 1, "We object."))
+    printer.line("[opening_statements] round=1 messages=2 clauses=0")
+
+    assert out.getvalue() == (
+        "  [Denmark r1] We agree.\n"
+        "  [Canada r1] We object.\n"
+        "[opening_statements] round=1 messages=2 clauses=0\n"
+    )
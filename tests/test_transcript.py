@@ -148,3 +148,30 @@ def test_build_citation_index():
     
     assert "cite_test123" in index
     assert index["cite_test123"].title == "Test"
+
+
+def test_save_all_outputs_lists_sources_in_first_use_order(tmp_path):
+    import json
+
+    from madd.core.metrics import collect_metrics
+    from madd.stores.run_store import save_all_outputs
+
+    cites = [Citation(id=f"cite_{i}", title=f"Source {i}", url=f"https://e.org/{i}") for i in range(3)]
+    scenario = Scenario(name="Test", description="Testing", countries=["A", "B"], max_rounds=1)
+    state = create_initial_state(scenario)
+    state["profiles"] = {"A": CountryProfile(facts=CountryFacts(name="A", citations=cites))}
+    state["messages"] = [
+        DebateMessage(round_number=1, country="A", public_statement="x", references_used=["cite_2", "cite_0"]),
+        DebateMessage(round_number=1, country="B", public_statement="y", references_used=["cite_0", "cite_9"]),
+    ]
+
+    with collect_metrics() as metrics:
+        outputs = save_all_outputs(state, tmp_path, metrics)
+
+    sources = json.loads(outputs["sources"].read_text())
+    assert [c["id"] for c in sources] == ["cite_2", "cite_0"]
+    assert "- [cite_9] Unknown source" in outputs["transcript"].read_text()
+    assert "**Total Sources**: 2" in outputs["summary"].read_text()
+    artifacts = json.loads(outputs["metrics"].read_text())["artifacts"]
+    assert set(artifacts) == set(outputs) - {"metrics"}
+    assert artifacts["state"]["bytes"] == outputs["state"].stat().st_size
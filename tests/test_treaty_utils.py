@@ -1,5 +1,5 @@
 from madd.core.schemas import Clause, ClauseStatus, TreatyDraft
-from madd.core.treaty_utils import get_votable_clauses
+from madd.core.treaty_utils import ClauseLedger, get_votable_clauses
 
 
 def test_get_votable_clauses_filters_by_round():
@@ -14,3 +14,27 @@ def test_get_votable_clauses_filters_by_round():
     votable = get_votable_clauses(treaty, current_round=2)
 
     assert [c.id for c in votable] == ["C1"]
+
+
+def test_clause_ledger_tracks_votes_and_status():
+    clauses = [
+        Clause(id="C1", text="Clause 1", proposed_by="A", proposed_round=1, supporters=["A"]),
+        Clause(id="C2", text="Clause 2", proposed_by="B", proposed_round=2),
+    ]
+    ledger = ClauseLedger(clauses)
+
+    assert ledger.get("C2") is clauses[1]
+    assert [c.id for c in ledger.votable(current_round=2)] == ["C1"]
+
+    ledger.apply_vote(clauses[0], "B", "oppose", current_round=2)
+    ledger.apply_vote(clauses[0], "C", "support", current_round=2)
+    ledger.apply_vote(clauses[0], "B", "support", current_round=2)
+    ledger.apply_vote(clauses[0], "D", "amend", current_round=2)
+    ledger.apply_vote(clauses[0], "D", "amend", current_round=2)
+    ledger.set_status(clauses[0], ClauseStatus.ACCEPTED, 2)
+    ledger.sync()
+
+    assert clauses[0].supporters == ["A", "C", "B"]
+    assert clauses[0].objectors == ["D"]
+    assert clauses[0].amendments == ["[Round 2] D proposed amendment"]
+    assert ledger.votable(current_round=3) == [clauses[1]]
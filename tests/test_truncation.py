@@ -46,7 +46,7 @@ def test_truncation_flag_set(monkeypatch):
     state["profiles"] = {"A": profile}
     state["treaty"] = TreatyDraft()
 
-    monkeypatch.setattr(country_agent, "ChatOpenAI", FakeLLM)
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", FakeLLM)
 
     msg = country_agent.generate_turn(state, "A")
 
@@ -20,9 +20,21 @@ max_rounds: 3
     assert scenario.countries == ["North", "South"]
 
 
+class _FakeSnapshot:
+    def __init__(self, values):
+        self.values = values
+
+
 class _FakeGraph:
-    def stream(self, _state, stream_mode):
-        yield {"round": 1}
+    def __init__(self):
+        self.state = {}
+
+    def stream(self, state, config=None, stream_mode="values"):
+        self.state = dict(state or {}, round=1)
+        yield self.state
+
+    def get_state(self, config):
+        return _FakeSnapshot(self.state)
 
 
 def test_run_scenario_from_yaml_text_supports_round_override(
@@ -31,14 +43,15 @@ def test_run_scenario_from_yaml_text_supports_round_override(
 ):
     fake_run_dir = tmp_path / "ui_run"
 
-    def fake_build_graph():
+    def fake_build_graph(checkpointer=None):
         return _FakeGraph()
 
     def fake_create_run_dir(path: str) -> Path:
         assert path == str(tmp_path)
+        fake_run_dir.mkdir()
         return fake_run_dir
 
-    def fake_save_all_outputs(_state, run_dir: Path):
+    def fake_save_all_outputs(_state, run_dir: Path, _metrics=None):
         assert run_dir == fake_run_dir
         return {"summary": run_dir / "summary.md"}
 
@@ -62,3 +75,152 @@ max_rounds: 3
     assert result.scenario.max_rounds == 2
     assert result.outputs["summary"].name == "summary.md"
     assert result.outputs["summary"].parent == fake_run_dir
+
+
+def test_run_scenario_reports_statement_and_node_events(monkeypatch, tmp_path):
+    from madd.core.streaming import StatementDelta, _listener
+
+    class _StreamingGraph(_FakeGraph):
+        def stream(self, state, config=None, stream_mode="values"):
+            assert stream_mode == "updates"
+            _listener.get()(StatementDelta("North", 1, "Hello"))
+            self.state = dict(state or {}, round=1)
+            yield {"opening_statements": {"round": 1}}
+
+    monkeypatch.setattr("madd.ui.web.build_graph", lambda checkpointer=None: _StreamingGraph())
+    monkeypatch.setattr("madd.ui.web.save_all_outputs", lambda state, run_dir, metrics=None: {})
+    events = []
+
+    run_scenario_from_yaml_text(
+        'name: "UI Case"\ndescription: "Custom test"\ncountries: [North, South]\n',
+        output_dir=tmp_path,
+        on_event=lambda kind, data: events.append((kind, data)),
+    )
+
+    assert [kind for kind, _ in events] == ["run", "statement", "node"]
+    assert events[1][1] == {"country": "North", "round": 1, "text": "Hello"}
+    assert events[2][1] == {"node": "opening_statements", "round": 1}
+
+
+def _fake_result(run_dir: Path):
+    from madd.ui.web import DebateRunResult
+
+    run_dir.mkdir()
+    summary = run_dir / "summary.md"
+    summary.write_text("# Summary\n", encoding="utf-8")
+    scenario = load_scenario_from_text('name: "UI Case"\ndescription: "Custom test"\ncountries: [North, South]\n')
+    return DebateRunResult(scenario=scenario, run_dir=run_dir, outputs={"summary": summary})
+
+
+def test_job_queue_tracks_progress_and_result(tmp_path):
+    import threading
+
+    from madd.ui.jobs import JobQueue
+
+    release = threading.Event()
+
+    def fake_run(yaml_text, *, output_dir, rounds, resume, on_event):
+        on_event("run", {"run_id": "run_1"})
+        on_event("node", {"node": "opening_statements", "round": 1})
+        release.wait(5)
+        return _fake_result(Path(output_dir) / "run_1")
+
+    queue = JobQueue(fake_run, workers=1)
+    job = queue.submit("name: x", output_dir=tmp_path)
+    follower = job.follow(timeout=0.05)
+    assert next(follower) == (1, "run", {"run_id": "run_1"})
+    assert next(follower) == (2, "node", {"node": "opening_statements", "round": 1})
+    assert job.status == "running" and job.node == "opening_statements" and job.round == 1
+
+    release.set()
+    rest = [event for event in follower if event is not None]
+    queue.shutdown()
+
+    assert [kind for _, kind, _ in rest] == ["done"]
+    assert job.to_dict()["status"] == "done"
+    assert job.outputs == {"summary": "/runs/run_1/summary.md"}
+    assert job.summary == "# Summary"
+    assert queue.list() == [job]
+
+
+def test_job_queue_records_failures(tmp_path):
+    from madd.ui.jobs import JobQueue
+
+    def failing_run(yaml_text, **kwargs):
+        raise ValueError("bad scenario")
+
+    queue = JobQueue(failing_run)
+    job = queue.submit("name: x", output_dir=tmp_path)
+    events = [event for event in job.follow(timeout=0.05) if event is not None]
+    queue.shutdown()
+
+    assert job.status == "failed"
+    assert job.error == "Run failed: bad scenario"
+    assert events[-1][1] == "failed" and "ValueError" in events[-1][2]["trace"]
+
+
+def test_job_merges_statement_deltas_and_resumes_after_an_event():
+    from madd.ui.jobs import Job
+
+    job = Job(id="j")
+    job.record("statement", {"country": "North", "round": 1, "text": "Hel"})
+    job.record("statement", {"country": "South", "round": 1, "text": "Hi"})
+    job.record("statement", {"country": "North", "round": 1, "text": "lo"})
+    follower = job.follow(timeout=0.01, after=1)
+    live = [next(follower), next(follower)]
+    job.record("node", {"node": "opening_statements", "round": 1})
+    job.record("done", {"run_id": "run_1"})
+
+    assert live == [
+        (2, "statement", {"country": "South", "round": 1, "text": "Hi"}),
+        (3, "statement", {"country": "North", "round": 1, "text": "lo"}),
+    ]
+    assert job.events == [
+        (2, "statement", {"country": "South", "round": 1, "text": "Hi", "replace": True}),
+        (3, "statement", {"country": "North", "round": 1, "text": "Hello", "replace": True}),
+        (4, "node", {"node": "opening_statements", "round": 1}),
+        (5, "done", {"run_id": "run_1"}),
+    ]
+    # A client that saw event 2 gets North's full text (to replace its partial one) and the rest.
+    assert [event[0] for event in job.follow(after=2)] == [3, 4, 5]
+
+
+def test_post_run_returns_job_without_waiting(tmp_path):
+    import json
+    import threading
+    import urllib.request
+    from http.server import ThreadingHTTPServer
+
+    from madd.ui.jobs import JobQueue
+    from madd.ui.web import _make_handler
+
+    release = threading.Event()
+
+    def slow_run(yaml_text, *, output_dir, rounds, resume, on_event):
+        release.wait(5)
+        return _fake_result(Path(output_dir) / "run_2")
+
+    queue = JobQueue(slow_run, workers=1)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(tmp_path, queue))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        request = urllib.request.Request(f"{base}/run", data=b"scenario_yaml=name%3A+x&rounds=2")
+        with urllib.request.urlopen(request, timeout=5) as response:
+            assert response.url.startswith(f"{base}/jobs/")
+            job_url = response.url
+        with urllib.request.urlopen(f"{job_url}/status", timeout=5) as response:
+            assert json.load(response)["status"] in ("queued", "running")
+
+        release.set()
+        with urllib.request.urlopen(f"{job_url}/events", timeout=5) as response:
+            stream = response.read().decode("utf-8")
+        assert "event: done" in stream
+        assert "id: 1\n" in stream
+        with urllib.request.urlopen(f"{base}/jobs", timeout=5) as response:
+            assert json.load(response)[0]["outputs"] == {"summary": "/runs/run_2/summary.md"}
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
+        queue.shutdown()
@@ -99,7 +99,7 @@ def test_verifier_dedupes_and_ignores_leader_false_positive(monkeypatch):
         )
     ]
 
-    monkeypatch.setattr(verifier_agent, "ChatOpenAI", FakeLLM)
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", FakeLLM)
 
     findings = verifier_agent.verify_claims(state)
 
@@ -141,7 +141,7 @@ def test_verifier_ignores_non_object_findings(monkeypatch):
         )
     ]
 
-    monkeypatch.setattr(verifier_agent, "ChatOpenAI", FakeLLMMixedFindings)
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", FakeLLMMixedFindings)
 
     findings = verifier_agent.verify_claims(state)
 
@@ -178,7 +178,7 @@ def test_verifier_strips_injected_evidence_text(monkeypatch):
         )
     ]
 
-    monkeypatch.setattr(verifier_agent, "ChatOpenAI", FakeLLMInjectedEvidence)
+    monkeypatch.setattr("madd.core.llm.ChatOpenAI", FakeLLMInjectedEvidence)
 
     findings = verifier_agent.verify_claims(state)
 
@@ -64,7 +64,7 @@ def test_default_economic_domains():
     assert "imf.org" in DEFAULT_ECONOMIC_DOMAINS
 
 
-@patch("madd.tools.web_search.OpenAI")
+@patch("madd.core.llm.OpenAI")
 @patch("madd.core.config.get_settings")
 def test_web_search_calls_with_include_sources(mock_settings, mock_openai):
     mock_settings.return_value.openai_api_key = "test"
@@ -85,7 +85,7 @@ def test_web_search_calls_with_include_sources(mock_settings, mock_openai):
     assert call_kwargs["include"] == ["web_search_call.action.sources"]
 
 
-@patch("madd.tools.web_search.OpenAI")
+@patch("madd.core.llm.OpenAI")
 @patch("madd.core.config.get_settings")
 def test_web_search_with_allowed_domains(mock_settings, mock_openai):
     mock_settings.return_value.openai_api_key = "test"
@@ -108,7 +108,7 @@ def test_web_search_with_allowed_domains(mock_settings, mock_openai):
     assert tools[0]["filters"]["allowed_domains"] == ["gov.uk", "gov.us"]
 
 
-@patch("madd.tools.web_search.OpenAI")
+@patch("madd.core.llm.OpenAI")
 @patch("madd.core.config.get_settings")
 def test_web_search_max_results_slicing(mock_settings, mock_openai):
     mock_settings.return_value.openai_api_key = "test"
@@ -218,3 +218,17 @@ def test_parse_sources_key_mapping_populates_title_snippet():
     assert citations
     assert citations[0].title == "UNCLOS"
     assert citations[0].snippet.startswith("Law of the Sea")
+
+
+@patch("madd.tools.web_search.get_openai_client")
+@patch("madd.tools.web_search.get_settings")
+def test_replay_mode_search_miss_raises_instead_of_searching(mock_settings, mock_client):
+    from madd.stores.response_cache import LLMCacheMiss
+
+    mock_settings.return_value.search_cache_enabled = False
+    mock_settings.return_value.llm_cache_mode = "replay"
+
+    with pytest.raises(LLMCacheMiss):
+        web_search("test query")
+
+    mock_client.return_value.responses.create.assert_not_called()